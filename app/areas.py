@@ -78,21 +78,7 @@ class AreaWindow(QWidget):
 
     def load_data(self, search_params=None):
         try:
-            query = "SELECT id, acode, aname FROM area"
-            params = ()
-
-            if search_params:
-                field, term = search_params
-                if field:  # Specific field search
-                    query += f" WHERE {field} LIKE ?"
-                    params = (f"%{term}%",)
-                else:  # Search all fields
-                    query += " WHERE acode LIKE ? OR aname LIKE ?"
-                    params = (f"%{term}%", f"%{term}%")
-
-            query += " ORDER BY acode"
-
-            records = self.db.conn.execute(query, params).fetchall()
+            records = self.db.areas.list(search_params)
 
             self.ui.table_areas.setRowCount(0)
 
@@ -113,10 +99,7 @@ class AreaWindow(QWidget):
 
         try:
             area_id = selected[0].data(Qt.UserRole)
-            record = self.db.conn.execute(
-                "SELECT acode, aname FROM area WHERE id=?",
-                (area_id,)
-            ).fetchone()
+            record = self.db.areas.get(area_id)
 
             if record:
                 self.current_id = area_id
@@ -145,11 +128,7 @@ class AreaWindow(QWidget):
 
         # Check for duplicate code
         if not self.current_id:  # Only check for new records
-            existing = self.db.conn.execute(
-                "SELECT id FROM area WHERE acode=?",
-                (acode,)
-            ).fetchone()
-            if existing:
+            if self.db.areas.exists(acode):
                 errors.append("An area with this code already exists")
 
         return errors
@@ -168,18 +147,11 @@ class AreaWindow(QWidget):
 
             if self.current_id:
                 # Update existing record
-                self.db.conn.execute(
-                    "UPDATE area SET acode=?, aname=? WHERE id=?",
-                    data + (self.current_id,)
-                )
+                self.db.areas.update(self.current_id, data)
             else:
                 # Insert new record
-                self.db.conn.execute(
-                    "INSERT INTO area (acode, aname) VALUES (?, ?)",
-                    data
-                )
+                self.db.areas.insert(data)
 
-            self.db.conn.commit()
             self.load_data(self.current_search)
             self.clear_form()
             QMessageBox.information(self, "Success", "Area saved successfully")
@@ -200,10 +172,7 @@ class AreaWindow(QWidget):
         if reply == QMessageBox.Yes:
             try:
                 # Check if area is referenced in broadcasts
-                ref_count = self.db.conn.execute(
-                    "SELECT COUNT(*) FROM broadcasts WHERE target_area_id=?",
-                    (self.current_id,)
-                ).fetchone()[0]
+                ref_count = self.db.areas.references(self.current_id)
 
                 if ref_count > 0:
                     QMessageBox.warning(
@@ -212,8 +181,7 @@ class AreaWindow(QWidget):
                     )
                     return
 
-                self.db.conn.execute("DELETE FROM area WHERE id=?", (self.current_id,))
-                self.db.conn.commit()
+                self.db.areas.delete(self.current_id)
                 self.load_data(self.current_search)
                 self.clear_form()
                 QMessageBox.information(self, "Success", "Area deleted successfully")
@@ -0,0 +1,532 @@
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+from app.core.db import RadioDatabase, season_of
+
+""" 
+ShortwaveHunter
+BCL radio software
+Command line interface, Qt free
+
+Copyright (c) 2025 I8ZSE, Giorgio L. Rutigliano
+(www.i8zse.it, www.i8zse.eu, www.giorgiorutigliano.it)
+
+radio communications are handled by https://github.com/Hamlib/Hamlib (LGPL)
+
+This is free software released under LGPL License
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+
+ROOTDIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COMMANDS = ("import", "export", "lookup", "search", "stats", "log", "poll", "scan", "sweep", "schedule", "serve", "qth",
+            "season")
+
+# global options followed by a value
+VALUE_OPTIONS = ("-d", "--data")
+
+LOOKUP_COLUMNS = ("frequency_khz", "start_time", "end_time", "days_operation", "station_name",
+                  "country_name", "language_name", "transmitter_site", "distance_km")
+LOG_COLUMNS = ("logged_at", "frequency_khz", "station_name", "country_name", "language_name",
+               "mode", "smeter", "sinpo", "notes")
+SEARCH_COLUMNS = ("frequency_khz", "start_time", "end_time", "days_operation", "station_name",
+                  "country", "language", "target_area", "band_name", "distance_km")
+
+
+def is_command(argv, value_options=()):
+    """
+    True when argv runs a command: its first positional argument is a
+    command name. value_options are further options followed by a value
+    """
+    args = iter(argv)
+    for arg in args:
+        if arg in VALUE_OPTIONS or arg in value_options:
+            next(args, None)
+        elif not arg.startswith("-"):
+            return arg in COMMANDS
+    return False
+
+
+def print_rows(rows, columns, as_json):
+    if as_json:
+        print(json.dumps(rows, indent=1, default=str))
+        return
+    for row in rows:
+        print("\t".join(format_value(row.get(col)) for col in columns))
+
+
+def format_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return f"{value:.1f}"
+    return str(value)
+
+
+def cmd_import(db, args):
+    try:
+        season = args.season or season_of(args.file)
+        imp, upd, err = db.import_eibi_csv(args.file, args.update, season)
+    except (OSError, ValueError) as e:
+        print(e, file=sys.stderr)
+        return 1
+    for line in err:
+        print(line, file=sys.stderr)
+    if args.json:
+        print(json.dumps({"imported": imp, "updated": upd, "errors": len(err)}))
+    else:
+        print(f"imported {imp}, updated {upd}, errors {len(err)}")
+    return 0
+
+
+def cmd_lookup(db, args):
+    rows, sts, emsg = db.lookup(args.freq)
+    if sts:
+        print(emsg, file=sys.stderr)
+        return 1
+    print_rows(rows, LOOKUP_COLUMNS, args.json)
+    return 0
+
+
+def search_filters(args):
+    return {key: value for key, value in (
+        ('freq_min', args.freq_min), ('freq_max', args.freq_max), ('band', args.band),
+        ('station', args.station), ('text', args.text), ('country', args.country),
+        ('language', args.language), ('target_area', args.area), ('time', args.time),
+        ('start_date', args.start_date), ('end_date', args.end_date), ('max_distance', args.max_km), ('near', args.near), ('bbox', args.bbox),
+        ('order', 'distance' if args.nearest else None),
+        ('limit', args.limit)) if value is not None}
+
+
+def cmd_search(db, args):
+    try:
+        rows = db.search_skeds(search_filters(args))
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    print_rows(rows, SEARCH_COLUMNS, args.json)
+    return 0
+
+
+def cmd_qth(db, args):
+    from app.core.geo import locator_to_latlon
+    try:
+        if args.clear:
+            db.set_qth(None, None)
+        elif len(args.location) == 1:
+            db.set_qth(*locator_to_latlon(args.location[0]))
+        elif len(args.location) == 2:
+            db.set_qth(float(args.location[0]), float(args.location[1]))
+        elif args.location:
+            raise ValueError("give a locator or latitude and longitude")
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    qth = db.get_qth()
+    if args.json:
+        print(json.dumps(None if qth is None else {"latitude": qth[0], "longitude": qth[1]}))
+    elif qth is None:
+        print("qth not set")
+    else:
+        print(f"{qth[0]:.4f}\t{qth[1]:.4f}")
+    return 0
+
+
+def cmd_season(db, args):
+    try:
+        if args.season:
+            db.switch_season(args.season)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    seasons = db.seasons()
+    if args.json:
+        print(json.dumps([{"season": name, "broadcasts": count, "active": name == db.season}
+                          for name, count in seasons]))
+    elif not seasons:
+        print("no season")
+    else:
+        for name, count in seasons:
+            print(f"{'*' if name == db.season else ' '} {name}\t{count}")
+    return 0
+
+
+def cmd_export(db, args):
+    from app.core.export import export
+    if args.format == "adif" or args.log:
+        filters = {'start': args.since, 'end': args.until, 'station': args.station,
+                   'freq_min': args.freq_min, 'freq_max': args.freq_max}
+        filters = {k: v for k, v in filters.items() if v is not None}
+        log = True
+    else:
+        filters = search_filters(args)
+        log = False
+    try:
+        count = export(db, args.format, args.file, filters, log)
+    except OSError as e:
+        print(e, file=sys.stderr)
+        return 1
+    print(f"exported {count}", file=sys.stderr)
+    return 0
+
+
+def cmd_stats(db, args):
+    stats = db.get_statistics()
+    if args.json:
+        # distributions are lists of sqlite3.Row, one object per row
+        print(json.dumps(stats, indent=1, default=dict))
+        return 0
+    for key, value in stats.items():
+        if isinstance(value, (list, tuple)):
+            print(f"{key}:")
+            for item in value:
+                print("\t" + "\t".join(str(v) for v in item))
+        else:
+            print(f"{key}: {value}")
+    return 0
+
+
+def cmd_log(db, args):
+    rows = db.logbook.entries(args.limit, start=args.since, end=args.until, station=args.station,
+                              freq_min=args.freq_min, freq_max=args.freq_max)
+    print_rows(rows, LOG_COLUMNS, args.json)
+    return 0
+
+
+def open_rig(args, db=None):
+    """
+    Open the rig given on the command line, None on errors.
+    db keeps the rig capabilities between runs
+    """
+    if args.sim:
+        from app.core.simrig import SimulatedRig
+        rig = SimulatedRig(None, args.baud, db)
+    else:
+        from app.core.hamlib import HamlibWrapper
+        rig = HamlibWrapper(db=db)
+        if not rig.hllink:
+            print("hamlib not found", file=sys.stderr)
+            return None
+    conf = {'id': args.model, 'port': args.port, 'baudrate': str(args.baud),
+            'databits': str(args.databits), 'stopbits': str(args.stopbits), 'parity': args.parity}
+    rsp = rig.openconf(conf, int(args.interval * 1000))
+    if rsp != 0:
+        print(f"error {rsp} opening rig", file=sys.stderr)
+        return None
+    return rig
+
+
+def cmd_poll(db, args):
+    rig = open_rig(args, db)
+    if rig is None:
+        return 1
+    try:
+        for num in range(args.count):
+            if num:
+                time.sleep(args.interval)
+            sts, mode, freq, smeter, err = rig.poll()
+            if sts:
+                print(f"error polling rig: {err}", file=sys.stderr)
+                return 1
+            band = db.get_band(freq / 1000)
+            if args.json:
+                print(json.dumps({"freq": freq, "mode": mode, "smeter": smeter, "band": band}))
+            else:
+                print(f"{freq / 1000:.1f}\t{mode}\t{smeter}\t{band}")
+            sys.stdout.flush()
+    finally:
+        rig.close()
+    return 0
+
+
+def cmd_scan(db, args):
+    from app.core.hamlib import HamlibError
+    from app.core.scanner import BandScanner
+    rig = open_rig(args, db)
+    if rig is None:
+        return 1
+    scanner = BandScanner(db, rig, args.dwell, args.samples)
+    plan = scanner.scan_list(args.band)
+    print(f"{len(plan)} frequencies on air, {scanner.estimate(plan):.0f} s per pass", file=sys.stderr)
+    try:
+        for num in range(args.passes):
+            for stop in scanner.scan(plan):
+                if args.json:
+                    print(json.dumps(stop, default=str))
+                else:
+                    stations = ", ".join(row['station_name'] for row in stop['broadcasts'])
+                    print(f"{stop['frequency_khz']:.1f}\t{stop['smeter']}\t{stop['band_name'] or ''}\t{stations}")
+                sys.stdout.flush()
+    except HamlibError as e:
+        print(f"error scanning: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    finally:
+        rig.close()
+    return 0
+
+
+def cmd_sweep(db, args):
+    from app.core.hamlib import HamlibError
+    from app.core.scanner import ChannelSweep
+    if not args.band and (args.freq_min is None or args.freq_max is None):
+        print("give --band or --freq-min and --freq-max", file=sys.stderr)
+        return 1
+    rig = open_rig(args, db)
+    if rig is None:
+        return 1
+    sweep = ChannelSweep(db, rig, args.step, args.threshold, args.margin, args.settle)
+    plan = sweep.scan_list(args.band, args.freq_min, args.freq_max)
+    print(f"{len(plan)} channels", file=sys.stderr)
+    try:
+        for channel in sweep.scan(plan):
+            if not (channel['active'] or args.all):
+                continue
+            if args.json:
+                print(json.dumps(channel, default=str))
+            else:
+                stations = ", ".join(row['station_name'] for row in channel['broadcasts'])
+                flag = "*" if channel['active'] else ""
+                print(f"{channel['frequency_khz']:.1f}\t{channel['smeter']}{flag}\t{stations}")
+            sys.stdout.flush()
+    except HamlibError as e:
+        print(f"error sweeping: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    finally:
+        rig.close()
+    return 0
+
+
+def cmd_schedule(db, args):
+    from app.core.scheduler import TuneScheduler, TUNE, tune
+    scheduler = TuneScheduler(db, args.log_interval)
+    if args.saved:
+        scheduler.load()
+    filters = search_filters(args)
+    if set(filters) - {'limit'}:
+        for row in db.search_skeds(filters):
+            scheduler.add(row, args.mode, args.log)
+    if not scheduler.targets:
+        print("nothing to schedule", file=sys.stderr)
+        return 1
+    print(f"{len(scheduler.targets)} broadcasts scheduled", file=sys.stderr)
+    rig = open_rig(args, db)
+    if rig is None:
+        return 1
+    try:
+        while True:
+            wait = scheduler.seconds_to_next()
+            if wait is None:
+                break
+            time.sleep(min(wait, 60))
+            for kind, tid, target in scheduler.pop_due():
+                smeter = None
+                if kind == TUNE:
+                    s, e = tune(rig, target)
+                else:
+                    smeter, s, e = rig.get_smeter()
+                    if not e:
+                        db.logbook.append({'frequency_khz': target['frequency_khz'],
+                                           'station_name': target['station_name'],
+                                           'country_name': target['country_name'],
+                                           'language_name': target['language_name'],
+                                           'mode': target['mode'], 'smeter': smeter,
+                                           'notes': "scheduled"})
+                if e:
+                    print(f"error on {kind} {target['frequency_khz']}: {e}", file=sys.stderr)
+                    continue
+                event = {"event": kind, "freq": target['frequency_khz'], "mode": target['mode'],
+                         "station": target['station_name'], "smeter": smeter}
+                if args.json:
+                    print(json.dumps(event))
+                else:
+                    print("\t".join(format_value(value) for value in event.values()))
+                sys.stdout.flush()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        rig.close()
+    return 0
+
+
+def cmd_serve(db, args):
+    from app.core.server import ApiServer
+    rig = None
+    if args.sim or args.port:
+        rig = open_rig(args, db)
+        if rig is None:
+            return 1
+    server = ApiServer(db, args.host, args.listen, rig=rig, interval=args.interval, max_rate=args.max_rate)
+    if rig is not None:
+        server.snapshot.update(rig="simulated" if args.sim else f"{args.model} {args.port}")
+    print(f"serving on http://{args.host}:{args.listen}", file=sys.stderr)
+    try:
+        server.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if rig is not None:
+            rig.close()
+    return 0
+
+
+def search_arguments(cmd, limit):
+    cmd.add_argument("--freq-min", type=float)
+    cmd.add_argument("--freq-max", type=float)
+    cmd.add_argument("--band")
+    cmd.add_argument("--station")
+    cmd.add_argument("--text")
+    cmd.add_argument("--country", help="country code")
+    cmd.add_argument("--language", help="language code")
+    cmd.add_argument("--area", help="target area code")
+    cmd.add_argument("--time", help="HHMM utc")
+    cmd.add_argument("--start-date", help="valid on or after DDMM")
+    cmd.add_argument("--end-date", help="valid on or before DDMM, may wrap around new year")
+    cmd.add_argument("--max-km", type=float, help="transmitter sites within distance from qth")
+    cmd.add_argument("--near", type=float, nargs=3, metavar=("LAT", "LON", "KM"),
+                     help="transmitter sites within KM of a point")
+    cmd.add_argument("--bbox", type=float, nargs=4, metavar=("SOUTH", "NORTH", "WEST", "EAST"),
+                     help="transmitter sites inside a region, WEST > EAST crosses 180")
+    cmd.add_argument("--nearest", action="store_true", help="nearest transmitter sites first")
+    cmd.add_argument("--limit", type=int, default=limit)
+
+
+def rig_arguments(cmd, interval):
+    cmd.add_argument("-m", "--model", type=int, default=1, help="hamlib model id")
+    cmd.add_argument("-p", "--port", default="", help="rig serial port")
+    cmd.add_argument("-b", "--baud", type=int, default=9600)
+    cmd.add_argument("--databits", type=int, default=8)
+    cmd.add_argument("--stopbits", type=int, default=1)
+    cmd.add_argument("--parity", type=int, default=0)
+    cmd.add_argument("--sim", action="store_true", help="simulated rig")
+    cmd.add_argument("-i", "--interval", type=float, default=interval, help="seconds between polls")
+
+
+def parser():
+    prs = argparse.ArgumentParser(prog="swhunter", description="Shortwave Hunter command line")
+    prs.add_argument('-d', '--data', default=os.path.join(ROOTDIR, "data"), help="database directory")
+    prs.add_argument('-j', '--json', action='store_true', help="json output")
+    sub = prs.add_subparsers(dest="command", required=True)
+
+    cmd = sub.add_parser("import", help="import an EiBi csv file")
+    cmd.add_argument("file")
+    cmd.add_argument("-u", "--update", action="store_true", help="keep existing EiBi rows, update them")
+    cmd.add_argument("--season", help="import into season (A25, B25), default from the file name")
+    cmd.set_defaults(func=cmd_import)
+
+    cmd = sub.add_parser("lookup", help="broadcasts on air near a frequency")
+    cmd.add_argument("freq", type=float, help="kHz")
+    cmd.set_defaults(func=cmd_lookup)
+
+    cmd = sub.add_parser("search", help="search schedules")
+    search_arguments(cmd, 1000)
+    cmd.set_defaults(func=cmd_search)
+
+    cmd = sub.add_parser("export", help="export schedule (csv, jsonl, eibi) or log (csv, jsonl with --log, adif)")
+    cmd.add_argument("format", choices=("csv", "jsonl", "eibi", "adif"))
+    cmd.add_argument("file")
+    cmd.add_argument("--log", action="store_true", help="export the reception log")
+    cmd.add_argument("--since", help="log from utc date YYYY-MM-DD")
+    cmd.add_argument("--until", help="log up to utc date, excluded")
+    search_arguments(cmd, None)
+    cmd.set_defaults(func=cmd_export)
+
+    cmd = sub.add_parser("stats", help="database statistics")
+    cmd.set_defaults(func=cmd_stats)
+
+    cmd = sub.add_parser("log", help="reception log entries, newest first")
+    cmd.add_argument("--since", help="utc date YYYY-MM-DD[ HH:MM:SS]")
+    cmd.add_argument("--until", help="utc date, excluded")
+    cmd.add_argument("--station")
+    cmd.add_argument("--freq-min", type=float)
+    cmd.add_argument("--freq-max", type=float)
+    cmd.add_argument("--limit", type=int, default=100)
+    cmd.set_defaults(func=cmd_log)
+
+    cmd = sub.add_parser("poll", help="read frequency, mode and S-meter from a rig")
+    rig_arguments(cmd, 1.0)
+    cmd.add_argument("-n", "--count", type=int, default=1)
+    cmd.set_defaults(func=cmd_poll)
+
+    cmd = sub.add_parser("scan", help="visit the frequencies on air now, read the S-meter at each")
+    rig_arguments(cmd, 1.0)
+    cmd.add_argument("--band", action="append", help="band name, may be repeated, default all bands")
+    cmd.add_argument("--dwell", type=float, default=3.0, help="seconds on each frequency")
+    cmd.add_argument("--samples", type=int, default=3, help="S-meter readings on each frequency")
+    cmd.add_argument("--passes", type=int, default=1)
+    cmd.set_defaults(func=cmd_scan)
+
+    cmd = sub.add_parser("sweep", help="tune channel by channel, list channels above the noise floor")
+    rig_arguments(cmd, 1.0)
+    cmd.add_argument("--band", action="append", help="band name, may be repeated")
+    cmd.add_argument("--freq-min", type=float, help="kHz, without --band")
+    cmd.add_argument("--freq-max", type=float, help="kHz, without --band")
+    cmd.add_argument("--step", type=float, default=5.0, help="kHz")
+    cmd.add_argument("--threshold", type=float, help="dB over S9, default adaptive noise floor")
+    cmd.add_argument("--margin", type=float, default=10.0, help="dB over the noise floor")
+    cmd.add_argument("--settle", type=float, default=0.15, help="seconds before reading the S-meter")
+    cmd.add_argument("--all", action="store_true", help="list quiet channels too")
+    cmd.set_defaults(func=cmd_sweep)
+
+    cmd = sub.add_parser("schedule", help="tune the rig at the start of the broadcasts found by a search")
+    search_arguments(cmd, 1000)
+    rig_arguments(cmd, 1.0)
+    cmd.add_argument("--saved", action="store_true", help="include the tunings scheduled in the GUI")
+    cmd.add_argument("--mode", default="AM")
+    cmd.add_argument("--log", action="store_true", help="log the S-meter during the broadcasts")
+    cmd.add_argument("--log-interval", type=float, default=300.0, help="seconds between log entries")
+    cmd.set_defaults(func=cmd_schedule)
+
+    cmd = sub.add_parser("serve", help="local JSON server, polls the rig when one is given")
+    cmd.add_argument("--host", default="127.0.0.1")
+    cmd.add_argument("-l", "--listen", type=int, default=8073, help="tcp port")
+    cmd.add_argument("--max-rate", type=float, default=5.0, help="stream updates per second")
+    rig_arguments(cmd, 0.5)
+    cmd.set_defaults(func=cmd_serve)
+
+    cmd = sub.add_parser("qth", help="show or set the listening location")
+    cmd.add_argument("location", nargs="*", help="locator (JN70dt) or latitude longitude")
+    cmd.add_argument("--clear", action="store_true")
+    cmd.set_defaults(func=cmd_qth)
+
+    cmd = sub.add_parser("season", help="list stored seasons or switch the active one")
+    cmd.add_argument("season", nargs="?", help="season to activate (A25, B25)")
+    cmd.set_defaults(func=cmd_season)
+    return prs
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s - %(message)s')
+    args = parser().parse_args(argv)
+    db = RadioDatabase(None, args.data)
+    try:
+        return args.func(db, args)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -42,12 +42,13 @@ class ConfigWindow(QDialog):
     hamlib = None
     radio = []
     brand = {}
-    configs = {}
+    configs = None      # RigConfigs store
     flEdit = False
 
-    def __init__(self, hamlib, current=None):
+    def __init__(self, hamlib, configs, current=None):
         super().__init__()
         self.hamlib = hamlib
+        self.configs = configs
         self.brand, self.radio = hamlib.get_radio_list()
         # Load dialog data
         self.ui = Ui_ConfigWindow()
@@ -93,7 +94,7 @@ class ConfigWindow(QDialog):
         if self.flEdit:
             bck = "rgba(200, 200, 200)"
         else:
-            if conf['shortname'] in self.configs.keys() or conf['shortname'] == "":
+            if conf['shortname'] in self.configs or conf['shortname'] == "":
                 flerr = True
                 bck = bckerr
         self.ui.lineEdit_shortname.setStyleSheet("QLineEdit { background-color: " + bck + "; }")
@@ -230,12 +231,14 @@ class ConfigWindow(QDialog):
         if hid is None:
             return
         caps = self.hamlib.get_rig_caps(hid)
+        if caps is None:
+            return
         # populate window
         self.ui.label_model_id_value.setText(str(hid))
         info = _translate("", "Model: ") + f"{caps.model_name.decode()}\n"
         info += _translate("", "Brand: ") + f"{caps.mfg_name.decode()}\n"
         info += _translate("", "ID: ") + f"{hid}\n"
-        info += _translate("", "Status: ") + f"{self.hamlib.decode_status(caps.status)}\n"
+        info += _translate("", "Status: ") + f"{self.hamlib.decode_status(caps.status.value)}\n"
         info += _translate("", "Version: ") + f"{caps.version.decode()}\n"
         self.ui.textEdit_info.setPlainText(info)
         # serial ports
@@ -249,7 +252,7 @@ class ConfigWindow(QDialog):
         idx = self.ui.comboBox_stopbits.findText(str(caps.serial_stop_bits))
         if idx >= 0:
             self.ui.comboBox_stopbits.setCurrentIndex(idx)
-        self.ui.comboBox_parity.setCurrentIndex(caps.serial_parity)
+        self.ui.comboBox_parity.setCurrentIndex(caps.serial_parity.value)
         self.validate(None, None)
 
     def saveconfig(self):
@@ -257,7 +260,7 @@ class ConfigWindow(QDialog):
         Validate and save configuration
         """
         conf = self.loaddata()
-        self.configs[conf['shortname']] = conf
+        self.configs.save(conf)
         QMessageBox.information(self, "Info", _translate("", "Configuration saved"))
         self.accept()
 
@@ -270,7 +273,7 @@ class ConfigWindow(QDialog):
         )
         if reply == QMessageBox.Yes:
             conf = self.loaddata()
-            del self.configs[conf['shortname']]
+            self.configs.delete(conf['shortname'])
             QMessageBox.information(self, "Info", _translate("", "Configuration deleted"))
             self.accept()
 
@@ -0,0 +1,88 @@
+from bisect import bisect_right
+
+""" 
+ShortwaveHunter
+BCL radio software
+Band plan resolver
+
+Copyright (c) 2025 I8ZSE, Giorgio L. Rutigliano
+(www.i8zse.it, www.i8zse.eu, www.giorgiorutigliano.it)
+
+radio communications are handled by https://github.com/Hamlib/Hamlib (LGPL)
+
+This is free software released under LGPL License
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+class BandResolver:
+    """
+    Frequency to band resolution over a band plan with overlapping bands.
+    The plan is split into elementary segments, each owned by the narrowest
+    band covering it (ties to lowest id), so broadcast segments win over the
+    wider ham bands around them. Bands are half open [start, end) in kHz,
+    as broadcasts.band_id
+    """
+
+    def __init__(self, bands):
+        """
+        bands: iterable of (id, band_name, freq_start, freq_end)
+        """
+        bands = [(int(bid), name, float(start), float(end)) for bid, name, start, end in bands]
+        self.by_name = {name: (start, end) for bid, name, start, end in bands}
+        self.starts = []
+        self.owners = []
+        bounds = sorted({start for _, _, start, _ in bands} | {end for _, _, _, end in bands})
+        for lo, hi in zip(bounds, bounds[1:]):
+            covering = [band for band in bands if band[2] <= lo and band[3] >= hi]
+            owner = min(covering, key=lambda band: (band[3] - band[2], band[0])) if covering else None
+            if self.owners and self.owners[-1] == owner:
+                # same owner as previous segment, extend it
+                continue
+            self.starts.append(lo)
+            self.owners.append(owner)
+        if bounds:
+            self.starts.append(bounds[-1])
+            self.owners.append(None)
+
+    def resolve(self, frequency):
+        """
+        return (id, band_name, freq_start, freq_end) of the band owning frequency, or None
+        """
+        idx = bisect_right(self.starts, frequency) - 1
+        if idx < 0:
+            return None
+        return self.owners[idx]
+
+    def band_name(self, frequency, default="---"):
+        band = self.resolve(frequency)
+        return band[1] if band else default
+
+    def band_id(self, frequency):
+        band = self.resolve(frequency)
+        return band[0] if band else None
+
+    def middle(self, band_name):
+        """
+        band center in kHz, None if unknown
+        """
+        try:
+            start, end = self.by_name[band_name]
+        except KeyError:
+            return None
+        return (start + end) / 2
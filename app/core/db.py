@@ -0,0 +1,1369 @@
+import functools
+import re
+import sqlite3
+import threading
+from typing import Optional, Tuple, List
+import os
+from urllib.parse import quote
+from app.core import metrics, geo
+from app.core.bands import BandResolver
+from app.core.logbook import Logbook
+from app.core.rigconfigs import RigConfigs
+from datetime import date, datetime, timedelta
+
+""" 
+ShortwaveHunter
+BCL radio software
+
+Copyright (c) 2025 I8ZSE, Giorgio L. Rutigliano
+(www.i8zse.it, www.i8zse.eu, www.giorgiorutigliano.it)
+
+radio communications are handled by https://github.com/Hamlib/Hamlib (LGPL)
+
+This is free software released under LGPL License
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# prepared statements kept by each connection
+STATEMENT_CACHE = 256
+
+# rows fetched per round by streaming searches
+SEARCH_CHUNK = 200
+
+# columns returned by searches
+SEARCH_COLUMNS = """
+    b.frequency_khz, b.start_time, b.end_time, b.days_operation,
+    c.cname as country, b.station_name, l.lang as language,
+    a.aname as target_area, b.transmitter_site, b.persistence_code,
+    b.start_date, b.end_date, b.remarks,
+    fb.band_name, t.distance_km, t.bearing_deg
+"""
+
+# id of the band a frequency belongs to: narrowest containing band, then lowest id
+BAND_OF = """(SELECT id FROM frequency_bands
+    WHERE {0} >= freq_start AND {0} < freq_end
+    ORDER BY freq_end - freq_start, id LIMIT 1)"""
+
+# columns of the broadcasts_fts full text index
+FTS_COLUMNS = ("station_name", "remarks", "transmitter_site", "country", "language")
+
+# settings keys of the listening location
+QTH_KEYS = ("qth_latitude", "qth_longitude")
+
+# transmitter ids with a site inside a box, for normal and antimeridian crossing boxes
+SITES_IN = "SELECT id FROM transmitters_rtree WHERE max_lat >= ? AND min_lat <= ? AND {0}"
+LON_IN = "max_lon >= ? AND min_lon <= ?"
+LON_WRAP = "(max_lon >= ? OR min_lon <= ?)"
+
+
+# days a validity range with a single date lasts, about an EiBi season
+SEASON_DAYS = 217
+
+# broadcast valid on a day of year, validity may wrap around new year,
+# the day placeholder appears three times
+DOY_VALID = """(CASE WHEN b.start_doy <= b.end_doy THEN {0} BETWEEN b.start_doy AND b.end_doy
+    ELSE {0} >= b.start_doy OR {0} <= b.end_doy END)"""
+
+# EiBi seasons, A summer and B winter, files are named sked-a25.csv
+SEASON_NAME = re.compile(r"[AB]\d\d")
+SEASON_FILE = "season-{0}.db"
+# persistence code of broadcasts off the air during a season
+OFF_SEASON = {"A": 4, "B": 5}
+# broadcasts columns referencing lookup tables, a stored season may
+# outlive a deleted country, language or area
+SEASON_REFS = {"country_id": "countries", "language_id": "languages", "target_area_id": "area"}
+
+# EiBi day codes, in datetime.weekday() order; digit codes count from 1 Monday
+EIBI_DAYS = ("mo", "tu", "we", "th", "fr", "sa", "su")
+
+
+@functools.lru_cache(maxsize=None)
+def eibi_days(code):
+    """
+    frozenset of weekdays (0 Monday .. 6 Sunday) of an EiBi day code, None when
+    the code puts no weekday restriction (empty, irr, alt, dates).
+    1.Sa (first Saturday of the month) is taken as every Saturday
+
+    >>> sorted(eibi_days("Mo-Fr")), sorted(eibi_days("We-Mo")), sorted(eibi_days("SaSu"))
+    ([0, 1, 2, 3, 4], [0, 2, 3, 4, 5, 6], [5, 6])
+    >>> sorted(eibi_days("Tu,Fr")), sorted(eibi_days("135")), sorted(eibi_days("1.Sa"))
+    ([1, 4], [0, 2, 4], [5])
+    >>> eibi_days(""), eibi_days("irr"), eibi_days("24Dec"), sorted(eibi_days("irrSa"))
+    (None, None, None, [5])
+    """
+    code = (code or "").strip().lower()
+    if code[:3] == "irr":
+        code = code[3:]
+    if code[1:2] == "." and code[:1].isdigit():
+        code = code[2:]
+    if not code:
+        return None
+    days = set()
+    for part in code.split(","):
+        part = part.strip()
+        if part.isdigit():
+            if not set(part) <= set("1234567"):
+                return None
+            days.update(int(d) - 1 for d in part)
+        elif len(part) == 5 and part[2] == "-" and part[:2] in EIBI_DAYS and part[3:] in EIBI_DAYS:
+            first, last = EIBI_DAYS.index(part[:2]), EIBI_DAYS.index(part[3:])
+            days.update(d % 7 for d in range(first, last + (7 if last < first else 0) + 1))
+        elif part and len(part) % 2 == 0 and all(part[i:i + 2] in EIBI_DAYS for i in range(0, len(part), 2)):
+            days.update(EIBI_DAYS.index(part[i:i + 2]) for i in range(0, len(part), 2))
+        else:
+            return None
+    return frozenset(days)
+
+
+def on_day(code, weekday):
+    """
+    True if a broadcast with EiBi day code runs on weekday (0 Monday)
+    """
+    days = eibi_days(code)
+    return days is None or weekday in days
+
+
+def day_of_year(ddmm):
+    """
+    EiBi DDMM date as day of the leap year 2000, None if missing or invalid
+    """
+    if not ddmm or not ddmm[:4].isdigit():
+        return None
+    try:
+        return date(2000, int(ddmm[2:4]), int(ddmm[:2])).timetuple().tm_yday
+    except ValueError:
+        return None
+
+
+def doy_range(start_date, end_date):
+    """
+    (start_doy, end_doy) of a validity range, as migration 007
+    """
+    start, end = day_of_year(start_date), day_of_year(end_date)
+    if start is None and end is None:
+        return 1, 366
+    if start is None:
+        start = (end - SEASON_DAYS - 1) % 366 + 1
+    if end is None:
+        end = (start + SEASON_DAYS - 1) % 366 + 1
+    return start, end
+
+
+def today_doy(now=None):
+    """
+    day of year of a date in the 2000 reference, so that March 1 is always 61
+    """
+    now = now or datetime.now()
+    return date(2000, now.month, now.day).timetuple().tm_yday
+
+
+def season_of(path):
+    """
+    season name of an EiBi file name, None if not recognized
+    """
+    match = re.search(r"sked-([ab]\d\d)", os.path.basename(path), re.IGNORECASE)
+    return match.group(1).upper() if match else None
+
+
+def season_at(day):
+    """
+    season of a date: A from the last Sunday of March to the last Sunday
+    of October, B the rest of the year, named after the year it starts
+
+    >>> season_at(date(2025, 6, 1)), season_at(date(2025, 11, 1)), season_at(date(2026, 3, 1))
+    ('A25', 'B25', 'B25')
+    """
+    def last_sunday(month):
+        last = date(day.year, month + 1, 1) - timedelta(days=1)
+        return last - timedelta(days=(last.weekday() + 1) % 7)
+    if day < last_sunday(3):
+        return f"B{(day.year - 1) % 100:02d}"
+    if day < last_sunday(10):
+        return f"A{day.year % 100:02d}"
+    return f"B{day.year % 100:02d}"
+
+
+def previous_season(season):
+    """
+    >>> previous_season("A25"), previous_season("B25")
+    ('B24', 'A25')
+    """
+    if season[0] == "A":
+        return f"B{(int(season[1:]) - 1) % 100:02d}"
+    return "A" + season[1:]
+
+
+def sites_in(box):
+    """
+    search condition and parameters for broadcasts from sites inside
+    (south, north, west, east). The site code test lets the planner start
+    from the r*tree and idx_broadcasts_transmitter, the id test keeps
+    the site of the right country
+    """
+    south, north, west, east = (float(v) for v in box)
+    sites = SITES_IN.format(LON_IN if west <= east else LON_WRAP)
+    sql = (f" AND b.transmitter_site IN (SELECT site_code FROM transmitters WHERE id IN ({sites}))"
+           f" AND t.id IN ({sites})")
+    return sql, [south, north, west, east] * 2
+
+
+def register_functions(conn):
+    """
+    geographic sql functions, on the writer and on every reader
+    """
+    conn.create_function("geo_distance", 4, geo.distance_km, deterministic=True)
+    conn.create_function("geo_bearing", 4, geo.bearing_deg, deterministic=True)
+
+
+def fts_query(text, column=None):
+    """
+    Build a fts5 match expression from free text.
+    every word is quoted and prefix matched, words are and-ed;
+    returns None if text has no searchable word
+    """
+    words = re.findall(r"\w+", text or "")
+    if not words:
+        return None
+    prefix = f"{column} : " if column else ""
+    return " AND ".join(f'{prefix}"{word}"*' for word in words)
+
+
+class RadioDatabase:
+    def __init__(self, obj: object, db_path="."):
+        self.db_file = os.path.join(db_path, "swhunter.db")
+        # single writer connection, shared among threads under write_lock
+        self.write_lock = threading.RLock()
+        self.conn = sqlite3.connect(self.db_file, check_same_thread=False,
+                                    cached_statements=STATEMENT_CACHE)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.row_factory = sqlite3.Row
+        # used by update_distances, one statement over all sites
+        register_functions(self.conn)
+        cursor = self.conn.cursor()
+        # check if db is populated
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
+        tables = cursor.fetchall()
+        if not tables:
+            if obj is not None:
+                obj.settings.clear()
+            self.init_db(db_path)
+        self.upgrade_db(db_path)
+        # WAL lets readers run while the writer is importing
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        # in WAL mode commits need no fsync, only checkpoints do
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        # read only connections, one per thread
+        self._local = threading.local()
+        self._idle = []
+        self._readers = []
+        self._pool_lock = threading.Lock()
+        self.bands = None       # band resolver, built on first use
+        # EiBi rows in broadcasts belong to the active season,
+        # the other ones are kept in season files
+        self.season = self.get_setting("season")
+        # table repositories used by editors
+        self.countries = CountryRepository(self)
+        self.areas = AreaRepository(self)
+        self.languages = LanguageRepository(self)
+        self.frequency_bands = FrequencyBandRepository(self)
+        self.transmitters = TransmitterRepository(self)
+        self.broadcasts = BroadcastRepository(self)
+        self.logbook = Logbook(self)
+        self.rig_configs = RigConfigs(self)
+
+    def init_db(self, db_path):
+        """
+        Execute database creation script
+        """
+        with open(os.path.join(db_path, "dbcreate.sql"), "r") as f:
+            buf = f.read()
+            self.conn.executescript(buf)
+        with open(os.path.join(db_path, "datainit.sql"), "r") as f:
+            buf = f.read()
+            self.conn.executescript(buf)
+
+    def upgrade_db(self, db_path):
+        """
+        Execute migration scripts newer than schema version
+        migrations/NNN_name.sql, NNN is the resulting user_version
+        """
+        mdir = os.path.join(db_path, "migrations")
+        if not os.path.isdir(mdir):
+            return
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        for name in sorted(os.listdir(mdir)):
+            if not name.endswith(".sql"):
+                continue
+            num = int(name.split("_", 1)[0])
+            if num <= version:
+                continue
+            with open(os.path.join(mdir, name), "r") as f:
+                buf = f.read()
+            # script and version bump in one transaction
+            self.conn.executescript(f"BEGIN;\n{buf}\nPRAGMA user_version = {num};\nCOMMIT;")
+
+
+    def reader(self):
+        """
+        return the read only connection bound to the calling thread
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            return conn
+        with self._pool_lock:
+            if self._idle:
+                conn = self._idle.pop()
+            else:
+                uri = f"file:{quote(os.path.abspath(self.db_file))}?mode=ro"
+                conn = sqlite3.connect(uri, uri=True, check_same_thread=False,
+                                       cached_statements=STATEMENT_CACHE)
+                conn.row_factory = sqlite3.Row
+                register_functions(conn)
+                self._readers.append(conn)
+        self._local.conn = conn
+        return conn
+
+    def release_reader(self):
+        """
+        give back the calling thread connection to the pool,
+        worker threads call it before terminating
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._pool_lock:
+            self._idle.append(conn)
+
+    def parse_time_range(self, time_str: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Time range parsing (es: '0000-2400')
+        """
+        if not time_str or time_str.strip() == "":
+            return None, None
+
+        if '-' in time_str:
+            start, end = time_str.split('-', 1)
+            return start.strip(), end.strip()
+
+        return time_str.strip(), None
+
+    def get_or_create_country_id(self, country_code: str) -> Optional[int]:
+        """
+        Get country id
+        """
+        if not country_code:
+            return None
+
+        cursor = self.conn.execute("SELECT id FROM countries WHERE ccode = ?", (country_code,))
+        result = cursor.fetchone()
+
+        if result:
+            return result[0]
+
+        # If not exists, create it
+        cursor = self.conn.execute("INSERT INTO countries (ccode, cname) VALUES (?, ?)",
+                          (country_code, f"Country {country_code}"))
+        return cursor.lastrowid
+
+    def get_or_create_language_id(self, lang_code: str) -> Optional[int]:
+        """
+        Get language id
+        """
+        if not lang_code:
+            return None
+
+        cursor = self.conn.execute("SELECT id FROM languages WHERE code = ?", (lang_code,))
+        result = cursor.fetchone()
+
+        if result:
+            return result[0]
+
+        # If not exists, create it
+        cursor = self.conn.execute("INSERT INTO languages (code, lang) VALUES (?, ?)",
+                          (lang_code, f"Language {lang_code}"))
+        return cursor.lastrowid
+
+    def get_or_create_area_id(self, area_code: str) -> Optional[int]:
+        """
+        get area id
+        """
+        if not area_code:
+            return None
+
+        cursor = self.conn.execute("SELECT id FROM area WHERE acode = ?", (area_code,))
+        result = cursor.fetchone()
+
+        if result:
+            return result[0]
+
+        # If not exists, create it
+        cursor = self.conn.execute("INSERT INTO area (acode, aname) VALUES (?, ?)",
+                          (area_code, f"Area {area_code}"))
+        return cursor.lastrowid
+
+    def load_bands(self):
+        """
+        Load bandplan
+        """
+        cursor = self.reader().execute("SELECT id, band_name, freq_start, freq_end FROM frequency_bands")
+        self.bands = BandResolver(cursor.fetchall())
+        return self.bands
+
+    def get_band(self, frequency):
+        """
+        return band by frequency
+        """
+        bands = self.bands or self.load_bands()
+        return bands.band_name(frequency)
+
+    def rebuild_band_ids(self):
+        """
+        Reassign band_id of broadcasts after a band plan change
+        """
+        band_of = BAND_OF.format("broadcasts.frequency_khz")
+        with self.write_lock:
+            self.conn.execute(f"UPDATE broadcasts SET band_id = {band_of} WHERE band_id IS NOT {band_of}")
+            self.conn.commit()
+
+    def bands_changed(self):
+        """
+        Band plan edited, drop resolver and reassign broadcasts
+        """
+        self.bands = None
+        self.rebuild_band_ids()
+
+    def get_setting(self, key, default=None):
+        """
+        return a value from the settings table
+        """
+        row = self.reader().execute("SELECT value FROM settings WHERE key=?", (key,)).fetchone()
+        return default if row is None else row[0]
+
+    def set_setting(self, key, value):
+        """
+        store a value in the settings table, None removes it
+        """
+        with self.write_lock:
+            if value is None:
+                self.conn.execute("DELETE FROM settings WHERE key=?", (key,))
+            else:
+                self.conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+                                  (key, str(value)))
+            self.conn.commit()
+
+    def get_qth(self):
+        """
+        return (latitude, longitude) of the listening location, None if not set
+        """
+        lat, lon = (self.get_setting(key) for key in QTH_KEYS)
+        if lat is None or lon is None:
+            return None
+        return float(lat), float(lon)
+
+    def set_qth(self, latitude, longitude):
+        """
+        store the listening location and recompute site distances,
+        None clears it
+        """
+        if latitude is None or longitude is None:
+            latitude = longitude = None
+        elif not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise ValueError(f"invalid location {latitude}, {longitude}")
+        with self.write_lock:
+            for key, value in zip(QTH_KEYS, (latitude, longitude)):
+                self.set_setting(key, value)
+            self.update_distances()
+
+    def update_distances(self):
+        """
+        Distance and bearing of every transmitter site from the QTH,
+        a single statement so lookups and searches need no trigonometry
+        """
+        qth = self.get_qth() or (None, None)
+        with self.write_lock, metrics.span("db.distances"):
+            self.conn.execute("""
+                UPDATE transmitters SET
+                    distance_km = geo_distance(?, ?, latitude, longitude),
+                    bearing_deg = geo_bearing(?, ?, latitude, longitude)
+            """, qth + qth)
+            self.conn.commit()
+
+    def off_season(self):
+        """
+        persistence code not on the air in the active season,
+        8 (inactive) when no season is active
+        """
+        return OFF_SEASON.get((self.season or "")[:1], 8)
+
+    def season_file(self, season):
+        return os.path.join(os.path.dirname(self.db_file), SEASON_FILE.format(season))
+
+    def seasons(self):
+        """
+        return [(season, broadcasts)] of stored seasons and the active one,
+        oldest first
+        """
+        folder = os.path.dirname(self.db_file) or "."
+        prefix, suffix = SEASON_FILE.split("{0}")
+        result = {}
+        for name in os.listdir(folder):
+            season = name[len(prefix):-len(suffix)]
+            if name.startswith(prefix) and name.endswith(suffix) and SEASON_NAME.fullmatch(season):
+                uri = f"file:{quote(os.path.abspath(self.season_file(season)))}?mode=ro"
+                conn = sqlite3.connect(uri, uri=True)
+                try:
+                    result[season] = conn.execute("SELECT count(*) FROM broadcasts").fetchone()[0]
+                except sqlite3.Error:
+                    result[season] = 0
+                finally:
+                    conn.close()
+        if self.season:
+            result[self.season] = self.reader().execute(
+                "SELECT count(*) FROM broadcasts WHERE fleibi != 0").fetchone()[0]
+        return sorted(result.items(), key=lambda item: (item[0][1:], item[0][0]))
+
+    def _attach_season(self, season):
+        # attach is not allowed inside a transaction
+        self.conn.commit()
+        self.conn.execute("ATTACH DATABASE ? AS season", (self.season_file(season),))
+
+    def _detach_season(self):
+        self.conn.commit()
+        self.conn.execute("DETACH DATABASE season")
+
+    def store_season(self, season=None):
+        """
+        Copy the EiBi rows to the season file of season, default the
+        active one, return the number of rows stored
+        """
+        season = season or self.season
+        if not season:
+            return 0
+        with self.write_lock, metrics.span("db.season.store"):
+            self._attach_season(season)
+            try:
+                # a copy of the current table, whatever the schema version
+                self.conn.execute("DROP TABLE IF EXISTS season.broadcasts")
+                self.conn.execute("CREATE TABLE season.broadcasts AS SELECT * FROM main.broadcasts WHERE fleibi != 0")
+                return self.conn.execute("SELECT count(*) FROM season.broadcasts").fetchone()[0]
+            finally:
+                self._detach_season()
+
+    def switch_season(self, season):
+        """
+        Make season the active one: EiBi rows of the active season go to
+        its season file and are replaced by the stored ones of season,
+        none if it was never stored. Manually entered broadcasts stay.
+        Without an active season the EiBi rows loaded so far are stored
+        first, as the season of today or the one before season.
+        return the number of broadcasts restored
+        """
+        season = season.upper()
+        if not SEASON_NAME.fullmatch(season):
+            raise ValueError(f"invalid season {season}, expected A or B and two year digits")
+        with self.write_lock, metrics.span("db.season.switch"):
+            active = self.season
+            if not active:
+                if not self.conn.execute("SELECT 1 FROM broadcasts WHERE fleibi != 0 LIMIT 1").fetchone():
+                    self.set_setting("season", season)
+                    self.season = season
+                    return 0
+                # self.season changes only with the setting, below
+                current = season_at(date.today())
+                active = current if current != season else previous_season(season)
+            if season == active:
+                return 0
+            self.store_season(active)
+            stored = os.path.exists(self.season_file(season))
+            if stored:
+                self._attach_season(season)
+            try:
+                self.conn.execute("DELETE FROM main.broadcasts WHERE fleibi != 0")
+                count = self._restore_season() if stored else 0
+                # rows and active season change in a single commit
+                self.set_setting("season", season)
+            except Exception:
+                self.conn.rollback()
+                raise
+            finally:
+                if stored:
+                    self._detach_season()
+            self.season = season
+            return count
+
+    def _restore_season(self):
+        main = [row[1] for row in self.conn.execute("PRAGMA main.table_info(broadcasts)")]
+        stored = {row[1] for row in self.conn.execute("PRAGMA season.table_info(broadcasts)")}
+        columns = [col for col in main if col in stored]
+        values = []
+        for col in columns:
+            if col == "band_id":
+                # the band plan may have changed meanwhile
+                values.append(BAND_OF.format("s.frequency_khz"))
+            elif col in SEASON_REFS:
+                values.append(f"(SELECT id FROM main.{SEASON_REFS[col]} WHERE id = s.{col})")
+            else:
+                values.append(f"s.{col}")
+        cursor = self.conn.execute(f"INSERT INTO main.broadcasts ({', '.join(columns)}) "
+                                   f"SELECT {', '.join(values)} FROM season.broadcasts s")
+        return cursor.rowcount
+
+    def get_band_limits(self, band):
+        """
+        return (freq_start, freq_end) of a band in kHz, None if unknown
+        """
+        bands = self.bands or self.load_bands()
+        return bands.by_name.get(band)
+
+    def get_middle(self, band):
+        """
+        return band center
+        """
+        bands = self.bands or self.load_bands()
+        middle = bands.middle(band)
+        if middle is None:
+            return 10000000
+        return middle * 1000
+
+
+    def import_eibi_csv(self, csv_file_path: str, update: bool = True, season=None):
+        """
+        Imports eibi csv, into season when given: it becomes the active
+        season and the previous one is kept in its season file
+        """
+        with self.write_lock, metrics.span("db.import"):
+            if season:
+                self.switch_season(season)
+            start = datetime.now()
+            result = self._import_eibi_csv(csv_file_path, update)
+            elapsed = (datetime.now() - start).total_seconds()
+            if elapsed > 0:
+                metrics.observe("db.import.rows_per_s", (result[0] + result[1]) / elapsed)
+            metrics.count("db.import.errors", len(result[2]))
+            return result
+
+    def _import_eibi_csv(self, csv_file_path: str, update: bool):
+        imported_count = 0
+        updated_count = 0
+        error_list = []
+
+        if not update:
+            self.conn.execute ("delete from broadcasts where fleibi != 0;")
+            self.conn.commit()
+
+        with open(csv_file_path, 'r') as file:
+            # first line contains headers
+            next(file, None)
+
+            for line_num, line in enumerate(file, 2):
+                try:
+                    # strip line
+                    line = line.strip()
+                    if not line:
+                        continue
+                    fields = line.split(';')
+                    if len(fields) < 11:
+                        error_list.append(f"Row {line_num}: not enough data ({len(fields)})")
+                        continue
+
+                    # Process fields
+                    frequency = float(fields[0]) if fields[0] else None
+                    start_time, end_time = self.parse_time_range(fields[1])
+                    days_operation = fields[2] if fields[2] else None
+                    country_code = fields[3] if fields[3] else None
+                    station_name = fields[4] if fields[4] else "Unknown"
+                    language_code = fields[5] if fields[5] else None
+                    target_area_code = fields[6] if fields[6] else None
+                    transmitter_site = fields[7] if fields[7] else None
+                    persistence_code = int(fields[8]) if fields[8].isdigit() else None
+                    start_date = fields[9] if fields[9] else None
+                    end_date = fields[10] if len(fields) > 10 and fields[10] else None
+
+                    # remarks 
+                    remarks = None
+                    if len(fields) > 11:
+                        remarks = ';'.join(fields[11:])
+                    elif end_date and '[' in end_date:
+                        # remarks in end date
+                        remarks = end_date
+                        end_date = None
+
+                    if not frequency:
+                        error_list.append(f"Row {line_num}: missing frequency")
+                        continue
+
+                    # get ids of related fields
+                    country_id = self.get_or_create_country_id(country_code)
+                    language_id = self.get_or_create_language_id(language_code)
+                    area_id = self.get_or_create_area_id(target_area_code)
+
+                    # check if already exists
+                    existing_cursor = self.conn.execute("""
+                        SELECT id FROM broadcasts 
+                        WHERE frequency_khz = ? AND station_name = ? AND start_time = ?
+                    """, (frequency, station_name, start_time))
+
+                    existing = existing_cursor.fetchone()
+
+                    if existing and update:
+                        # Update row
+                        self.conn.execute("""
+                            UPDATE broadcasts SET
+                                end_time = ?, days_operation = ?, country_id = ?,
+                                language_id = ?, target_area_id = ?, transmitter_site = ?,
+                                persistence_code = ?, start_date = ?, end_date = ?, remarks = ?,
+                                start_doy = ?, end_doy = ?, updated_at = CURRENT_TIMESTAMP
+                            WHERE id = ?
+                        """, (end_time, days_operation, country_id, language_id, area_id,
+                              transmitter_site, persistence_code, start_date, end_date, remarks,
+                              *doy_range(start_date, end_date), existing[0]))
+                        updated_count += 1
+
+                    elif not existing:
+                        # Insert new row
+                        self.conn.execute(f"""
+                            INSERT INTO broadcasts (
+                                frequency_khz, start_time, end_time, days_operation, country_id,
+                                station_name, language_id, target_area_id, transmitter_site,
+                                persistence_code, start_date, end_date, remarks, fleibi, band_id,
+                                start_doy, end_doy
+                            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1, {BAND_OF.format('?')}, ?, ?)
+                        """, (frequency, start_time, end_time, days_operation, country_id,
+                              station_name, language_id, area_id, transmitter_site,
+                              persistence_code, start_date, end_date, remarks, frequency, frequency,
+                              *doy_range(start_date, end_date)))
+                        imported_count += 1
+
+                    # Commit every 1000 lines
+                    if (imported_count + updated_count) % 1000 == 0:
+                        self.conn.commit()
+
+                except Exception as e:
+                    error_list.append(f"Row {line_num}: error {e}")
+                    continue
+
+        self.conn.commit()
+        return (imported_count, updated_count, error_list)
+
+
+################## Lookup on frequency based on current time/day of week
+
+    def _get_curtime(self):
+        """
+        get current time
+        """
+        now = datetime.now()
+        current_time = now.strftime("%H%M")
+        current_day = now.weekday()     # 0 Monday
+
+        # 10 minutes allowance
+        time_margin = timedelta(minutes=10)
+        start_time = (now - time_margin).strftime("%H%M")
+        end_time = (now + time_margin).strftime("%H%M")
+
+        return current_time, current_day, start_time, end_time
+
+    def _time2min(self, time_str):
+        """
+        convert hh:mm to minutes from 00:00
+        """
+        if len(time_str) == 4:
+            hours = int(time_str[:2])
+            minutes = int(time_str[2:])
+            return hours * 60 + minutes
+        return 0
+
+    def _check_dow(self, days_operation, current_day):
+        """
+        Check if dow is ok, current_day 0 is Monday
+        """
+        return on_day(days_operation, current_day)
+
+    def _check_time(self, start_time, end_time, current_start, current_end):
+        """
+        check time
+        """
+        if not start_time or not end_time:
+            return True  # Se non ci sono orari, assume sempre attiva
+
+        try:
+            # Converte in minuti per facilitare il confronto
+
+            broadcast_start = self._time2min(start_time)
+            broadcast_end = self._time2min(end_time)
+            window_start = self._time2min(current_start)
+            window_end = self._time2min(current_end)
+
+            if broadcast_end < broadcast_start:
+                # handles skeds that crosses midnight
+                return (window_start >= broadcast_start or window_end <= broadcast_end or
+                        window_start <= broadcast_end or window_end >= broadcast_start)
+            else:
+                return not (window_end < broadcast_start or window_start > broadcast_end)
+
+        except (ValueError, IndexError):
+            return True
+
+    def lookup(self, freq=10000.0):
+        """
+        Do database lookup based on frequency
+        """
+        try:
+            cursor = self.reader().cursor()
+            current_time, current_day, start_window, end_window = self._get_curtime()
+            freq_min = float(freq) - 5.0
+            freq_max = float(freq) + 5.0
+
+            query = """
+            SELECT 
+                b.id,
+                b.frequency_khz,
+                b.start_time,
+                b.end_time,
+                b.days_operation,
+                b.station_name,
+                c.cname as country_name,
+                l.lang as language_name,
+                b.persistence_code,
+                b.transmitter_site,
+                b.remarks,
+                t.distance_km,
+                t.bearing_deg
+            FROM broadcasts b
+            LEFT JOIN countries c ON b.country_id = c.id
+            LEFT JOIN languages l ON b.language_id = l.id
+            LEFT JOIN transmitters t ON t.site_code = b.transmitter_site AND t.country_code = c.ccode
+            WHERE b.frequency_khz >= ? AND b.frequency_khz <= ?
+                AND b.persistence_code NOT IN (8, ?)
+                AND {0}
+            ORDER BY b.frequency_khz, t.distance_km IS NULL, t.distance_km, b.start_time
+            """.format(DOY_VALID.format("?"))
+
+            with metrics.span("db.lookup"):
+                cursor.execute(query, (freq_min, freq_max, self.off_season()) + (today_doy(),) * 3)
+                rows = cursor.fetchall()
+                results = []
+                # Filter data
+                for row in rows:
+                    row_dict = dict(row)
+                    # check days of week
+                    if self._check_dow(row_dict['days_operation'], current_day):
+                        # check time
+                        if self._check_time(row_dict['start_time'], row_dict['end_time'], start_window, end_window):
+                            results.append(row_dict)
+
+            return results, 0, ""
+
+        except sqlite3.Error as e:
+            return [], -1, f"Database error loading data: {str(e)}"
+        except Exception as e:
+            return [], -2, f"Error in lookup data: {str(e)}"
+
+    def on_air(self, bands=None):
+        """
+        Broadcasts on air now, in the given band names or in all bands,
+        ordered by frequency
+        """
+        current_time, current_day, start_window, end_window = self._get_curtime()
+        query = """
+            SELECT
+                b.id, b.frequency_khz, b.start_time, b.end_time, b.days_operation,
+                b.station_name, c.cname as country_name, l.lang as language_name,
+                b.transmitter_site, fb.band_name, t.distance_km
+            FROM broadcasts b
+            LEFT JOIN countries c ON b.country_id = c.id
+            LEFT JOIN languages l ON b.language_id = l.id
+            LEFT JOIN frequency_bands fb ON fb.id = b.band_id
+            LEFT JOIN transmitters t ON t.site_code = b.transmitter_site AND t.country_code = c.ccode
+            WHERE b.persistence_code NOT IN (8, ?)
+        """
+        query += " AND " + DOY_VALID.format("?")
+        params = [self.off_season()] + [today_doy()] * 3
+        if bands:
+            query += f" AND fb.band_name IN ({', '.join('?' for _ in bands)})"
+            params.extend(bands)
+        query += " ORDER BY b.frequency_khz, t.distance_km IS NULL, t.distance_km"
+        with metrics.span("db.on_air"):
+            rows = self.reader().execute(query, params).fetchall()
+            return [dict(row) for row in rows
+                    if self._check_dow(row['days_operation'], current_day)
+                    and self._check_time(row['start_time'], row['end_time'], current_time, current_time)]
+
+########### Free field search
+
+    def search_skeds(self, filters):
+        """
+        Free fields search
+        """
+        results = []
+        for rows in self.iter_search_skeds(filters):
+            results.extend(rows)
+        return results
+
+    def iter_search_skeds(self, filters, chunk=SEARCH_CHUNK, columns=SEARCH_COLUMNS):
+        """
+        Free fields search, yields lists of at most chunk rows.
+        runs on the calling thread reader, so a search worker can be
+        stopped with reader().interrupt() from another thread
+        """
+        query, params = self._search_query(filters, columns)
+        with metrics.span("db.search.query"):
+            cursor = self.reader().execute(query, params)
+        columns = [description[0] for description in cursor.description]
+        while True:
+            rows = cursor.fetchmany(chunk)
+            if not rows:
+                break
+            yield [dict(zip(columns, row)) for row in rows]
+
+    def _search_query(self, filters, columns=SEARCH_COLUMNS):
+        """
+        build search statement and parameters from filters
+        """
+        query = "SELECT" + columns + """
+            FROM broadcasts b
+            LEFT JOIN countries c ON b.country_id = c.id
+            LEFT JOIN languages l ON b.language_id = l.id
+            LEFT JOIN area a ON b.target_area_id = a.id
+            LEFT JOIN frequency_bands fb ON fb.id = b.band_id
+            LEFT JOIN transmitters t ON t.site_code = b.transmitter_site AND t.country_code = c.ccode
+        """
+
+        params = []
+
+        # full text filters: station name and free text on all indexed columns
+        match = [fts_query(filters.get('station'), 'station_name'), fts_query(filters.get('text'))]
+        match = [m for m in match if m]
+        if match:
+            query += " JOIN broadcasts_fts f ON f.rowid = b.id WHERE broadcasts_fts MATCH ?"
+            params.append(" AND ".join(match))
+        else:
+            query += " WHERE 1=1"
+
+        # Filtri possibili
+        if 'freq_min' in filters:
+            query += " AND b.frequency_khz >= ?"
+            params.append(filters['freq_min'])
+
+        if 'freq_max' in filters:
+            query += " AND b.frequency_khz <= ?"
+            params.append(filters['freq_max'])
+
+        if 'country' in filters:
+            query += " AND c.ccode = ?"
+            params.append(filters['country'])
+
+        if 'language' in filters:
+            query += " AND l.code = ?"
+            params.append(filters['language'])
+
+        if 'target_area' in filters:
+            query += " AND a.acode = ?"
+            params.append(filters['target_area'])
+
+        if 'band' in filters:
+            query += " AND b.band_id = (SELECT id FROM frequency_bands WHERE band_name = ?)"
+            params.append(filters['band'])
+
+        if 'time' in filters:
+            # Ricerca per ora specifica (formato HHMM)
+            query += " AND (b.start_time <= ? AND b.end_time >= ?)"
+            params.extend([filters['time'], filters['time']])
+
+        if filters.get('start_date') or filters.get('end_date'):
+            # valid at some time in the range, a single date is a one day range
+            start = day_of_year(filters.get('start_date') or filters.get('end_date'))
+            end = day_of_year(filters.get('end_date') or filters.get('start_date'))
+            if start is None or end is None:
+                raise ValueError("dates must be in DDMM format")
+            # circular ranges overlap when either start lies in the other range
+            query += (" AND ((CASE WHEN ? <= ? THEN b.start_doy BETWEEN ? AND ?"
+                      " ELSE b.start_doy >= ? OR b.start_doy <= ? END) OR " + DOY_VALID.format("?") + ")")
+            params.extend([start, end, start, end, start, end, start, start, start])
+
+        if 'max_distance' in filters:
+            query += " AND t.distance_km <= ?"
+            params.append(float(filters['max_distance']))
+
+        if 'bbox' in filters:
+            # sites inside (south, north, west, east), from the r*tree
+            sql, box = sites_in(filters['bbox'])
+            query += sql
+            params.extend(box)
+
+        if 'near' in filters:
+            # sites within km of (latitude, longitude): r*tree box, then exact distance
+            lat, lon, km = (float(v) for v in filters['near'])
+            sql, box = sites_in(geo.bounding_box(lat, lon, km))
+            query += sql + " AND geo_distance(?, ?, t.latitude, t.longitude) <= ?"
+            params.extend(box + [lat, lon, km])
+
+        if filters.get('order') == 'distance':
+            # nearest sites first, unknown sites last
+            query += " ORDER BY t.distance_km IS NULL, t.distance_km, b.frequency_khz, b.start_time"
+        elif match and filters.get('text'):
+            # best matches first
+            query += " ORDER BY f.rank, b.frequency_khz, b.start_time"
+        else:
+            query += " ORDER BY b.frequency_khz, b.start_time"
+
+        if 'limit' in filters:
+            query += " LIMIT ?"
+            params.append(int(filters['limit']))
+
+        return query, params
+
+    def get_statistics(self) -> dict:
+        """
+        Return database usage, read from the stats_* summary tables
+        """
+        stats = {}
+        conn = self.reader()
+
+        # Conteggi generali
+        cursor = conn.execute("SELECT IFNULL(SUM(cnt), 0) FROM stats_country")
+        stats['total_broadcasts'] = cursor.fetchone()[0]
+
+        cursor = conn.execute("SELECT COUNT(*) FROM stats_station")
+        stats['unique_stations'] = cursor.fetchone()[0]
+
+        cursor = conn.execute("SELECT COUNT(*) FROM countries")
+        stats['countries'] = cursor.fetchone()[0]
+
+        cursor = conn.execute("SELECT COUNT(*) FROM languages")
+        stats['languages'] = cursor.fetchone()[0]
+
+        # Top 10 stations
+        cursor = conn.execute("""
+            SELECT station_name, cnt as freq_count
+            FROM stats_station
+            ORDER BY cnt DESC
+            LIMIT 10
+        """)
+        stats['top_stations'] = cursor.fetchall()
+
+        # Band distribution
+        cursor = conn.execute("""
+            SELECT fb.band_name, s.cnt as count
+            FROM stats_band s
+            LEFT JOIN frequency_bands fb ON fb.id = s.band_id
+            ORDER BY s.cnt DESC
+        """)
+        stats['band_distribution'] = cursor.fetchall()
+
+        # Country distribution
+        cursor = conn.execute("""
+            SELECT c.cname, s.cnt as count
+            FROM stats_country s
+            LEFT JOIN countries c ON c.id = s.country_id
+            ORDER BY s.cnt DESC
+        """)
+        stats['country_distribution'] = cursor.fetchall()
+
+        # Language distribution
+        cursor = conn.execute("""
+            SELECT l.lang, s.cnt as count
+            FROM stats_language s
+            LEFT JOIN languages l ON l.id = s.language_id
+            ORDER BY s.cnt DESC
+        """)
+        stats['language_distribution'] = cursor.fetchall()
+
+        return stats
+
+    def get_countries(self):
+        cursor = self.reader().execute("SELECT ccode, cname FROM countries")
+        return cursor.fetchall()
+
+    def get_langs(self):
+        cursor = self.reader().execute("SELECT code, lang FROM languages")
+        return cursor.fetchall()
+
+    def get_areas(self):
+        cursor = self.reader().execute("SELECT acode, aname FROM area")
+        return cursor.fetchall()
+
+    def get_bands(self):
+        cursor = self.reader().execute("SELECT id, band_name FROM frequency_bands")
+        return cursor.fetchall()
+
+    def close(self):
+        """
+        Close connections
+        """
+        self.logbook.close()
+        with self._pool_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers = []
+            self._idle = []
+        self.conn.close()
+
+
+################## Table repositories
+
+class Repository:
+    """
+    Fixed statements for a single table.
+    All sql text is built once from class attributes, never from user input,
+    so the connection statement cache is reused across calls
+    """
+    table = None
+    columns = ()            # editable columns, in form order
+    search_fields = ()      # columns searchable with LIKE
+    order = "id"
+    key = None              # unique code column
+    label = None            # column shown in combo boxes
+    ref_column = None       # broadcasts column referencing this table
+
+    def __init__(self, db):
+        self.db = db
+        cols = ", ".join(self.columns)
+        select = f"SELECT id, {cols} FROM {self.table}"
+        self.sql_list = f"{select} ORDER BY {self.order}"
+        self.sql_search = {
+            field: f"{select} WHERE {field} LIKE ? ORDER BY {self.order}"
+            for field in self.search_fields
+        }
+        if self.search_fields:
+            where = " OR ".join(f"{field} LIKE ?" for field in self.search_fields)
+            self.sql_search[None] = f"{select} WHERE {where} ORDER BY {self.order}"
+        self.sql_get = f"SELECT {cols} FROM {self.table} WHERE id=?"
+        self.sql_insert = (f"INSERT INTO {self.table} ({cols}) "
+                           f"VALUES ({', '.join('?' for _ in self.columns)})")
+        self.sql_update = (f"UPDATE {self.table} SET {', '.join(c + '=?' for c in self.columns)} "
+                           f"WHERE id=?")
+        self.sql_delete = f"DELETE FROM {self.table} WHERE id=?"
+        if self.key:
+            self.sql_key = f"SELECT id FROM {self.table} WHERE {self.key}=?"
+        if self.label:
+            self.sql_choices = f"SELECT id, {self.label} FROM {self.table} ORDER BY {self.label}"
+        if self.ref_column:
+            self.sql_refs = f"SELECT COUNT(*) FROM broadcasts WHERE {self.ref_column}=?"
+
+    def list(self, search_params=None):
+        """
+        return all rows, or rows matching (field, term);
+        field None searches all fields
+        """
+        if not search_params:
+            return self.db.reader().execute(self.sql_list).fetchall()
+        field, term = search_params
+        if field not in self.sql_search:
+            raise ValueError(f"Invalid search field {field}")
+        nparm = len(self.search_fields) if field is None else 1
+        return self.db.reader().execute(self.sql_search[field], (f"%{term}%",) * nparm).fetchall()
+
+    def get(self, row_id):
+        return self.db.reader().execute(self.sql_get, (row_id,)).fetchone()
+
+    def exists(self, code):
+        """
+        check unique code
+        """
+        return self.db.reader().execute(self.sql_key, (code,)).fetchone() is not None
+
+    def choices(self):
+        return self.db.reader().execute(self.sql_choices).fetchall()
+
+    def references(self, row_id):
+        """
+        number of broadcasts referencing the row
+        """
+        return self.db.reader().execute(self.sql_refs, (row_id,)).fetchone()[0]
+
+    def _write(self, sql, params):
+        with self.db.write_lock:
+            cursor = self.db.conn.execute(sql, params)
+            self.db.conn.commit()
+        return cursor.lastrowid
+
+    def insert(self, data):
+        return self._write(self.sql_insert, tuple(data))
+
+    def update(self, row_id, data):
+        self._write(self.sql_update, tuple(data) + (row_id,))
+
+    def delete(self, row_id):
+        self._write(self.sql_delete, (row_id,))
+
+
+class CountryRepository(Repository):
+    table = "countries"
+    columns = ("ccode", "cname")
+    search_fields = ("ccode", "cname")
+    order = "ccode"
+    key = "ccode"
+    label = "cname"
+    ref_column = "country_id"
+
+
+class AreaRepository(Repository):
+    table = "area"
+    columns = ("acode", "aname")
+    search_fields = ("acode", "aname")
+    order = "acode"
+    key = "acode"
+    label = "aname"
+    ref_column = "target_area_id"
+
+
+class LanguageRepository(Repository):
+    table = "languages"
+    columns = ("code", "lang", "area", "code2")
+    search_fields = ("code", "lang", "area", "code2")
+    order = "code"
+    key = "code"
+    label = "lang"
+    ref_column = "language_id"
+
+
+class FrequencyBandRepository(Repository):
+    table = "frequency_bands"
+    columns = ("band_name", "freq_start", "freq_end", "description")
+    search_fields = ("band_name", "description")
+    order = "freq_start"
+    key = "band_name"
+
+    def __init__(self, db):
+        super().__init__(db)
+        self.sql_search["range"] = (
+            "SELECT id, band_name, freq_start, freq_end, description FROM frequency_bands "
+            "WHERE ? BETWEEN freq_start AND freq_end ORDER BY freq_start")
+
+    def list(self, search_params=None):
+        if search_params and search_params[0] == "range":
+            # term is a frequency, ValueError if not numeric
+            freq = float(search_params[1])
+            return self.db.reader().execute(self.sql_search["range"], (freq,)).fetchall()
+        return super().list(search_params)
+
+    def _write(self, sql, params):
+        rowid = super()._write(sql, params)
+        self.db.bands_changed()
+        return rowid
+
+
+class TransmitterRepository(Repository):
+    table = "transmitters"
+    columns = ("country_code", "site_code", "name", "latitude", "longitude")
+    search_fields = ("country_code", "site_code", "name")
+    order = "country_code, site_code"
+
+    sql_sites = "SELECT DISTINCT site_code FROM transmitters ORDER BY site_code"
+
+    def sites(self):
+        """
+        distinct site codes
+        """
+        return self.db.reader().execute(self.sql_sites).fetchall()
+
+    def _write(self, sql, params):
+        rowid = super()._write(sql, params)
+        self.db.update_distances()
+        return rowid
+
+
+class BroadcastRepository(Repository):
+    table = "broadcasts"
+    columns = ("frequency_khz", "start_time", "end_time", "days_operation",
+               "country_id", "station_name", "language_id", "target_area_id",
+               "transmitter_site", "persistence_code", "start_date", "end_date", "remarks")
+
+    sql_browse = """SELECT b.id, b.frequency_khz,
+                    b.start_time, b.end_time, b.station_name,
+                    c.cname, l.lang
+                    FROM broadcasts b
+                    LEFT JOIN countries c ON b.country_id = c.id
+                    LEFT JOIN languages l ON b.language_id = l.id
+                    LEFT JOIN area a ON b.target_area_id = a.id
+                 """
+    fts_where = " WHERE b.id IN (SELECT rowid FROM broadcasts_fts WHERE broadcasts_fts MATCH ?)"
+    browse_where = {
+        "frequency_khz": " WHERE b.frequency_khz = ?",
+        "station_name": fts_where,
+        "country": fts_where,
+        "language": fts_where,
+        "target_area": " WHERE a.aname LIKE ?",
+        None: fts_where,
+    }
+    browse_order = " ORDER BY b.frequency_khz, b.start_time"
+
+    def __init__(self, db):
+        super().__init__(db)
+        # band_id follows frequency_khz, the first column, start_doy and end_doy the dates
+        band_of = BAND_OF.format("?")
+        self.sql_insert = (self.sql_insert.replace(") VALUES (", ", band_id, start_doy, end_doy) VALUES (")[:-1]
+                           + f", {band_of}, ?, ?)")
+        self.sql_update = self.sql_update.replace(" WHERE id=?",
+                                                  f", band_id={band_of}, start_doy=?, end_doy=? WHERE id=?")
+        self.sql_list = self.sql_browse + self.browse_order
+        self.sql_search = {field: self.sql_browse + where + self.browse_order
+                           for field, where in self.browse_where.items()}
+
+    def list(self, search_params=None):
+        if search_params and search_params[0] is None:
+            # all fields: a number is a frequency, anything else free text on the indexed columns
+            try:
+                float(search_params[1])
+                search_params = ("frequency_khz", search_params[1])
+            except ValueError:
+                match = fts_query(search_params[1])
+                if match is None:
+                    return []
+                return self.db.reader().execute(self.sql_search[None], (match,)).fetchall()
+        if search_params and search_params[0] == "frequency_khz":
+            # term is a frequency, ValueError if not numeric
+            freq = float(search_params[1])
+            return self.db.reader().execute(self.sql_search["frequency_khz"], (freq,)).fetchall()
+        if search_params and search_params[0] in FTS_COLUMNS:
+            field, term = search_params
+            match = fts_query(term, field)
+            if match is None:
+                return []
+            return self.db.reader().execute(self.sql_search[field], (match,)).fetchall()
+        return super().list(search_params)
+
+    def _computed(self, data):
+        """
+        parameters of the columns computed from data
+        """
+        doy = doy_range(data[self.columns.index("start_date")], data[self.columns.index("end_date")])
+        return (data[0], data[0]) + doy
+
+    def insert(self, data):
+        data = tuple(data)
+        return self._write(self.sql_insert, data + self._computed(data))
+
+    def update(self, row_id, data):
+        data = tuple(data)
+        self._write(self.sql_update, data + self._computed(data) + (row_id,))
+
+    def delete(self, row_id):
+        # change history references the broadcast
+        with self.db.write_lock:
+            self.db.conn.execute("DELETE FROM broadcast_history WHERE broadcast_id=?", (row_id,))
+            self.db.conn.execute(self.sql_delete, (row_id,))
+            self.db.conn.commit()
+
+
+
+if __name__ == "__main__":
+    db = RadioDatabase(None, "data")
+    print(db.lookup(10000))
\ No newline at end of file
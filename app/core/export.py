@@ -0,0 +1,192 @@
+import csv
+import json
+
+from app.core import metrics
+
+""" 
+ShortwaveHunter
+BCL radio software
+Streaming exporters: CSV, JSON Lines, EiBi CSV, ADIF
+
+Copyright (c) 2025 I8ZSE, Giorgio L. Rutigliano
+(www.i8zse.it, www.i8zse.eu, www.giorgiorutigliano.it)
+
+radio communications are handled by https://github.com/Hamlib/Hamlib (LGPL)
+
+This is free software released under LGPL License
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+
+EXPORT_CHUNK = 1000
+EIBI_HEADER = "kHz:75;Time(UTC):93;Days:59;ITU:49;Station:201;Lng:49;Target:62;Remarks:135;P:35;Start:60;Stop:60;"
+FORMATS = ("csv", "jsonl", "eibi", "adif")
+
+# EiBi fields in import_eibi_csv order, selected by the search query
+EIBI_COLUMNS = """
+    b.frequency_khz, b.start_time, b.end_time, b.days_operation, c.ccode,
+    b.station_name, l.code, a.acode, b.transmitter_site, b.persistence_code,
+    b.start_date, b.end_date, b.remarks
+"""
+
+
+def _chunks(cursor, chunk=EXPORT_CHUNK):
+    while True:
+        rows = cursor.fetchmany(chunk)
+        if not rows:
+            return
+        yield rows
+
+
+def _log_chunks(db, filters):
+    # entries still queued for the writer are part of the log
+    db.logbook.flush()
+    cursor = db.logbook.cursor(**filters)
+    columns = [d[0] for d in cursor.description]
+    for rows in _chunks(cursor):
+        yield [dict(zip(columns, row)) for row in rows]
+
+
+def _source(db, filters, log):
+    """
+    Chunks of row dicts, from the schedule (search filters) or the logbook
+    """
+    if log:
+        return _log_chunks(db, filters or {})
+    return db.iter_search_skeds(filters or {}, EXPORT_CHUNK)
+
+
+def export_csv(db, path, filters=None, log=False):
+    """
+    Schedule or logbook to csv with header, return exported rows
+    """
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as file, metrics.span("export.csv"):
+        writer = None
+        for rows in _source(db, filters, log):
+            if writer is None:
+                writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+                writer.writeheader()
+            writer.writerows(rows)
+            count += len(rows)
+    return count
+
+
+def export_jsonl(db, path, filters=None, log=False):
+    """
+    Schedule or logbook to JSON Lines, one object per row
+    """
+    count = 0
+    with open(path, "w", encoding="utf-8") as file, metrics.span("export.jsonl"):
+        for rows in _source(db, filters, log):
+            file.write("".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows))
+            count += len(rows)
+    return count
+
+
+def eibi_line(row):
+    freq, start, end, days, ccode, station, lang, acode, site, pers, sdate, edate, remarks = row
+    fields = [
+        f"{freq:g}",
+        f"{start}-{end}" if start and end else "",
+        days or "",
+        ccode or "",
+        station or "",
+        lang or "",
+        acode or "",
+        site or "",
+        "" if pers is None else str(pers),
+        sdate or "",
+        edate or "",
+    ]
+    if remarks:
+        fields.append(remarks)
+    return ";".join(fields)
+
+
+def export_eibi(db, path, filters=None):
+    """
+    Schedule (search filters) in the EiBi csv format read by import_eibi_csv
+    """
+    count = 0
+    with open(path, "w", encoding="utf-8") as file, metrics.span("export.eibi"):
+        file.write(EIBI_HEADER + "\n")
+        for rows in db.iter_search_skeds(filters or {}, EXPORT_CHUNK, EIBI_COLUMNS):
+            file.write("".join(eibi_line(row.values()) + "\n" for row in rows))
+            count += len(rows)
+    return count
+
+
+def adif_field(name, value):
+    if value is None or value == "":
+        return ""
+    value = str(value)
+    return f"<{name}:{len(value)}>{value} "
+
+
+def adif_record(entry):
+    date, _, clock = (entry["logged_at"] or "").partition(" ")
+    return "".join((
+        adif_field("CALL", entry["station_name"]),
+        adif_field("SWL", "Y"),
+        adif_field("QSO_DATE", date.replace("-", "")),
+        adif_field("TIME_ON", clock.replace(":", "")),
+        adif_field("FREQ", f"{entry['frequency_khz'] / 1000:.4f}"),
+        adif_field("MODE", entry["mode"]),
+        adif_field("RST_RCVD", entry["sinpo"]),
+        adif_field("COUNTRY", entry["country_name"]),
+        adif_field("APP_SWHUNTER_LANGUAGE", entry["language_name"]),
+        adif_field("APP_SWHUNTER_SMETER", entry["smeter"]),
+        adif_field("MY_RIG", entry["rig"]),
+        adif_field("COMMENT", entry["notes"]),
+        "<EOR>\n",
+    ))
+
+
+def export_adif(db, path, filters=None):
+    """
+    Logbook entries to ADIF (.adi), SWL records
+    """
+    count = 0
+    with open(path, "w", encoding="utf-8") as file, metrics.span("export.adif"):
+        file.write("ShortwaveHunter reception log\n"
+                   f"{adif_field('ADIF_VER', '3.1.4')}{adif_field('PROGRAMID', 'swhunter')}<EOH>\n")
+        for rows in _log_chunks(db, filters or {}):
+            file.write("".join(adif_record(entry) for entry in rows))
+            count += len(rows)
+    return count
+
+
+def export(db, fmt, path, filters=None, log=False):
+    """
+    Export by format name, return exported rows.
+    the calling thread reader goes back to the pool when done
+    """
+    try:
+        if fmt == "csv":
+            return export_csv(db, path, filters, log)
+        if fmt == "jsonl":
+            return export_jsonl(db, path, filters, log)
+        if fmt == "eibi":
+            return export_eibi(db, path, filters)
+        if fmt == "adif":
+            return export_adif(db, path, filters)
+        raise ValueError(f"unknown export format {fmt}")
+    finally:
+        db.release_reader()
@@ -0,0 +1,103 @@
+from math import radians, degrees, sin, cos, asin, atan2, sqrt
+
+""" 
+ShortwaveHunter
+BCL radio software
+Great circle distance, bearing and Maidenhead locators
+
+Copyright (c) 2025 I8ZSE, Giorgio L. Rutigliano
+(www.i8zse.it, www.i8zse.eu, www.giorgiorutigliano.it)
+
+radio communications are handled by https://github.com/Hamlib/Hamlib (LGPL)
+
+This is free software released under LGPL License
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+
+EARTH_RADIUS = 6371.0   # km, mean radius
+
+
+def distance_km(lat1, lon1, lat2, lon2):
+    """
+    Haversine distance in km, None when a coordinate is missing
+    """
+    if lat1 is None or lon1 is None or lat2 is None or lon2 is None:
+        return None
+    p1, p2 = radians(lat1), radians(lat2)
+    dp, dl = p2 - p1, radians(lon2 - lon1)
+    a = sin(dp / 2) ** 2 + cos(p1) * cos(p2) * sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS * asin(min(1.0, sqrt(a)))
+
+
+def bearing_deg(lat1, lon1, lat2, lon2):
+    """
+    Initial great circle bearing from point 1 to point 2, 0-360 from north
+    """
+    if lat1 is None or lon1 is None or lat2 is None or lon2 is None:
+        return None
+    p1, p2 = radians(lat1), radians(lat2)
+    dl = radians(lon2 - lon1)
+    y = sin(dl) * cos(p2)
+    x = cos(p1) * sin(p2) - sin(p1) * cos(p2) * cos(dl)
+    return (degrees(atan2(y, x)) + 360.0) % 360.0
+
+
+def bounding_box(lat, lon, km):
+    """
+    (south, north, west, east) box containing the circle of radius km,
+    west > east when it crosses the antimeridian
+    """
+    dlat = degrees(km / EARTH_RADIUS)
+    south, north = lat - dlat, lat + dlat
+    if south <= -90 or north >= 90:
+        # a pole is inside, all longitudes
+        return max(south, -90.0), min(north, 90.0), -180.0, 180.0
+    # widest longitude span of the circle
+    dlon = degrees(asin(min(1.0, sin(km / EARTH_RADIUS) / cos(radians(lat)))))
+    if dlon >= 180:
+        return south, north, -180.0, 180.0
+    west, east = lon - dlon, lon + dlon
+    if west < -180:
+        west += 360
+    if east > 180:
+        east -= 360
+    return south, north, west, east
+
+
+def locator_to_latlon(locator):
+    """
+    Center of a 4 or 6 character Maidenhead locator (JN70, JN70dt),
+    ValueError if not valid
+    """
+    loc = locator.strip().upper()
+    if len(loc) not in (4, 6) or not ("A" <= loc[0] <= "R" and "A" <= loc[1] <= "R"
+                                      and loc[2:4].isdigit()):
+        raise ValueError(f"invalid locator {locator}")
+    lon = (ord(loc[0]) - 65) * 20 - 180 + int(loc[2]) * 2
+    lat = (ord(loc[1]) - 65) * 10 - 90 + int(loc[3])
+    if len(loc) == 6:
+        if not ("A" <= loc[4] <= "X" and "A" <= loc[5] <= "X"):
+            raise ValueError(f"invalid locator {locator}")
+        lon += (ord(loc[4]) - 65) / 12 + 1 / 24
+        lat += (ord(loc[5]) - 65) / 24 + 1 / 48
+    else:
+        lon += 1
+        lat += 0.5
+    return lat, lon
@@ -5,7 +5,9 @@ import logging
 from ctypes import c_int, c_char_p, c_double, c_void_p, POINTER, CFUNCTYPE, c_long
 from enum import IntEnum
 from gettext import gettext as _
-from PyQt5 import QtCore
+from app.core import metrics, rigcaps
+from app.core.rigcaps import RigCaps, RIG_CAPS_VERSION_CPTR, RIG_LEVEL_STRENGTH, RIG_MODES, RIG_MODES_INV, \
+    POLL_MODE, POLL_SMETER
 
 """ 
 ShortwaveHunter
@@ -36,7 +38,8 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-_translate = QtCore.QCoreApplication.translate
+# application root, hamlib dlls are shipped in hamlib/bin on windows
+ROOTDIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 RIG_VFO_CURR = 0
 RIG_VFO_A = 1
@@ -63,43 +66,6 @@ class RigState(IntEnum):
     RIG_EARG = -15
 
 
-class RigCaps(ctypes.Structure):
-    _fields_ = [
-        ("rig_model", c_int),  # Radio model ID
-        ("model_name", c_char_p),  # Model name
-        ("mfg_name", c_char_p),  # Manufacturer name
-        ("version", c_char_p),  # Version
-        ("copyright", c_char_p),  # Copyright
-        ("status", c_int),  # Status (stable, beta, etc.)
-        ("rig_type", c_int),  # Radio type
-        ("ptt_type", c_int),  # PTT type
-        ("dcd_type", c_int),  # DCD type
-        ("port_type", c_int),  # Port type
-        ("serial_rate_min", c_int),  # Minimum serial speed
-        ("serial_rate_max", c_int),  # Maximum serial speed
-        ("serial_data_bits", c_int),  # Serial data bits
-        ("serial_stop_bits", c_int),  # Serial stop bits
-        ("serial_parity", c_int),  # Serial parity
-        ("serial_handshake", c_int),  # Serial handshake
-        ("write_delay", c_int),  # Write delay
-        ("post_write_delay", c_int),  # Post-write delay
-        ("timeout", c_int),  # Timeout
-        ("retry", c_int)  # Retry attempts
-    ]
-
-
-RIG_MODES = {
-    "AM": 1,
-    "CW": 2,
-    "USB": 4,
-    "LSB": 8,
-    "RTTY": 16,
-    "FM": 32
-}
-
-RIG_MODES_INV = {v: k for k, v in RIG_MODES.items()}
-
-
 class HamlibError(Exception):
     def __init__(self, code, message=""):
         self.code = code
@@ -122,8 +88,14 @@ class HamlibWrapper():
     }
 
 
-    def __init__(self, rootapp):
+    def __init__(self, rootapp=None, db=None):
+        """
+        rootapp: application, gets hllink and show_error calls; without it
+        (scripts, cli) errors are only logged
+        db: database keeping rig capabilities, default the rootapp one
+        """
         self.rootapp = rootapp
+        self.hllink = False
         self.lib = None
         self.rig = None
         self.rigid = None
@@ -131,10 +103,29 @@ class HamlibWrapper():
         self._load_library()
         self._setup_c_function()
         self._rig_list = {}
-        self.flmode = True
-        self.flsmeter = True
+        # capabilities of the open model and the poll steps they allow
+        self.caps = None
+        self.plan = rigcaps.POLL_STEPS
+        self.capcache = rigcaps.CapsCache(db if db is not None else getattr(rootapp, 'db', None))
 
 
+    def _link(self, flag):
+        """
+        Record hamlib availability
+        """
+        self.hllink = flag
+        if self.rootapp is not None:
+            self.rootapp.hllink = flag
+
+    def _report(self, error_type, message, details="", **kwargs):
+        """
+        Report error to the application, or log it
+        """
+        if self.rootapp is not None:
+            self.rootapp.show_error(error_type, message, details, **kwargs)
+        else:
+            logging.error(f"Error {error_type}: {message} | {details}")
+
     def _load_library(self):
         """
         load hamlib lib
@@ -142,7 +133,7 @@ class HamlibWrapper():
         system = platform.system().lower()
         loader = ctypes.CDLL
         if system == 'windows':
-            paths = ["c:\\windows", "c:\\windows\\system32", os.path.join(self.rootapp.rootdir, 'hamlib', 'bin')]
+            paths = ["c:\\windows", "c:\\windows\\system32", os.path.join(getattr(self.rootapp, 'rootdir', None) or ROOTDIR, 'hamlib', 'bin')]
             names = ['hamlib-4.dll', 'hamlib.dll', 'libhamlib-4.dll', 'libhamlib.dll']
             loader = ctypes.WinDLL
         elif system == 'darwin':
@@ -157,12 +148,12 @@ class HamlibWrapper():
             for name in names:
                 try:
                     self.lib = loader(os.path.join(path, name))
-                    self.rootapp.hllink = True
+                    self._link(True)
                     return
                 except OSError:
                     continue
-        self.rootapp.hllink = False
-        self.rootapp.show_error("hamlib", _("hamlib not found!"), _("Radio functions are disabled"))
+        self._link(False)
+        self._report("hamlib", _("hamlib not found!"), _("Radio functions are disabled"))
 
     def _setup_c_function(self):
         """
@@ -223,6 +214,9 @@ class HamlibWrapper():
         # rig_get_caps()
         self.lib.rig_get_caps.restype = ctypes.POINTER(RigCaps)
         self.lib.rig_get_caps.argtypes = [ctypes.c_int]
+        if hasattr(self.lib, 'rig_get_caps_cptr'):
+            self.lib.rig_get_caps_cptr.restype = ctypes.c_char_p
+            self.lib.rig_get_caps_cptr.argtypes = [ctypes.c_int, ctypes.c_int]
 
         # rig_set_debug debug verbosity
         self.lib.rig_set_debug.argtypes = [ctypes.c_int]
@@ -257,11 +251,16 @@ class HamlibWrapper():
         self.lib.rig_set_cache_timeout_ms.restype = c_int
 
         # get_level
-        self.lib.rig_has_get_level.argtypes = [c_void_p, c_int, POINTER(ctypes.c_int)]
-        self.lib.rig_has_get_level.restype = c_long
+        self.lib.rig_has_get_level.argtypes = [c_void_p, ctypes.c_uint64]
+        self.lib.rig_has_get_level.restype = ctypes.c_uint64
         self.lib.rig_get_level.argtypes = [c_void_p, c_int, c_int, POINTER(ctypes.c_int)]
         self.lib.rig_get_level.restype = c_int
 
+        # filter widths from the rig caps, no rig i/o
+        for name in ("rig_passband_narrow", "rig_passband_normal", "rig_passband_wide"):
+            getattr(self.lib, name).argtypes = [c_void_p, ctypes.c_uint64]
+            getattr(self.lib, name).restype = c_long
+
         # rigerror
         self.lib.rigerror.argtypes = [ctypes.c_int]
         self.lib.rigerror.restype = ctypes.c_char_p
@@ -274,11 +273,11 @@ class HamlibWrapper():
         try:
             result = self.lib.rig_load_all_backends()
             if result < 0:
-                self.rootapp.hllink = False
-                self.rootapp.show_error("hamlib", _("Can't supported radio list, error") + f" {result}")
+                self._link(False)
+                self._report("hamlib", _("Can't supported radio list, error") + f" {result}")
             return result
         except Exception as e:
-            self.rootapp.show_error("hamlib", _("Fatal error - ") + f" {e}", abort=10)
+            self._report("hamlib", _("Fatal error - ") + f" {e}", abort=10)
             return -1
 
     def get_radio_list(self):
@@ -349,15 +348,87 @@ class HamlibWrapper():
 
     def get_rig_caps(self, id):
         """
-        get rig caps
+        get rig caps, only the leading fields (names, status, serial
+        parameters) are valid, see RigCaps
         Args: id (int): hamlib ID
-        dict: dictionary
+        dict: dictionary, None for unknown or mismatching models
         """
         caps_ptr = self.lib.rig_get_caps(id)
-        if not caps_ptr:
+        if not caps_ptr or caps_ptr.contents.rig_model != id:
             return None
         return caps_ptr.contents
 
+    def caps_version(self):
+        """
+        driver version of the initialized model
+        """
+        if hasattr(self.lib, 'rig_get_caps_cptr'):
+            version = self.lib.rig_get_caps_cptr(self.rigid, RIG_CAPS_VERSION_CPTR)
+        else:
+            caps = self.get_rig_caps(self.rigid)
+            version = caps.version if caps is not None else None
+        return version.decode(errors="ignore") if version else ""
+
+    def probe_caps(self, version):
+        """
+        capabilities of the initialized model from the hamlib api, without
+        rig i/o: S-meter and filter widths (narrow, normal, wide) per mode.
+        hamlib has no call telling mode readback or mode support, both
+        start enabled and are dropped on the first refusal of the rig
+        """
+        filters = {}
+        for mstr, mode in RIG_MODES.items():
+            widths = [getattr(self.lib, name)(self.rig, mode) for name in
+                      ("rig_passband_narrow", "rig_passband_normal", "rig_passband_wide")]
+            if widths[1] > 0:
+                filters[mstr] = widths
+        return {
+            'model': self.rigid,
+            'version': version,
+            POLL_MODE: True,
+            POLL_SMETER: bool(self.lib.rig_has_get_level(self.rig, RIG_LEVEL_STRENGTH)),
+            'modes': list(RIG_MODES),
+            'filters': filters,
+        }
+
+    def load_caps(self):
+        """
+        capabilities of the initialized model, probed on first use of the
+        model (or of a new driver version) then taken from the cache
+        """
+        version = self.caps_version()
+        caps = self.capcache.get(self.rigid, version)
+        if caps is None:
+            caps = self.probe_caps(version)
+            self.capcache.put(caps)
+        self.caps = caps
+        self.plan = rigcaps.poll_plan(caps)
+        return caps
+
+    def modes(self):
+        """
+        mode names the open rig supports
+        """
+        return rigcaps.mode_choices(self.caps)
+
+    def _drop_step(self, step, status):
+        """
+        a poll step failed: skip it for this session, and for good when
+        the rig does not implement it
+        """
+        self.plan = tuple(s for s in self.plan if s != step)
+        if self.caps is not None and status in (RigState.RIG_ENIMPL, RigState.RIG_ENAVAIL):
+            self.caps[step] = False
+            self.capcache.put(self.caps)
+
+    def _drop_mode(self, mstr):
+        """
+        the rig refused a mode: no longer offer it for this model
+        """
+        if self.caps is not None and mstr in self.caps['modes']:
+            self.caps['modes'] = [m for m in self.caps['modes'] if m != mstr]
+            self.capcache.put(self.caps)
+
     def decode_status(self, stc):
         try:
             return self.status_map[stc]
@@ -425,6 +496,8 @@ class HamlibWrapper():
         emsg = ""
         if result == RigState.RIG_OK:
             return 0, ''
+        metrics.count("rig.errors")
+        metrics.count(f"rig.errors.{func}")
         # decode error
         emsg = "Unknown error"
         try:
@@ -578,10 +651,18 @@ class HamlibWrapper():
             mode = RIG_MODES[mstr]
         except:
             return -1, "Invalid mode"
-        for width in [0, 500, 2400, 6000, 10000]:
+        if mstr not in self.modes():
+            return RigState.RIG_ENAVAIL, "Mode not supported"
+        widths = [0, 500, 2400, 6000, 10000]
+        if self.caps and mstr in self.caps['filters']:
+            # normal passband, then the model own filters
+            widths = [0] + [w for w in self.caps['filters'][mstr] if w > 0]
+        for width in widths:
             result = self.lib.rig_set_mode(self.rig, vfo, mode, width)
             if result == 0:
                 break
+        if result in (RigState.RIG_EINVAL, RigState.RIG_ENIMPL, RigState.RIG_ENAVAIL):
+            self._drop_mode(mstr)
         return self._get_error(result, 'setmode', f"vfo: {vfo}, mode: {mstr}")
 
     def get_smeter(self, vfo=RIG_VFO_A):
@@ -590,10 +671,9 @@ class HamlibWrapper():
         if not self.opnd:
             return -2, "Open Rig first", ""
 
-        RIG_LEVEL_STRENGTH = (1 << 30)  # 0x40000000
-
         value = ctypes.c_int(0)
-        if self.lib.rig_has_get_level(self.rig, RIG_LEVEL_STRENGTH, ctypes.byref(value)) == RIG_LEVEL_STRENGTH:
+        result = RigState.RIG_ENAVAIL
+        if self.lib.rig_has_get_level(self.rig, RIG_LEVEL_STRENGTH) == RIG_LEVEL_STRENGTH:
             result = self.lib.rig_get_level(self.rig, vfo + 1, RIG_LEVEL_STRENGTH, ctypes.byref(value))
         s, e = self._get_error(result, 'getsmeter', f"vfo: {vfo}")
         return value.value, s, e
@@ -643,6 +723,8 @@ class HamlibWrapper():
         sts = self.init_rig(conf['id'])
         if sts <= 0:
             return sts
+        self.load_caps()
+        port = conf['port']
         if platform.system().lower() == "windows":
             port = "////.//" + conf['port']
         self.set_conf("rig_pathname", port)
@@ -653,9 +735,6 @@ class HamlibWrapper():
         self.set_conf("timeout", "1000")
         self.set_conf("retry", "2")
 
-        self.flmode = True
-        self.flsmeter = True
-
         self.lib.rig_set_vfo_opt(self.rig, 0)
 
         s, e = self.open()
@@ -678,19 +757,24 @@ class HamlibWrapper():
         read radio values
         """
         try:
-            freq, s, e = self.get_frequency(vfo)
-            if e: raise HamlibError(e, f"{e} reading freq")
-            mstr = "---"
-            if self.flmode:
-                mstr, mode, width, s, e = self.get_mode(0)
-                if e:
-                    self.flmode = False
-            smeter = -54
-            if self.flsmeter:
-                smeter, s, e = self.get_smeter(0)
-                if e:
-                    self.flsmeter = False
-                    smeter = -54
+            with metrics.span("rig.poll"):
+                with metrics.span("rig.poll.freq"):
+                    freq, s, e = self.get_frequency(vfo)
+                if e: raise HamlibError(e, f"{e} reading freq")
+                # only the steps the model supports, see load_caps
+                mstr = "---"
+                if POLL_MODE in self.plan:
+                    with metrics.span("rig.poll.mode"):
+                        mstr, mode, width, s, e = self.get_mode(0)
+                    if s:
+                        self._drop_step(POLL_MODE, s)
+                smeter = -54
+                if POLL_SMETER in self.plan:
+                    with metrics.span("rig.poll.smeter"):
+                        smeter, s, e = self.get_smeter(0)
+                    if s:
+                        self._drop_step(POLL_SMETER, s)
+                        smeter = -54
             return 0, mstr, freq, smeter, ""
         except HamlibError as e:
             return e, None, None, None, str(e)
@@ -0,0 +1,181 @@
+import logging
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+
+from app.core import metrics
+
+""" 
+ShortwaveHunter
+BCL radio software
+Reception logbook with batched writes
+
+Copyright (c) 2025 I8ZSE, Giorgio L. Rutigliano
+(www.i8zse.it, www.i8zse.eu, www.giorgiorutigliano.it)
+
+radio communications are handled by https://github.com/Hamlib/Hamlib (LGPL)
+
+This is free software released under LGPL License
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+
+LOG_COLUMNS = ("broadcast_id", "logged_at", "frequency_khz", "station_name", "country_name",
+               "language_name", "mode", "smeter", "sinpo", "rig", "notes")
+BATCH_SIZE = 100
+FLUSH_INTERVAL = 2.0    # seconds an entry may wait before commit
+
+
+class Logbook:
+    """
+    Reception log. append() only queues the entry, a writer thread commits
+    queued entries in batches (BATCH_SIZE or FLUSH_INTERVAL, whichever first)
+    so logging never waits for the disk. Queries run on the reader pool
+    """
+
+    sql_insert = (f"INSERT INTO reception_log ({', '.join(LOG_COLUMNS)}) "
+                  f"VALUES ({', '.join('?' for _ in LOG_COLUMNS)})")
+    sql_select = f"SELECT id, {', '.join(LOG_COLUMNS)} FROM reception_log"
+
+    def __init__(self, db, batch=BATCH_SIZE, interval=FLUSH_INTERVAL):
+        self.db = db
+        self.batch = batch
+        self.interval = interval
+        self.queue = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def append(self, entry):
+        """
+        Queue a log entry (dict with LOG_COLUMNS keys), frequency_khz required,
+        logged_at defaults to now utc
+        """
+        if entry.get("frequency_khz") is None:
+            raise ValueError("frequency_khz is required")
+        row = dict(entry)
+        if not row.get("logged_at"):
+            row["logged_at"] = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        self._start()
+        self.queue.put(tuple(row.get(col) for col in LOG_COLUMNS))
+        metrics.count("log.appended")
+
+    def _start(self):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._writer, name="swhlog", daemon=True)
+                self.thread.start()
+
+    def _writer(self):
+        """
+        Writer thread, None in the queue stops it
+        """
+        stop = False
+        while not stop:
+            rows = [self.queue.get()]
+            deadline = time.monotonic() + self.interval
+            while len(rows) < self.batch and rows[-1] is not None:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    rows.append(self.queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            if rows[-1] is None:
+                stop = True
+            entries = [r for r in rows if r is not None]
+            try:
+                if entries:
+                    self._commit(entries)
+            except Exception as e:
+                logging.error(f"logbook write error: {e}, {len(entries)} entries lost")
+            finally:
+                for _ in rows:
+                    self.queue.task_done()
+
+    def _commit(self, entries):
+        with metrics.span("log.commit"), self.db.write_lock:
+            try:
+                self.db.conn.executemany(self.sql_insert, entries)
+                self.db.conn.commit()
+            except Exception:
+                # rows inserted before the failure must not ride on another commit
+                self.db.conn.rollback()
+                raise
+        metrics.observe("log.batch", len(entries))
+
+    def flush(self):
+        """
+        Wait until all queued entries are committed
+        """
+        if self.thread is not None:
+            self.queue.join()
+
+    def close(self):
+        if self.thread is not None and self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+        self.thread = None
+
+    def _where(self, start=None, end=None, station=None, freq_min=None, freq_max=None):
+        """
+        Filter clause and parameters, every filter has its index
+        """
+        where, params = [], []
+        if start:
+            where.append("logged_at >= ?")
+            params.append(start)
+        if end:
+            where.append("logged_at < ?")
+            params.append(end)
+        if station:
+            where.append("station_name = ? COLLATE NOCASE")
+            params.append(station)
+        if freq_min is not None:
+            where.append("frequency_khz >= ?")
+            params.append(freq_min)
+        if freq_max is not None:
+            where.append("frequency_khz <= ?")
+            params.append(freq_max)
+        return (" WHERE " + " AND ".join(where)) if where else "", params
+
+    def cursor(self, **filters):
+        """
+        Cursor over the entries, oldest first; filters: start, end
+        (utc 'YYYY-MM-DD[ HH:MM:SS]', end excluded), station, freq_min, freq_max
+        """
+        where, params = self._where(**filters)
+        return self.db.reader().execute(f"{self.sql_select}{where} ORDER BY logged_at, id", params)
+
+    def entries(self, limit=None, **filters):
+        """
+        List of entries, newest first
+        """
+        where, params = self._where(**filters)
+        query = f"{self.sql_select}{where} ORDER BY logged_at DESC, id DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(int(limit))
+        return [dict(row) for row in self.db.reader().execute(query, params)]
+
+    def delete(self, entry_id):
+        with self.db.write_lock:
+            self.db.conn.execute("DELETE FROM reception_log WHERE id = ?", (entry_id,))
+            self.db.conn.commit()
@@ -0,0 +1,177 @@
+import json
+import math
+import threading
+import time
+
+""" 
+ShortwaveHunter
+BCL radio software
+Instrumentation, named spans, counters and histograms
+
+Copyright (c) 2025 I8ZSE, Giorgio L. Rutigliano
+(www.i8zse.it, www.i8zse.eu, www.giorgiorutigliano.it)
+
+radio communications are handled by https://github.com/Hamlib/Hamlib (LGPL)
+
+This is free software released under LGPL License
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+
+# log2 buckets over [BUCKET_BASE, BUCKET_BASE * 2**BUCKETS), spans are in msec
+BUCKET_BASE = 0.001
+BUCKETS = 48
+
+enabled = False
+_lock = threading.Lock()
+_counters = {}
+_histograms = {}
+
+
+class Histogram:
+    """
+    Fixed size log2 histogram with count, sum, min and max
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.buckets = [0] * BUCKETS
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        idx = int(math.log2(value / BUCKET_BASE)) if value > BUCKET_BASE else 0
+        self.buckets[min(idx, BUCKETS - 1)] += 1
+
+    def percentile(self, pct):
+        """
+        Upper bound of the bucket holding the pct percentile, clamped to max
+        """
+        rank = pct / 100.0 * self.count
+        seen = 0
+        for idx, num in enumerate(self.buckets):
+            seen += num
+            if num and seen >= rank:
+                return min(BUCKET_BASE * 2 ** (idx + 1), self.max)
+        return self.max
+
+    def as_dict(self):
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "mean": round(self.total / self.count, 6),
+            "min": round(self.min, 6),
+            "p50": round(self.percentile(50), 6),
+            "p90": round(self.percentile(90), 6),
+            "p99": round(self.percentile(99), 6),
+            "max": round(self.max, 6),
+            "buckets": {f"<{BUCKET_BASE * 2 ** (i + 1):g}": n for i, n in enumerate(self.buckets) if n},
+        }
+
+
+class _NoSpan:
+    """
+    Shared do nothing span, returned while instrumentation is disabled
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOSPAN = _NoSpan()
+
+
+class Span:
+    """
+    Times a with block into the histogram name, in msec
+    """
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.name, (time.perf_counter() - self.start) * 1000.0)
+        return False
+
+
+def span(name):
+    if not enabled:
+        return _NOSPAN
+    return Span(name)
+
+
+def count(name, num=1):
+    if not enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + num
+
+
+def observe(name, value):
+    """
+    Add value to histogram name
+    """
+    if not enabled:
+        return
+    with _lock:
+        hist = _histograms.get(name)
+        if hist is None:
+            hist = _histograms[name] = Histogram()
+        hist.add(value)
+
+
+def enable(flag=True):
+    global enabled
+    enabled = bool(flag)
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def snapshot():
+    with _lock:
+        return {
+            "enabled": enabled,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "counters": dict(sorted(_counters.items())),
+            "histograms": {k: v.as_dict() for k, v in sorted(_histograms.items())},
+        }
+
+
+def dump(path):
+    with open(path, "w") as file:
+        json.dump(snapshot(), file, indent=2)
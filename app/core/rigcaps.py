@@ -1,4 +1,5 @@
 import ctypes
+import json
 from ctypes import Structure, Union, POINTER, c_int, c_uint, c_char, c_char_p, c_double, c_float, c_long, c_ulong, \
     c_short, c_ushort, c_ubyte, c_void_p, c_size_t
 from enum import IntEnum
@@ -48,7 +49,7 @@ RIG_SETTING_MAX = 64
 # Basic type definitions for hamlib compatibility
 hamlib_port_t = c_int
 freq_t = c_double
-shortfreq_t = c_float
+shortfreq_t = c_long
 pbwidth_t = c_long
 dcd_t = c_int
 ptt_t = c_int
@@ -60,13 +61,13 @@ ant_t = c_int
 powerstat_t = c_int
 reset_t = c_int
 parm_t = c_int
-setting_t = c_ulong
+setting_t = ctypes.c_uint64
 value_t = c_int
 chan_t = c_uint
 bank_t = c_int
 rig_model_t = c_int
 tone_t = c_uint
-rmode_t = c_int
+rmode_t = ctypes.c_uint64
 ann_t = c_int
 vfo_op_t = c_int
 scan_t = c_int
@@ -90,6 +91,15 @@ RIG_MODES = {
 
 RIG_MODES_INV = {v: k for k, v in RIG_MODES.items()}
 
+RIG_LEVEL_STRENGTH = 1 << 30
+# rig_get_caps_cptr() fields, hamlib 4.2+
+RIG_CAPS_VERSION_CPTR = 0
+
+# optional poll steps, the frequency is always read
+POLL_MODE = "get_mode"
+POLL_SMETER = "smeter"
+POLL_STEPS = (POLL_MODE, POLL_SMETER)
+
 
 # Enumerations
 class RigState(IntEnum):
@@ -327,134 +337,9 @@ PowerStatFunc = ctypes.CFUNCTYPE(c_int, POINTER(RIG), powerstat_t)
 GetPowerStatFunc = ctypes.CFUNCTYPE(c_int, POINTER(RIG), POINTER(powerstat_t))
 
 
-class rig_caps(Structure):
-    _fields_ = [
-        ("rig_model", rig_model_t),
-        ("model_name", c_char_p),
-        ("mfg_name", c_char_p),
-        ("version", c_char_p),
-        ("copyright", c_char_p),
-        ("status", rig_status_e),
-
-        ("rig_type", c_int),
-        ("ptt_type", ptt_type_t),
-        ("dcd_type", dcd_type_t),
-        ("port_type", rig_port_t),
-
-        ("serial_rate_min", c_int),
-        ("serial_rate_max", c_int),
-        ("serial_data_bits", c_int),
-        ("serial_stop_bits", c_int),
-        ("serial_parity", serial_parity_e),
-        ("serial_handshake", serial_handshake_e),
-
-        ("write_delay", c_int),
-        ("post_write_delay", c_int),
-        ("timeout", c_int),
-        ("retry", c_int),
-
-        ("has_get_func", setting_t),
-        ("has_set_func", setting_t),
-        ("has_get_level", setting_t),
-        ("has_set_level", setting_t),
-        ("has_get_parm", setting_t),
-        ("has_set_parm", setting_t),
-
-        ("level_gran", gran_t * 0),  # RIG_SETTING_MAX would be actual size
-        ("parm_gran", gran_t * 0),  # RIG_SETTING_MAX would be actual size
-
-        ("extparms", POINTER(confparams)),
-        ("extlevels", POINTER(confparams)),
-        ("extfuncs", POINTER(confparams)),
-        ("ext_tokens", POINTER(c_int)),
-
-        ("ctcss_list", POINTER(tone_t)),
-        ("dcs_list", POINTER(tone_t)),
-
-        ("preamp", c_int * 0),  # HAMLIB_MAXDBLSTSIZ would be actual size
-        ("attenuator", c_int * 0),  # HAMLIB_MAXDBLSTSIZ would be actual size
-        ("max_rit", shortfreq_t),
-        ("max_xit", shortfreq_t),
-        ("max_ifshift", shortfreq_t),
-
-        ("agc_level_count", c_int),
-        ("agc_levels", agc_level_e * 0),  # HAMLIB_MAX_AGC_LEVELS would be actual size
-
-        ("announces", ann_t),
-
-        ("vfo_ops", vfo_op_t),
-        ("scan_ops", scan_t),
-        ("targetable_vfo", c_int),
-        ("transceive", c_int),
-
-        ("bank_qty", c_int),
-        ("chan_desc_sz", c_int),
-
-        ("chan_list", chan_t * 0),  # HAMLIB_CHANLSTSIZ would be actual size
-
-        ("rx_range_list1", freq_range_t * 0),  # HAMLIB_FRQRANGESIZ would be actual size
-        ("tx_range_list1", freq_range_t * 0),
-        ("rx_range_list2", freq_range_t * 0),
-        ("tx_range_list2", freq_range_t * 0),
-        ("rx_range_list3", freq_range_t * 0),
-        ("tx_range_list3", freq_range_t * 0),
-        ("rx_range_list4", freq_range_t * 0),
-        ("tx_range_list4", freq_range_t * 0),
-        ("rx_range_list5", freq_range_t * 0),
-        ("tx_range_list5", freq_range_t * 0),
-
-        ("tuning_steps", tuning_step_list * 0),  # HAMLIB_TSLSTSIZ would be actual size
-        ("filters", filter_list * 0),  # HAMLIB_FLTLSTSIZ would be actual size
-
-        ("str_cal", cal_table_t),
-        ("swr_cal", cal_table_float_t),
-        ("alc_cal", cal_table_float_t),
-        ("rfpower_meter_cal", cal_table_float_t),
-        ("comp_meter_cal", cal_table_float_t),
-        ("vd_meter_cal", cal_table_float_t),
-        ("id_meter_cal", cal_table_float_t),
-
-        ("spectrum_scopes", rig_spectrum_scope * 0),  # HAMLIB_MAX_SPECTRUM_SCOPES would be actual size
-        ("spectrum_modes", rig_spectrum_mode_e * 0),  # HAMLIB_MAX_SPECTRUM_MODES would be actual size
-        ("spectrum_spans", freq_t * 0),  # HAMLIB_MAX_SPECTRUM_SPANS would be actual size
-        ("spectrum_avg_modes", rig_spectrum_avg_mode * 0),  # HAMLIB_MAX_SPECTRUM_AVG_MODES would be actual size
-        ("spectrum_attenuator", c_int * 0),  # HAMLIB_MAXDBLSTSIZ would be actual size
-
-        ("cfgparams", POINTER(confparams)),
-        ("priv", c_void_p),
-
-        # Function pointers
-        ("rig_init", CFUNCTYPE(c_int, POINTER(RIG))),
-        ("rig_cleanup", CFUNCTYPE(c_int, POINTER(RIG))),
-        ("rig_open", CFUNCTYPE(c_int, POINTER(RIG))),
-        ("rig_close", CFUNCTYPE(c_int, POINTER(RIG))),
-
-        ("set_freq", CFUNCTYPE(c_int, POINTER(RIG), vfo_t, freq_t)),
-        ("get_freq", CFUNCTYPE(c_int, POINTER(RIG), vfo_t, POINTER(freq_t))),
-
-        # ... (all other function pointers would follow the same pattern)
-        # For brevity, I'm omitting the rest of the 100+ function pointers
-        # but they would all be defined similarly to the ones above
-
-        ("clone_combo_set", c_char_p),
-        ("clone_combo_get", c_char_p),
-        ("macro_name", c_char_p),
-
-        ("async_data_supported", c_int),
-        ("read_frame_direct", CFUNCTYPE(c_int, POINTER(RIG), ctypes.c_size_t, POINTER(ctypes.c_ubyte))),
-        ("is_async_frame", CFUNCTYPE(c_int, POINTER(RIG), ctypes.c_size_t, POINTER(ctypes.c_ubyte))),
-        ("process_async_frame", CFUNCTYPE(c_int, POINTER(RIG), ctypes.c_size_t, POINTER(ctypes.c_ubyte))),
-
-        ("hamlib_check_rig_caps", c_char_p),
-        ("get_conf2", CFUNCTYPE(c_int, POINTER(RIG), hamlib_token_t, c_char_p, c_int)),
-        ("password", CFUNCTYPE(c_int, POINTER(RIG), c_char_p)),
-        ("set_lock_mode", CFUNCTYPE(c_int, POINTER(RIG), c_int)),
-        ("get_lock_mode", CFUNCTYPE(c_int, POINTER(RIG), POINTER(c_int))),
-
-        ("timeout_retry", ctypes.c_short),
-        ("morse_qsize", ctypes.c_short),
-    ]
-# Main rig_caps structure
+# Main rig_caps structure. Only the leading fields, up to retry, follow the
+# hamlib layout: later ones are at the wrong offsets and must not be read,
+# use the hamlib api (rig_passband_*, rig_has_get_level, ...) instead
 class RigCaps(Structure):
     _fields_ = [
         # Basic model information
@@ -736,144 +621,44 @@ class RigCaps(Structure):
 
 
 
-# Python wrapper class to facilitate usage
-class HamlibRigCaps:
+def poll_plan(caps):
     """
-    Python wrapper for hamlib's rig_caps structure
+    poll steps supported by a model, in poll order
     """
+    return tuple(step for step in POLL_STEPS if caps.get(step, True))
+
 
-    def __init__(self, rig_caps_ptr=None):
-        """
-        Initialize the wrapper
-
-        Args:
-            rig_caps_ptr: Pointer to the C rig_caps structure, or None to create empty
-        """
-        if rig_caps_ptr:
-            self.caps = rig_caps_ptr.contents
-        else:
-            self.caps = RigCaps()
-
-    def get_frequency_ranges(self, list_num=1, tx=False):
-        """
-        Get frequency ranges
-
-        Args:
-            list_num: List number (1-5)
-            tx: True for TX, False for RX
-
-        Returns:
-            List of tuples (start_freq, end_freq, modes, low_power, high_power)
-        """
-        if list_num < 1 or list_num > 5:
-            raise ValueError("list_num must be between 1 and 5")
-
-        attr_name = f"{'tx' if tx else 'rx'}_range_list{list_num}"
-        range_list = getattr(self.caps, attr_name)
-
-        ranges = []
-        for i in range(HAMLIB_FRQRANGESIZ):
-            freq_range = range_list[i]
-            if freq_range.startf == 0 and freq_range.endf == 0:
-                break
-            ranges.append({
-                'start_freq': freq_range.startf,
-                'end_freq': freq_range.endf,
-                'modes': freq_range.modes,
-                'low_power': freq_range.low_power,
-                'high_power': freq_range.high_power,
-                'vfo': freq_range.vfo,
-                'antenna': freq_range.ant,
-                'label': freq_range.label.decode('utf-8') if freq_range.label else None
-            })
-
-        return ranges
-
-    def get_tuning_steps(self):
-        """
-        Get supported tuning steps
-
-        Returns:
-            List of tuples (modes, step)
-        """
-        steps = []
-        for i in range(HAMLIB_TSLSTSIZ):
-            step = self.caps.tuning_steps[i]
-            if step.modes == 0 and step.ts == 0:
-                break
-            steps.append({
-                'modes': step.modes,
-                'step': step.ts
-            })
-
-        return steps
-
-    def get_filters(self):
-        """
-        Get supported filters
-
-        Returns:
-            List of tuples (modes, width)
-        """
-        filters = []
-        for i in range(HAMLIB_FLTLSTSIZ):
-            filt = self.caps.filters[i]
-            if filt.modes == 0 and filt.width == 0:
-                break
-            filters.append({
-                'modes': filt.modes,
-                'width': filt.width
-            })
-
-        return filters
-
-    def has_capability(self, cap_type, capability):
-        """
-        Check if a capability is supported
-
-        Args:
-            cap_type: Capability type ('get_func', 'set_func', 'get_level', 'set_level', etc.)
-            capability: Bit mask of capability to check
-
-        Returns:
-            True if supported, False otherwise
-        """
-        caps_field = getattr(self.caps, f"has_{cap_type}", 0)
-        return bool(caps_field & capability)
-
-    def mode_to_string(self, mode_mask):
-        """
-        """
-        modes = []
-        if mode_mask & 0x01: modes.append("LSB")
-        if mode_mask & 0x02: modes.append("USB")
-        if mode_mask & 0x04: modes.append("CW")
-        if mode_mask & 0x08: modes.append("FM")
-        if mode_mask & 0x10: modes.append("AM")
-        if mode_mask & 0x20: modes.append("DIG")
-        return "|".join(modes) if modes else "NONE"
-
-
-    def enumerate_filters(self, rig_caps):
-        """
-        """
-        filters = []
-
-        for i in range(HAMLIB_FLTLSTSIZ):
-            filt = rig_caps.filters[i]
-
-            # Stop when we hit an empty entry (modes=0 and width=0)
-            if filt.modes == 0 and filt.width == 0:
-                break
-
-            # Convert modes to human-readable string (simplified example)
-            mode_str = self.mode_to_string(filt.modes) if hasattr(self.mode_to_string, '__call__') else str(filt.modes)
-
-            filters.append({
-                'index': i,
-                'modes': filt.modes,
-                'modes_str': mode_str,
-                'width': filt.width,
-                'width_hz': filt.width  # Assuming width is already in Hz
-            })
+def mode_choices(caps):
+    """
+    mode names a model supports, all of RIG_MODES when unknown
+    """
+    return [mode for mode in RIG_MODES if not caps or mode in caps.get("modes", RIG_MODES)]
+
+
+class CapsCache:
+    """
+    Rig capabilities per model, probed once and kept in the settings table
+    as rig_caps.<model>. An entry is valid for the driver version it was
+    probed with, and records commands found unsupported while polling
+    """
 
+    def __init__(self, db=None):
+        self.db = db
+        self._caps = {}
+
+    def get(self, model_id, version):
+        caps = self._caps.get(model_id)
+        if caps is None and self.db is not None:
+            try:
+                caps = json.loads(self.db.get_setting(f"rig_caps.{model_id}") or "null")
+            except ValueError:
+                caps = None
+        if not caps or caps.get("version") != version:
+            return None
+        self._caps[model_id] = caps
+        return caps
+
+    def put(self, caps):
+        self._caps[caps["model"]] = caps
+        if self.db is not None:
+            self.db.set_setting(f"rig_caps.{caps['model']}", json.dumps(caps))
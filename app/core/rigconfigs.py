@@ -0,0 +1,121 @@
+import threading
+
+from app.core import metrics
+
+""" 
+ShortwaveHunter
+BCL radio software
+Rig configurations store
+
+Copyright (c) 2025 I8ZSE, Giorgio L. Rutigliano
+(www.i8zse.it, www.i8zse.eu, www.giorgiorutigliano.it)
+
+radio communications are handled by https://github.com/Hamlib/Hamlib (LGPL)
+
+This is free software released under LGPL License
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+
+# config dict keys, as built by ConfigWindow and used by openconf
+CONFIG_KEYS = ("shortname", "mfg", "radio", "id", "port", "baudrate", "databits", "stopbits", "parity")
+# rig_configs column of each key
+CONFIG_COLUMNS = tuple("model_id" if key == "id" else key for key in CONFIG_KEYS)
+
+
+class RigConfigs:
+    """
+    Rig configurations, one rig_configs row each. All rows are read once
+    and kept as dicts, saving or deleting a config writes only its row
+    """
+
+    sql_select = f"SELECT {', '.join(CONFIG_COLUMNS)} FROM rig_configs"
+    sql_save = (f"INSERT OR REPLACE INTO rig_configs ({', '.join(CONFIG_COLUMNS)}) "
+                f"VALUES ({', '.join('?' for _ in CONFIG_COLUMNS)})")
+    sql_add = sql_save.replace("OR REPLACE", "OR IGNORE")
+    sql_delete = "DELETE FROM rig_configs WHERE shortname = ?"
+
+    def __init__(self, db):
+        self.db = db
+        self.lock = threading.Lock()
+        self._cache = None
+
+    def _configs(self):
+        with self.lock:
+            if self._cache is None:
+                rows = self.db.reader().execute(self.sql_select).fetchall()
+                self._cache = {row[0]: dict(zip(CONFIG_KEYS, row)) for row in rows}
+            return self._cache
+
+    def names(self):
+        """
+        return config names, sorted
+        """
+        return sorted(self._configs())
+
+    def get(self, shortname):
+        """
+        return a copy of a config, None if unknown
+        """
+        conf = self._configs().get(shortname)
+        return None if conf is None else dict(conf)
+
+    def __contains__(self, shortname):
+        return shortname in self._configs()
+
+    def __len__(self):
+        return len(self._configs())
+
+    def save(self, conf):
+        """
+        Insert or replace a config, conf is a dict with CONFIG_KEYS
+        """
+        if not conf.get("shortname"):
+            raise ValueError("shortname is required")
+        row = tuple(conf.get(key) for key in CONFIG_KEYS)
+        with self.db.write_lock, metrics.span("rigs.save"):
+            self.db.conn.execute(self.sql_save, row)
+            self.db.conn.commit()
+        with self.lock:
+            if self._cache is not None:
+                self._cache[row[0]] = dict(zip(CONFIG_KEYS, row))
+
+    def delete(self, shortname):
+        with self.db.write_lock:
+            self.db.conn.execute(self.sql_delete, (shortname,))
+            self.db.conn.commit()
+        with self.lock:
+            if self._cache is not None:
+                self._cache.pop(shortname, None)
+
+    def import_configs(self, configs):
+        """
+        Add configs from a {shortname: conf} dict in one transaction,
+        existing names are kept. return the number of configs added
+        """
+        rows = [tuple(conf.get(key) for key in CONFIG_KEYS)
+                for conf in configs.values() if conf.get("shortname") and conf.get("id") is not None]
+        with self.db.write_lock:
+            before = self.db.conn.total_changes
+            self.db.conn.executemany(self.sql_add, rows)
+            self.db.conn.commit()
+            added = self.db.conn.total_changes - before
+        with self.lock:
+            self._cache = None
+        return added
@@ -0,0 +1,236 @@
+import math
+import threading
+from bisect import insort
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from app.core import metrics
+from app.core.hamlib import HamlibError, RIG_VFO_A
+
+""" 
+ShortwaveHunter
+BCL radio software
+Schedule driven band scanner
+
+Copyright (c) 2025 I8ZSE, Giorgio L. Rutigliano
+(www.i8zse.it, www.i8zse.eu, www.giorgiorutigliano.it)
+
+radio communications are handled by https://github.com/Hamlib/Hamlib (LGPL)
+
+This is free software released under LGPL License
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+
+DWELL = 3.0         # seconds listening on each frequency
+SAMPLES = 3         # S-meter readings per stop
+
+STEP = 5.0          # kHz between swept channels, the broadcast raster
+SETTLE = 0.15       # seconds before reading the S-meter of a swept channel
+MARGIN = 10         # dB over the noise floor for an active channel
+PREFETCH = 4        # channels looked up ahead of the rig
+FLOOR_READINGS = 8  # readings needed before the noise floor is trusted
+
+
+def s_units(db):
+    """
+    S-meter reading, dB over S9 as returned by hamlib, as S units (S7, S9+10)
+    """
+    if db is None:
+        return ""
+    if db > 0:
+        return f"S9+{db:.0f}"
+    return f"S{max(0, round(9 + db / 6))}"
+
+
+class BandScanner:
+    """
+    Steps the rig through the frequencies that should be on air now,
+    taken from the schedule, and records the S-meter at each stop.
+    Runs on the calling thread, stop() may be called from any thread
+    """
+
+    def __init__(self, db, rig, dwell=DWELL, samples=SAMPLES, vfo=RIG_VFO_A):
+        self.db = db
+        self.rig = rig
+        self.dwell = dwell
+        self.samples = max(1, samples)
+        self.vfo = vfo
+        self._stop = threading.Event()
+
+    def scan_list(self, bands=None):
+        """
+        Frequencies to visit, one entry per frequency with its broadcasts
+        """
+        plan = []
+        for row in self.db.on_air(bands):
+            if plan and plan[-1]['frequency_khz'] == row['frequency_khz']:
+                plan[-1]['broadcasts'].append(row)
+            else:
+                plan.append({'frequency_khz': row['frequency_khz'], 'band_name': row['band_name'],
+                             'broadcasts': [row]})
+        return plan
+
+    def estimate(self, plan):
+        """
+        seconds needed for a pass, CAT time excluded
+        """
+        return len(plan) * self.dwell
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def stopped(self):
+        return self._stop.is_set()
+
+    def scan(self, plan):
+        """
+        Visit plan entries in order, yields each entry with smeter (max),
+        smeter_avg and scanned_at (utc) added. HamlibError on rig errors
+        """
+        self._stop.clear()
+        for entry in plan:
+            if self._stop.is_set():
+                return
+            with metrics.span("scan.stop"):
+                result = self._visit(entry)
+            if result is None:
+                return
+            yield result
+
+    def _visit(self, entry):
+        """
+        tune, then read the S-meter at regular times during the dwell,
+        None if stopped meanwhile
+        """
+        s, e = self.rig.set_frequency(entry['frequency_khz'] * 1000, self.vfo)
+        if s:
+            raise HamlibError(s, f"{e} setting frequency")
+        readings = []
+        interval = self.dwell / self.samples
+        for _ in range(self.samples):
+            # the first reading comes after the receiver AGC has settled
+            if self._stop.wait(interval):
+                return None
+            smeter, s, e = self.rig.get_smeter(self.vfo)
+            if e:
+                raise HamlibError(s, f"{e} reading S-meter")
+            readings.append(smeter)
+        result = dict(entry)
+        result['smeter'] = max(readings)
+        result['smeter_avg'] = sum(readings) / len(readings)
+        result['scanned_at'] = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        return result
+
+
+class ChannelSweep(BandScanner):
+    """
+    Tunes a band channel by channel and flags channels above the noise
+    floor, annotated with the schedule candidates. Lookups of the next
+    channels run on a background thread while the rig settles, so the
+    sweep speed is bound by CAT traffic only
+    """
+
+    def __init__(self, db, rig, step=STEP, threshold=None, margin=MARGIN, settle=SETTLE,
+                 samples=1, prefetch=PREFETCH, vfo=RIG_VFO_A):
+        super().__init__(db, rig, settle, samples, vfo)
+        self.step = step
+        self.threshold = threshold      # absolute dB over S9, None for adaptive
+        self.margin = margin
+        self.prefetch = prefetch
+
+    def scan_list(self, bands=None, freq_min=None, freq_max=None):
+        """
+        Channels on the step raster, in the given bands or in a frequency
+        range (kHz). Bands are [start, end) as in get_band, the range
+        includes freq_max. ValueError without bands or a valid range
+        """
+        if bands:
+            # band end belongs to the next band
+            ranges = [tuple(limits) + (False,) for limits in map(self.db.get_band_limits, bands) if limits]
+        elif freq_min is None or freq_max is None:
+            raise ValueError("bands or freq_min and freq_max are required")
+        elif freq_min > freq_max:
+            raise ValueError(f"invalid range {freq_min} - {freq_max} kHz")
+        else:
+            ranges = [(freq_min, freq_max, True)]
+        plan = []
+        for start, end, closed in ranges:
+            freq = math.ceil(start / self.step) * self.step
+            while freq < end or (closed and freq == end):
+                plan.append({'frequency_khz': freq, 'band_name': self.db.get_band(freq),
+                             'broadcasts': []})
+                freq += self.step
+        return plan
+
+    def floor(self, readings):
+        """
+        noise floor, lower quartile of the sorted readings
+        """
+        return readings[len(readings) // 4] if readings else None
+
+    def is_active(self, smeter, readings):
+        if self.threshold is not None:
+            return smeter >= self.threshold
+        return len(readings) >= FLOOR_READINGS and smeter >= self.floor(readings) + self.margin
+
+    def scan(self, plan):
+        """
+        Sweep plan entries in order, yields each entry with smeter, floor,
+        active and the broadcasts scheduled on the channel
+        """
+        self._stop.clear()
+        readings = []
+        pending = {}
+        pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sweep")
+        try:
+            for idx, entry in enumerate(plan):
+                # keep the lookups of the next channels queued
+                for ahead in plan[idx:idx + self.prefetch + 1]:
+                    freq = ahead['frequency_khz']
+                    if freq not in pending:
+                        pending[freq] = pool.submit(self._candidates, freq)
+                if self._stop.is_set():
+                    return
+                with metrics.span("sweep.channel"):
+                    result = self._visit(entry)
+                if result is None:
+                    return
+                with metrics.span("sweep.prefetch.wait"):
+                    result['broadcasts'] = pending.pop(entry['frequency_khz']).result()
+                insort(readings, result['smeter'])
+                result['floor'] = self.floor(readings)
+                result['active'] = self.is_active(result['smeter'], readings)
+                yield result
+        finally:
+            for future in pending.values():
+                future.cancel()
+            # the pool thread gives back its reader connection
+            pool.submit(self.db.release_reader)
+            pool.shutdown(wait=True)
+
+    def _candidates(self, freq):
+        """
+        broadcasts on air now on the channel
+        """
+        rows, sts, emsg = self.db.lookup(freq)
+        if sts:
+            raise RuntimeError(emsg)
+        return [row for row in rows if abs(row['frequency_khz'] - freq) <= self.step / 2]
@@ -0,0 +1,249 @@
+import heapq
+import itertools
+import json
+from datetime import datetime, timedelta, timezone
+
+from app.core import metrics
+from app.core.db import on_day
+from app.core.hamlib import RIG_VFO_A
+
+""" 
+ShortwaveHunter
+BCL radio software
+Tune scheduler for upcoming broadcasts
+
+Copyright (c) 2025 I8ZSE, Giorgio L. Rutigliano
+(www.i8zse.it, www.i8zse.eu, www.giorgiorutigliano.it)
+
+radio communications are handled by https://github.com/Hamlib/Hamlib (LGPL)
+
+This is free software released under LGPL License
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+
+SETTING_KEY = "tune_schedule"
+LOG_INTERVAL = 300      # seconds between S-meter log entries of a logged target
+LOG_SETTLE = 10         # seconds after tuning before the first log entry
+RETRY_DELAY = 30        # seconds between attempts of a tuning the owner deferred
+TARGET_KEYS = ("frequency_khz", "start_time", "end_time", "days_operation", "station_name",
+               "country_name", "language_name", "mode", "log")
+TUNE = "tune"
+LOG = "log"
+RETRY = "retry"         # deferred tuning, surfaces as TUNE
+
+
+def utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class TuneScheduler:
+    """
+    Heap of upcoming events for selected broadcasts: a tune event at each
+    start, and S-meter log events during the broadcast when the target asks
+    for logging. Adding, removing and finding the next event are O(log n),
+    the owner needs a single timer set to seconds_to_next().
+    Times are utc, as EiBi schedules. Not thread safe, call from one thread
+    """
+
+    def __init__(self, db, log_interval=LOG_INTERVAL):
+        self.db = db
+        self.log_interval = log_interval
+        self.heap = []          # (when, seq, target id, kind)
+        self.targets = {}       # target id -> target
+        self._ids = itertools.count(1)
+        self._seq = itertools.count()
+
+    def add(self, row, mode="AM", log=False, now=None):
+        """
+        Schedule a broadcast (search or lookup row), return target id,
+        None if it has no start time
+        """
+        target = {key: row.get(key) for key in TARGET_KEYS}
+        # search rows name them country and language
+        target['country_name'] = row.get('country_name') or row.get('country')
+        target['language_name'] = row.get('language_name') or row.get('language')
+        target['mode'] = row.get('mode') or mode
+        target['log'] = bool(row.get('log', log))
+        when = self.next_start(target, now or utcnow())
+        if when is None:
+            return None
+        tid = next(self._ids)
+        self.targets[tid] = target
+        self._push(when, tid, TUNE)
+        return tid
+
+    def remove(self, tid):
+        """
+        Drop a target, its heap entries are discarded when they surface
+        """
+        self.targets.pop(tid, None)
+        if len(self.heap) > 2 * len(self.targets) + 16:
+            self.heap = [item for item in self.heap if item[2] in self.targets]
+            heapq.heapify(self.heap)
+
+    def clear(self):
+        self.heap = []
+        self.targets = {}
+
+    def _push(self, when, tid, kind):
+        heapq.heappush(self.heap, (when, next(self._seq), tid, kind))
+
+    def _discard_stale(self):
+        while self.heap and self.heap[0][2] not in self.targets:
+            heapq.heappop(self.heap)
+
+    def next_event(self):
+        """
+        (when, target id, kind) of the first event, None if empty
+        """
+        self._discard_stale()
+        if not self.heap:
+            return None
+        when, seq, tid, kind = self.heap[0]
+        return when, tid, kind
+
+    def seconds_to_next(self, now=None):
+        """
+        seconds until the next event, 0 if due, None if empty
+        """
+        event = self.next_event()
+        if event is None:
+            return None
+        return max(0.0, (event[0] - (now or utcnow())).total_seconds())
+
+    def pop_due(self, now=None):
+        """
+        Remove and return the (kind, target id, target) events due by now,
+        scheduling the next occurrence of each
+        """
+        now = now or utcnow()
+        due = []
+        with metrics.span("scheduler.pop"):
+            while True:
+                self._discard_stale()
+                if not self.heap or self.heap[0][0] > now:
+                    break
+                when, seq, tid, kind = heapq.heappop(self.heap)
+                target = self.targets[tid]
+                if kind == TUNE:
+                    # next occurrence
+                    nxt = self.next_start(target, max(now, when) + timedelta(minutes=1))
+                    if nxt is not None:
+                        self._push(nxt, tid, TUNE)
+                    target['end'] = when + self.duration(target)
+                    if now >= target['end']:
+                        # woken too late, broadcast already over
+                        continue
+                    if target['log']:
+                        self._push(now + timedelta(seconds=LOG_SETTLE), tid, LOG)
+                    due.append((kind, tid, target))
+                elif kind == RETRY:
+                    if now < target.get('end', now):
+                        due.append((TUNE, tid, target))
+                elif kind == LOG:
+                    due.append((kind, tid, target))
+                    nxt = now + timedelta(seconds=self.log_interval)
+                    if nxt < target.get('end', now):
+                        self._push(nxt, tid, LOG)
+        return due
+
+    def defer(self, kind, tid, now=None):
+        """
+        Put back a due event the owner could not run (rig closed or busy):
+        a tuning is retried every RETRY_DELAY seconds while the broadcast
+        is on, a log sample is not, the next one is already queued.
+        return True when the event was put back
+        """
+        now = now or utcnow()
+        target = self.targets.get(tid)
+        when = now + timedelta(seconds=RETRY_DELAY)
+        if kind != TUNE or target is None or when >= target.get('end', now):
+            return False
+        self._push(when, tid, RETRY)
+        return True
+
+    def upcoming(self):
+        """
+        (when, target id, target) of the next start of every target, by time
+        """
+        starts = [(when, tid) for when, seq, tid, kind in self.heap
+                  if kind == TUNE and tid in self.targets]
+        return [(when, tid, self.targets[tid]) for when, tid in sorted(starts)]
+
+    def next_start(self, target, now):
+        """
+        First start at or after now on an operating day, None if the
+        target has no valid start time
+        """
+        start = target.get('start_time') or ""
+        if len(start) != 4 or not start.isdigit():
+            return None
+        when = now.replace(hour=int(start[:2]) % 24, minute=int(start[2:]) % 60,
+                           second=0, microsecond=0)
+        if when < now.replace(second=0, microsecond=0):
+            when += timedelta(days=1)
+        for _ in range(8):
+            if on_day(target.get('days_operation'), when.weekday()):
+                return when
+            when += timedelta(days=1)
+        return None
+
+    def duration(self, target):
+        """
+        broadcast length, a full day when end time is missing or equal to start
+        """
+        start, end = target.get('start_time') or "", target.get('end_time') or ""
+        try:
+            minutes = (int(end[:2]) * 60 + int(end[2:]) - int(start[:2]) * 60 - int(start[2:])) % 1440
+        except ValueError:
+            minutes = 0
+        return timedelta(minutes=minutes or 1440)
+
+    def save(self):
+        """
+        store targets in the settings table
+        """
+        rows = [{key: target.get(key) for key in TARGET_KEYS} for target in self.targets.values()]
+        self.db.set_setting(SETTING_KEY, json.dumps(rows))
+
+    def load(self, now=None):
+        """
+        reschedule targets stored by save(), return their number
+        """
+        self.clear()
+        try:
+            rows = json.loads(self.db.get_setting(SETTING_KEY) or "[]")
+        except ValueError:
+            rows = []
+        for row in rows:
+            self.add(row, now=now)
+        return len(self.targets)
+
+
+def tune(rig, target, vfo=RIG_VFO_A):
+    """
+    set rig frequency and mode of a target, return (status, message)
+    """
+    s, e = rig.set_frequency(target['frequency_khz'] * 1000, vfo)
+    if s:
+        return s, e
+    if target.get('mode'):
+        return rig.set_mode(target['mode'], vfo)
+    return 0, ""
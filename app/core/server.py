@@ -0,0 +1,316 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+
+from app.core import metrics
+from app.core.db import day_of_year
+from app.core.stream import StreamHub, MAX_RATE
+
+""" 
+ShortwaveHunter
+BCL radio software
+Local JSON server over the database and rig snapshot
+
+Copyright (c) 2025 I8ZSE, Giorgio L. Rutigliano
+(www.i8zse.it, www.i8zse.eu, www.giorgiorutigliano.it)
+
+radio communications are handled by https://github.com/Hamlib/Hamlib (LGPL)
+
+This is free software released under LGPL License
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+
+DEFAULT_PORT = 8073
+CACHE_SIZE = 512
+DB_WORKERS = 4
+
+STATUS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+          500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+def coordinates(count):
+    """
+    query value converter for comma separated numbers, near=lat,lon,km
+    """
+    def conv(value):
+        values = tuple(float(v) for v in value.split(","))
+        if len(values) != count:
+            raise ValueError(value)
+        return values
+    return conv
+
+
+def ddmm(value):
+    """
+    query value converter for EiBi DDMM dates
+    """
+    if day_of_year(value) is None:
+        raise ValueError(value)
+    return value
+
+
+SEARCH_FILTERS = {"freq_min": float, "freq_max": float, "band": str, "station": str, "text": str,
+                  "country": str, "language": str, "target_area": str, "time": str,
+                  "start_date": ddmm, "end_date": ddmm,
+                  "max_distance": float, "near": coordinates(3), "bbox": coordinates(4),
+                  "order": str, "limit": int}
+
+
+class RigSnapshot:
+    """
+    Last known rig state, written by the poller (RadioWindow or the server
+    poll task) and read by any number of clients
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.state = {"rig": None, "freq": None, "mode": None, "smeter": None, "band": None, "time": None}
+        self.version = 0
+
+    def update(self, **fields):
+        """
+        Store fields, return the ones that changed
+        """
+        with self.lock:
+            changed = {k: v for k, v in fields.items() if self.state.get(k) != v}
+            self.state["time"] = time.time()
+            if changed:
+                self.state.update(changed)
+                self.version += 1
+            return changed
+
+    def get(self):
+        with self.lock:
+            return dict(self.state)
+
+
+class HttpError(Exception):
+    def __init__(self, status, message=""):
+        self.status = status
+        super().__init__(message or STATUS.get(status, ""))
+
+
+class ApiServer:
+    """
+    Minimal HTTP/1.1 JSON server on asyncio. Database calls run on a small
+    thread pool, each thread with its own pooled read connection; lookups
+    are cached per (frequency, utc minute) so polling clients share one
+    query. With a rig the server polls it itself, otherwise the snapshot
+    is fed by the application. /stream pushes snapshot changes over a
+    websocket
+    """
+
+    def __init__(self, db, host="127.0.0.1", port=DEFAULT_PORT, snapshot=None, rig=None, interval=0.5,
+                 max_rate=MAX_RATE):
+        self.db = db
+        self.host = host
+        self.port = port
+        self.snapshot = snapshot or RigSnapshot()
+        self.rig = rig
+        self.interval = interval
+        self.executor = ThreadPoolExecutor(DB_WORKERS, thread_name_prefix="swhapi")
+        self.rig_executor = ThreadPoolExecutor(1, thread_name_prefix="swhrig")
+        self.cache = OrderedDict()
+        self.routes = {
+            "/lookup": self.api_lookup,
+            "/search": self.api_search,
+            "/band": self.api_band,
+            "/rig": self.api_rig,
+            "/stats": self.api_stats,
+        }
+        self.hub = StreamHub(self, max_rate)
+        self.server = None
+        self.loop = None
+
+    # ------------------------------------------------------------ endpoints
+
+    async def api_lookup(self, query):
+        freq = round(self._float(query, "freq"), 1)
+        rows, sts, emsg = await self.cached_lookup(freq)
+        if sts:
+            raise HttpError(500, emsg)
+        return {"freq": freq, "rows": rows}
+
+    async def cached_lookup(self, freq):
+        """
+        db.lookup shared by all callers in the same utc minute
+        """
+        key = (freq, int(time.time() // 60))
+        future = self.cache.get(key)
+        if future is None:
+            metrics.count("api.lookup.miss")
+            future = self.loop.run_in_executor(self.executor, self.db.lookup, freq)
+            self.cache[key] = future
+            while len(self.cache) > CACHE_SIZE:
+                self.cache.popitem(last=False)
+        else:
+            metrics.count("api.lookup.hit")
+            self.cache.move_to_end(key)
+        try:
+            rows, sts, emsg = await asyncio.shield(future)
+        except Exception:
+            self.cache.pop(key, None)
+            raise
+        if sts:
+            self.cache.pop(key, None)
+        return rows, sts, emsg
+
+    async def api_search(self, query):
+        filters = {}
+        for name, conv in SEARCH_FILTERS.items():
+            if name in query:
+                try:
+                    filters[name] = conv(query[name])
+                except ValueError:
+                    raise HttpError(400, f"invalid {name}")
+        filters.setdefault("limit", 1000)
+        rows = await self.loop.run_in_executor(self.executor, self.db.search_skeds, filters)
+        return {"filters": filters, "rows": rows}
+
+    async def api_band(self, query):
+        freq = self._float(query, "freq")
+        return {"freq": freq, "band": self.db.get_band(freq)}
+
+    async def api_rig(self, query):
+        return self.snapshot.get()
+
+    async def api_stats(self, query):
+        stats = await self.loop.run_in_executor(self.executor, self.db.get_statistics)
+        # distributions are lists of sqlite3.Row
+        return {k: [dict(row) for row in v] if isinstance(v, list) else v for k, v in stats.items()}
+
+    def _float(self, query, name):
+        try:
+            return float(query[name])
+        except KeyError:
+            raise HttpError(400, f"missing {name}")
+        except ValueError:
+            raise HttpError(400, f"invalid {name}")
+
+    # ------------------------------------------------------------ http
+
+    async def dispatch(self, method, target):
+        url = urlsplit(target)
+        handler = self.routes.get(url.path.rstrip("/") or "/")
+        if handler is None:
+            raise HttpError(404)
+        if method != "GET":
+            raise HttpError(405)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        return await handler(query)
+
+    async def handle(self, reader, writer):
+        """
+        Serve requests on one connection, keep-alive as HTTP/1.1 says
+        """
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    method, target, version = line.decode("latin-1").split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    hline = await reader.readline()
+                    if hline in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = hline.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                if urlsplit(target).path.rstrip("/") == "/stream":
+                    # websocket, the connection belongs to the stream from now on
+                    await self.hub.serve(reader, writer, headers, version)
+                    break
+
+                with metrics.span("api.request"):
+                    try:
+                        status, body = 200, await self.dispatch(method, target)
+                    except HttpError as e:
+                        status, body = e.status, {"error": str(e)}
+                    except Exception as e:
+                        logging.error(f"api error {target}: {e}")
+                        status, body = 500, {"error": str(e)}
+
+                # request bodies are not read: close rather than take one for the next request
+                has_body = headers.get("content-length", "0") != "0" or "transfer-encoding" in headers
+                keep = (version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                        and not has_body)
+                data = json.dumps(body, default=str).encode()
+                writer.write(
+                    f"{version} {status} {STATUS.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Access-Control-Allow-Origin: *\r\n"
+                    f"Connection: {'keep-alive' if keep else 'close'}\r\n\r\n".encode("latin-1") + data)
+                await writer.drain()
+                if not keep:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    # ------------------------------------------------------------ rig
+
+    async def poll_rig(self):
+        """
+        Keep the snapshot up to date, serial i/o on its own thread
+        """
+        while True:
+            sts, mode, freq, smeter, err = await self.loop.run_in_executor(self.rig_executor, self.rig.poll)
+            if sts:
+                metrics.count("api.rig.errors")
+            else:
+                self.snapshot.update(freq=freq, mode=mode, smeter=smeter, band=self.db.get_band(freq / 1000))
+            await asyncio.sleep(self.interval)
+
+    # ------------------------------------------------------------ run
+
+    async def serve(self):
+        self.loop = asyncio.get_running_loop()
+        self.server = await asyncio.start_server(self.handle, self.host, self.port)
+        logging.info(f"api server on {self.host}:{self.port}")
+        tasks = [self.server.serve_forever(), self.hub.run()]
+        if self.rig is not None:
+            tasks.append(self.poll_rig())
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            self.executor.shutdown(wait=False)
+            self.rig_executor.shutdown(wait=False)
+
+    def run(self):
+        asyncio.run(self.serve())
+
+    def start(self):
+        """
+        Run the server on a daemon thread, for the GUI
+        """
+        thread = threading.Thread(target=self.run, name="swhserver", daemon=True)
+        thread.start()
+        return thread
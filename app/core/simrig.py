@@ -0,0 +1,284 @@
+import random
+import threading
+import time
+
+from app.core import metrics, rigcaps
+from app.core.hamlib import HamlibWrapper, RigState, RIG_VFO_A
+from app.core.rigcaps import RigCaps, RIG_MODES, RIG_MODES_INV
+
+""" 
+ShortwaveHunter
+BCL radio software
+Simulated rig, hardware free stand-in for the hamlib wrapper
+
+Copyright (c) 2025 I8ZSE, Giorgio L. Rutigliano
+(www.i8zse.it, www.i8zse.eu, www.giorgiorutigliano.it)
+
+radio communications are handled by https://github.com/Hamlib/Hamlib (LGPL)
+
+This is free software released under LGPL License
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+
+SIM_MODEL = 1   # same id as hamlib dummy rig
+# narrow, normal and wide filter per mode, Hz
+SIM_FILTERS = {
+    "AM": [3000, 6000, 9000],
+    "CW": [250, 500, 1200],
+    "USB": [1800, 2400, 3000],
+    "LSB": [1800, 2400, 3000],
+    "RTTY": [250, 500, 1200],
+    "FM": [7000, 12000, 15000],
+}
+SIM_FREQ = 7100000
+
+# request / answer length in bytes of the CAT commands, Kenwood style
+CMD_SIZE = {
+    'getfreq': (3, 14),     # FA;  FA00007100000;
+    'setfreq': (14, 0),
+    'getmode': (3, 4),      # MD;  MD5;
+    'setmode': (4, 0),
+    'getsmeter': (4, 8),    # SM0; SM00015;
+    'setvfo': (4, 0),
+    'open': (3, 6),
+}
+
+
+class SerialLink:
+    """
+    CAT serial line model, one command at a time like a real port.
+    Every command costs its bytes on the wire (10 bit per byte at baud)
+    plus rig turnaround and a random jitter; callers queue on the line lock
+    and the wait is recorded as queue delay
+    """
+
+    def __init__(self, baud=9600, turnaround=0.005, jitter=0.002, error_rate=0.0, seed=None):
+        self.baud = int(baud)
+        self.turnaround = turnaround
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rnd = random.Random(seed)
+        self.lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.commands = 0
+        self.errors = 0
+        self.busy = 0.0
+        self.queue = []
+
+    def duration(self, cmd):
+        req, resp = CMD_SIZE.get(cmd, (4, 4))
+        wire = (req + resp) * 10.0 / self.baud
+        return max(wire + self.turnaround + self.rnd.gauss(0.0, self.jitter), 0.0)
+
+    def transact(self, cmd):
+        """
+        Run a command on the line, return RIG_OK or RIG_ETIMEOUT
+        """
+        queued = time.perf_counter()
+        with self.lock:
+            start = time.perf_counter()
+            self.queue.append(start - queued)
+            if self.error_rate and self.rnd.random() < self.error_rate:
+                # no answer, the rig times out
+                time.sleep(self.duration(cmd) * 4)
+                self.errors += 1
+                result = RigState.RIG_ETIMEOUT
+            else:
+                time.sleep(self.duration(cmd))
+                result = RigState.RIG_OK
+            self.commands += 1
+            self.busy += time.perf_counter() - start
+        return result
+
+
+class SimulatedRig(HamlibWrapper):
+    """
+    Pure python rig with the HamlibWrapper interface. poll and testcon are
+    the wrapper ones, so the application code path is the real one; only
+    the rig i/o is simulated on a SerialLink at the configured baud rate
+    """
+
+    def __init__(self, rootapp=None, baud=None, db=None, **link):
+        self.rootapp = rootapp
+        self.hllink = False
+        self.lib = None
+        self.rig = None
+        self.rigid = None
+        self.opnd = False
+        self._rig_list = {}
+        self.caps = None
+        self.plan = rigcaps.POLL_STEPS
+        self.capcache = rigcaps.CapsCache(db if db is not None else getattr(rootapp, 'db', None))
+        self.baud = baud
+        self.link = SerialLink(baud or 9600, **link)
+        self.freq = SIM_FREQ
+        self.mode = RIG_MODES["AM"]
+        self.width = 6000
+        self.signal = -20.0
+        self._link(True)
+
+    def _io(self, cmd):
+        return self._get_error(self.link.transact(cmd), cmd, "")
+
+    def _get_error(self, result, func, parms):
+        if result == RigState.RIG_OK:
+            return 0, ''
+        metrics.count("rig.errors")
+        metrics.count(f"rig.errors.{func}")
+        return result, f"simulated {RigState(result).name} in {func}"
+
+    def load_all_backends(self) -> int:
+        return 1
+
+    def get_radio_list(self):
+        radio = [{
+            'id': SIM_MODEL,
+            'model': 'Simulated rig',
+            'manufacturer': 'Simulator',
+            'version': '1.0',
+            'status': self.status_map[2],
+            'status_code': 2,
+            'type_code': 0x0002,
+        }]
+        return ['Simulator'], radio
+
+    def get_rig_caps(self, id):
+        caps = RigCaps()
+        caps.rig_model = SIM_MODEL
+        caps.model_name = b"Simulated rig"
+        caps.mfg_name = b"Simulator"
+        caps.version = b"1.0"
+        caps.status = 2
+        caps.rig_type = 0x0002
+        caps.serial_rate_min = 4800
+        caps.serial_rate_max = 38400
+        caps.serial_data_bits = 8
+        caps.serial_stop_bits = 1
+        caps.serial_parity = 0
+        return caps
+
+    def caps_version(self):
+        return "1.0"
+
+    def probe_caps(self, version):
+        return {
+            'model': self.rigid,
+            'version': version,
+            rigcaps.POLL_MODE: True,
+            rigcaps.POLL_SMETER: True,
+            'modes': list(SIM_FILTERS),
+            'filters': SIM_FILTERS,
+        }
+
+    def init_rig(self, model_id):
+        self.rig = True
+        self.rigid = model_id
+        return 1
+
+    def set_conf(self, param, value):
+        if param == "serial_speed" and self.baud is None:
+            # config baud rate, unless forced on the command line
+            self.link.baud = int(value)
+        return 0, ''
+
+    def open(self):
+        if not self.rig:
+            return -1, "Select Rig first"
+        s, e = self._io('open')
+        if s == 0:
+            self.opnd = True
+        return s, e
+
+    def get_conf(self, key):
+        if key == "serial_speed":
+            return str(self.link.baud)
+        return None
+
+    def set_vfo(self, vfo=RIG_VFO_A):
+        if not self.opnd:
+            return -2, "Open Rig first"
+        return self._io('setvfo')
+
+    def get_frequency(self, vfo=RIG_VFO_A):
+        if not self.opnd:
+            return -2, "Open Rig first", ""
+        s, m = self._io('getfreq')
+        return self.freq, s, m
+
+    def set_frequency(self, frequency, vfo=RIG_VFO_A):
+        if not self.opnd:
+            return -2, "Open Rig first"
+        s, m = self._io('setfreq')
+        if s == 0:
+            self.freq = int(frequency)
+        return s, m
+
+    def get_mode(self, vfo=RIG_VFO_A):
+        if not self.opnd:
+            return -2, "Open Rig first", "", "", ""
+        s, e = self._io('getmode')
+        return RIG_MODES_INV.get(self.mode, "???"), self.mode, self.width, s, e
+
+    def set_mode(self, mstr, vfo=RIG_VFO_A):
+        if not self.opnd:
+            return -2, "Open Rig first"
+        if mstr not in RIG_MODES:
+            return -1, "Invalid mode"
+        if mstr not in self.modes():
+            return RigState.RIG_ENAVAIL, "Mode not supported"
+        s, e = self._io('setmode')
+        if s == 0:
+            self.mode = RIG_MODES[mstr]
+        return s, e
+
+    def get_smeter(self, vfo=RIG_VFO_A):
+        if not self.opnd:
+            return -2, "Open Rig first", ""
+        s, e = self._io('getsmeter')
+        # slow fading around the current level, dB over S9
+        self.signal = min(max(self.signal + self.link.rnd.gauss(0.0, 3.0), -54.0), 40.0)
+        return int(self.signal), s, e
+
+    def openconf(self, conf, cacheto, vfo=RIG_VFO_A):
+        self.init_rig(conf['id'])
+        self.load_caps()
+        self.set_conf("serial_speed", conf['baudrate'])
+        s, e = self.open()
+        if s != 0:
+            self.close()
+            return -1.1
+        s, e = self.set_vfo(vfo)
+        if s != 0:
+            self.close()
+            return -1.2
+        return 0
+
+    def cleanup(self):
+        return self.close()
+
+    def close(self):
+        if not self.opnd:
+            return -2, "Open Rig first"
+        self.rig = None
+        self.opnd = False
+        self.rigid = None
+        return 0, ''
@@ -0,0 +1,223 @@
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import struct
+import time
+
+from app.core import metrics
+
+""" 
+ShortwaveHunter
+BCL radio software
+WebSocket push stream of rig state and on air broadcasts
+
+Copyright (c) 2025 I8ZSE, Giorgio L. Rutigliano
+(www.i8zse.it, www.i8zse.eu, www.giorgiorutigliano.it)
+
+radio communications are handled by https://github.com/Hamlib/Hamlib (LGPL)
+
+This is free software released under LGPL License
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+OP_TEXT = 0x1
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+MAX_RATE = 5.0      # published updates per second
+
+
+def ws_accept(key):
+    return base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+
+
+def ws_frame(payload, opcode=OP_TEXT):
+    """
+    Server frame, final and unmasked
+    """
+    size = len(payload)
+    if size < 126:
+        head = struct.pack("!BB", 0x80 | opcode, size)
+    elif size < 65536:
+        head = struct.pack("!BBH", 0x80 | opcode, 126, size)
+    else:
+        head = struct.pack("!BBQ", 0x80 | opcode, 127, size)
+    return head + payload
+
+
+async def ws_read(reader):
+    """
+    Read a client frame, return opcode and unmasked payload
+    """
+    b0, b1 = await reader.readexactly(2)
+    size = b1 & 0x7F
+    if size == 126:
+        size = struct.unpack("!H", await reader.readexactly(2))[0]
+    elif size == 127:
+        size = struct.unpack("!Q", await reader.readexactly(8))[0]
+    mask = await reader.readexactly(4) if b1 & 0x80 else b""
+    data = await reader.readexactly(size)
+    if mask:
+        data = bytes(b ^ mask[i % 4] for i, b in enumerate(data))
+    return b0 & 0x0F, data
+
+
+class Subscriber:
+    """
+    Pending changes of one client. Updates are merged until the client
+    is ready, so a slow client gets fewer, larger messages
+    """
+
+    def __init__(self):
+        self.pending = {}
+        self.ready = asyncio.Event()
+
+    def push(self, message):
+        rig = self.pending.get("rig", {})
+        rig.update(message.get("rig", {}))
+        self.pending.update(message)
+        if rig:
+            self.pending["rig"] = rig
+        self.ready.set()
+
+    def take(self):
+        message, self.pending = self.pending, {}
+        self.ready.clear()
+        return message
+
+
+class StreamHub:
+    """
+    One publisher for all subscribers: at most max_rate times a second
+    it checks the rig snapshot, and when it changed sends the changed
+    fields, plus the on air lookup when frequency or minute changed.
+    Clients never touch the rig or the database
+    """
+
+    def __init__(self, server, max_rate=MAX_RATE):
+        self.server = server
+        self.period = 1.0 / max_rate
+        self.subscribers = set()
+        self.state = {}
+        self.onair = []
+        self.onair_key = None
+        self.version = -1
+
+    async def refresh(self):
+        """
+        Pick up snapshot changes, return the delta message or None
+        """
+        snapshot = self.server.snapshot
+        if snapshot.version == self.version and self.onair_key == self._key(self.state):
+            return None
+        self.version = snapshot.version
+        state = snapshot.get()
+        state.pop("time", None)
+        delta = {k: v for k, v in state.items() if self.state.get(k) != v}
+        self.state = state
+        message = {}
+        if delta:
+            message["rig"] = delta
+        key = self._key(state)
+        if key != self.onair_key:
+            self.onair_key = key
+            rows = (await self.server.cached_lookup(key[0]))[0] if key[0] is not None else []
+            if rows != self.onair:
+                self.onair = rows
+                message["onair"] = rows
+        return message or None
+
+    def _key(self, state):
+        freq = state.get("freq")
+        return (round(freq / 1000, 1) if freq else None, int(time.time() // 60))
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.period)
+            if not self.subscribers:
+                continue
+            try:
+                message = await self.refresh()
+            except Exception as e:
+                logging.error(f"stream refresh error: {e}")
+                continue
+            self.publish(message)
+
+    def publish(self, message):
+        if message:
+            metrics.count("stream.updates")
+            for sub in self.subscribers:
+                sub.push(message)
+
+    async def serve(self, reader, writer, headers, version):
+        """
+        Upgrade the connection and stream until the client goes away
+        """
+        key = headers.get("sec-websocket-key")
+        if "websocket" not in headers.get("upgrade", "").lower() or not key:
+            writer.write(f"{version} 400 Bad Request\r\nContent-Length: 0\r\nConnection: close\r\n\r\n".encode())
+            await writer.drain()
+            return
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\n"
+                      "Upgrade: websocket\r\n"
+                      "Connection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {ws_accept(key)}\r\n\r\n").encode())
+        # bring everybody up to date, then start the new client from a full state
+        self.publish(await self.refresh())
+        sub = Subscriber()
+        sub.push({"rig": dict(self.state), "onair": self.onair})
+        self.subscribers.add(sub)
+        metrics.count("stream.subscribers")
+        receiver = asyncio.ensure_future(self._receive(reader, writer))
+        try:
+            while not receiver.done():
+                waiter = asyncio.ensure_future(sub.ready.wait())
+                await asyncio.wait({waiter, receiver}, return_when=asyncio.FIRST_COMPLETED)
+                waiter.cancel()
+                if sub.ready.is_set():
+                    message = sub.take()
+                    message["time"] = time.time()
+                    writer.write(ws_frame(json.dumps(message, default=str).encode()))
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.subscribers.discard(sub)
+            receiver.cancel()
+
+    async def _receive(self, reader, writer):
+        """
+        Answer pings, stop on close or disconnection
+        """
+        try:
+            while True:
+                opcode, data = await ws_read(reader)
+                if opcode == OP_CLOSE:
+                    writer.write(ws_frame(data[:2], OP_CLOSE))
+                    await writer.drain()
+                    return
+                if opcode == OP_PING:
+                    writer.write(ws_frame(data, OP_PONG))
+                    await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return
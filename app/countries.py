@@ -83,21 +83,7 @@ class CountryWindow(QWidget):
         Load data into the table
         """
         try:
-            query = "SELECT id, ccode, cname FROM countries"
-            params = ()
-
-            if search_params:
-                field, term = search_params
-                if field:  # Specific field search
-                    query += f" WHERE {field} LIKE ?"
-                    params = (f"%{term}%",)
-                else:  # Search all fields
-                    query += " WHERE ccode LIKE ? OR cname LIKE ?"
-                    params = (f"%{term}%", f"%{term}%")
-
-            query += " ORDER BY ccode"
-
-            records = self.db.conn.execute(query, params).fetchall()
+            records = self.db.countries.list(search_params)
 
             self.ui.table_countries.setRowCount(0)
 
@@ -121,10 +107,7 @@ class CountryWindow(QWidget):
 
         try:
             country_id = selected[0].data(Qt.UserRole)
-            record = self.db.conn.execute(
-                "SELECT ccode, cname FROM countries WHERE id=?",
-                (country_id,)
-            ).fetchone()
+            record = self.db.countries.get(country_id)
 
             if record:
                 self.current_id = country_id
@@ -161,11 +144,7 @@ class CountryWindow(QWidget):
 
         # Check for duplicate code
         if not self.current_id:  # Only check for new records
-            existing = self.db.conn.execute(
-                "SELECT id FROM countries WHERE ccode=?",
-                (ccode,)
-            ).fetchone()
-            if existing:
+            if self.db.countries.exists(ccode):
                 errors.append("A country with this code already exists")
 
         return errors
@@ -187,18 +166,11 @@ class CountryWindow(QWidget):
 
             if self.current_id:
                 # Update existing record
-                self.db.conn.execute(
-                    "UPDATE countries SET ccode=?, cname=? WHERE id=?",
-                    data + (self.current_id,)
-                )
+                self.db.countries.update(self.current_id, data)
             else:
                 # Insert new record
-                self.db.conn.execute(
-                    "INSERT INTO countries (ccode, cname) VALUES (?, ?)",
-                    data
-                )
+                self.db.countries.insert(data)
 
-            self.db.conn.commit()
             self.load_data(self.current_search)
             self.clear_form()
             QMessageBox.information(self, "Success", "Country saved successfully")
@@ -222,10 +194,7 @@ class CountryWindow(QWidget):
         if reply == QMessageBox.Yes:
             try:
                 # Check if country is referenced in broadcasts
-                ref_count = self.db.conn.execute(
-                    "SELECT COUNT(*) FROM broadcasts WHERE country_id=?",
-                    (self.current_id,)
-                ).fetchone()[0]
+                ref_count = self.db.countries.references(self.current_id)
 
                 if ref_count > 0:
                     QMessageBox.warning(
@@ -234,8 +203,7 @@ class CountryWindow(QWidget):
                     )
                     return
 
-                self.db.conn.execute("DELETE FROM countries WHERE id=?", (self.current_id,))
-                self.db.conn.commit()
+                self.db.countries.delete(self.current_id)
                 self.load_data(self.current_search)
                 self.clear_form()
                 QMessageBox.information(self, "Success", "Country deleted successfully")
@@ -0,0 +1,118 @@
+from PyQt5.QtCore import Qt, QTimer, QCoreApplication
+from PyQt5.QtWidgets import (QDialog, QTableWidget, QTableWidgetItem, QPushButton, QVBoxLayout,
+                             QHBoxLayout, QCheckBox, QFileDialog, QHeaderView, QAbstractItemView)
+
+from app.core import metrics
+
+""" 
+ShortwaveHunter
+BCL radio software
+Diagnostics dialog, instrumentation viewer
+
+Copyright (c) 2025 I8ZSE, Giorgio L. Rutigliano
+(www.i8zse.it, www.i8zse.eu, www.giorgiorutigliano.it)
+
+radio communications are handled by https://github.com/Hamlib/Hamlib (LGPL)
+
+This is free software released under LGPL License
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+
+_translate = QCoreApplication.translate
+
+COLUMNS = ("count", "mean", "p50", "p90", "p99", "max")
+
+
+class DiagnosticsWindow(QDialog):
+    """
+    Live view of spans, histograms and counters, refreshed every second
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(_translate("", "Diagnostics"))
+        self.resize(640, 420)
+
+        self.chkEnabled = QCheckBox(_translate("", "Instrumentation enabled"))
+        self.chkEnabled.setChecked(metrics.enabled)
+        self.chkEnabled.toggled.connect(metrics.enable)
+        btnReset = QPushButton(_translate("", "Reset"))
+        btnReset.clicked.connect(self.reset)
+        btnSave = QPushButton(_translate("", "Save..."))
+        btnSave.clicked.connect(self.save)
+        btnClose = QPushButton(_translate("", "Close"))
+        btnClose.clicked.connect(self.close)
+
+        self.tblMetrics = QTableWidget(0, len(COLUMNS) + 1)
+        self.tblMetrics.setHorizontalHeaderLabels([_translate("", "Name")] + list(COLUMNS))
+        self.tblMetrics.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.tblMetrics.verticalHeader().setVisible(False)
+        self.tblMetrics.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+
+        buttons = QHBoxLayout()
+        buttons.addWidget(self.chkEnabled)
+        buttons.addStretch()
+        buttons.addWidget(btnReset)
+        buttons.addWidget(btnSave)
+        buttons.addWidget(btnClose)
+        layout = QVBoxLayout()
+        layout.addWidget(self.tblMetrics)
+        layout.addLayout(buttons)
+        self.setLayout(layout)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(1000)
+        self.refresh()
+
+    def refresh(self):
+        """
+        Load table from a metrics snapshot, times in msec
+        """
+        snap = metrics.snapshot()
+        rows = [(name, hist) for name, hist in snap["histograms"].items()]
+        rows += [(name, {"count": num}) for name, num in snap["counters"].items()]
+        self.tblMetrics.setRowCount(len(rows))
+        for row_idx, (name, values) in enumerate(rows):
+            self.tblMetrics.setItem(row_idx, 0, QTableWidgetItem(name))
+            for col, key in enumerate(COLUMNS, 1):
+                value = values.get(key)
+                text = "" if value is None else (f"{value}" if key == "count" else f"{value:.3f}")
+                item = QTableWidgetItem(text)
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.tblMetrics.setItem(row_idx, col, item)
+
+    def reset(self):
+        metrics.reset()
+        self.refresh()
+
+    def save(self):
+        filename, _ = QFileDialog.getSaveFileName(
+            self,
+            _translate("", "Save diagnostics"),
+            "swhunter-diagnostics.json",
+            _translate("", "JSON file (*.json);;All files (*)")
+        )
+        if filename:
+            metrics.dump(filename)
+
+    def closeEvent(self, event):
+        self.timer.stop()
+        super().closeEvent(event)
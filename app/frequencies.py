@@ -1,5 +1,5 @@
 from PyQt5.QtWidgets import QWidget, QMessageBox, QTableWidgetItem
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, pyqtSignal
 from app.ui.frequencies_ui import Ui_FrequencyBandForm
 
 """ 
@@ -32,6 +32,9 @@ SOFTWARE.
 
 
 class FrequencyWindow(QWidget):
+    # emitted after the band plan has been changed
+    bands_changed = pyqtSignal()
+
     def __init__(self, rootapp, parent=None):
         super().__init__()
         self.db = rootapp.db
@@ -85,29 +88,11 @@ class FrequencyWindow(QWidget):
 
     def load_data(self, search_params=None):
         try:
-            query = "SELECT id, band_name, freq_start, freq_end, description FROM frequency_bands"
-            params = ()
-
-            if search_params:
-                field, term = search_params
-                if field == "band_name":
-                    query += " WHERE band_name LIKE ?"
-                    params = (f"%{term}%",)
-                elif field == "description":
-                    query += " WHERE description LIKE ?"
-                    params = (f"%{term}%",)
-                elif field == "range":
-                    try:
-                        freq = float(term)
-                        query += " WHERE ? BETWEEN freq_start AND freq_end"
-                        params = (freq,)
-                    except ValueError:
-                        self.show_error("Please enter a valid frequency number")
-                        return
-
-            query += " ORDER BY freq_start"
-
-            records = self.db.conn.execute(query, params).fetchall()
+            try:
+                records = self.db.frequency_bands.list(search_params)
+            except ValueError:
+                self.show_error("Please enter a valid frequency number")
+                return
 
             self.ui.table_frequency_bands.setRowCount(0)
 
@@ -131,10 +116,7 @@ class FrequencyWindow(QWidget):
 
         try:
             band_id = selected[0].data(Qt.UserRole)
-            record = self.db.conn.execute(
-                "SELECT band_name, freq_start, freq_end, description FROM frequency_bands WHERE id=?",
-                (band_id,)
-            ).fetchone()
+            record = self.db.frequency_bands.get(band_id)
 
             if record:
                 self.current_id = band_id
@@ -171,11 +153,7 @@ class FrequencyWindow(QWidget):
 
         # Check for duplicate band name
         if not self.current_id:  # Only check for new records
-            existing = self.db.conn.execute(
-                "SELECT id FROM frequency_bands WHERE band_name=?",
-                (band_name,)
-            ).fetchone()
-            if existing:
+            if self.db.frequency_bands.exists(band_name):
                 errors.append("A band with this name already exists")
 
         return errors
@@ -196,22 +174,12 @@ class FrequencyWindow(QWidget):
 
             if self.current_id:
                 # Update existing record
-                self.db.conn.execute(
-                    """UPDATE frequency_bands 
-                    SET band_name=?, freq_start=?, freq_end=?, description=? 
-                    WHERE id=?""",
-                    data + (self.current_id,)
-                )
+                self.db.frequency_bands.update(self.current_id, data)
             else:
                 # Insert new record
-                self.db.conn.execute(
-                    """INSERT INTO frequency_bands 
-                    (band_name, freq_start, freq_end, description) 
-                    VALUES (?, ?, ?, ?)""",
-                    data
-                )
-
-            self.db.conn.commit()
+                self.db.frequency_bands.insert(data)
+
+            self.bands_changed.emit()
             self.load_data(self.current_search)
             self.clear_form()
             QMessageBox.information(self, "Success", "Frequency band saved successfully")
@@ -231,8 +199,8 @@ class FrequencyWindow(QWidget):
 
         if reply == QMessageBox.Yes:
             try:
-                self.db.conn.execute("DELETE FROM frequency_bands WHERE id=?", (self.current_id,))
-                self.db.conn.commit()
+                self.db.frequency_bands.delete(self.current_id)
+                self.bands_changed.emit()
                 self.load_data(self.current_search)
                 self.clear_form()
                 QMessageBox.information(self, "Success", "Frequency band deleted successfully")
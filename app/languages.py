@@ -78,21 +78,7 @@ class LanguageWindow(QWidget):
 
     def load_data(self, search_params=None):
         try:
-            query = "SELECT id, code, lang, area, code2 FROM languages"
-            params = ()
-
-            if search_params:
-                field, term = search_params
-                if field:  # Specific field search
-                    query += f" WHERE {field} LIKE ?"
-                    params = (f"%{term}%",)
-                else:  # Search all fields
-                    query += " WHERE code LIKE ? OR lang LIKE ? OR area LIKE ? OR code2 LIKE ?"
-                    params = (f"%{term}%", f"%{term}%", f"%{term}%", f"%{term}%")
-
-            query += " ORDER BY code"
-
-            records = self.db.conn.execute(query, params).fetchall()
+            records = self.db.languages.list(search_params)
 
             self.ui.table_languages.setRowCount(0)
 
@@ -113,10 +99,7 @@ class LanguageWindow(QWidget):
 
         try:
             language_id = selected[0].data(Qt.UserRole)
-            record = self.db.conn.execute(
-                "SELECT code, lang, area, code2 FROM languages WHERE id=?",
-                (language_id,)
-            ).fetchone()
+            record = self.db.languages.get(language_id)
 
             if record:
                 self.current_id = language_id
@@ -145,11 +128,7 @@ class LanguageWindow(QWidget):
 
         # Check for duplicate code
         if not self.current_id:  # Only check for new records
-            existing = self.db.conn.execute(
-                "SELECT id FROM languages WHERE code=?",
-                (self.ui.txt_code.text().strip(),)
-            ).fetchone()
-            if existing:
+            if self.db.languages.exists(self.ui.txt_code.text().strip()):
                 errors.append("A language with this code already exists")
 
         return errors
@@ -170,18 +149,11 @@ class LanguageWindow(QWidget):
 
             if self.current_id:
                 # Update existing record
-                self.db.conn.execute(
-                    "UPDATE languages SET code=?, lang=?, area=?, code2=? WHERE id=?",
-                    data + (self.current_id,)
-                )
+                self.db.languages.update(self.current_id, data)
             else:
                 # Insert new record
-                self.db.conn.execute(
-                    "INSERT INTO languages (code, lang, area, code2) VALUES (?, ?, ?, ?)",
-                    data
-                )
+                self.db.languages.insert(data)
 
-            self.db.conn.commit()
             self.load_data(self.current_search)
             self.clear_form()
             QMessageBox.information(self, "Success", "Language saved successfully")
@@ -201,8 +173,7 @@ class LanguageWindow(QWidget):
 
         if reply == QMessageBox.Yes:
             try:
-                self.db.conn.execute("DELETE FROM languages WHERE id=?", (self.current_id,))
-                self.db.conn.commit()
+                self.db.languages.delete(self.current_id)
                 self.load_data(self.current_search)
                 self.clear_form()
                 QMessageBox.information(self, "Success", "Language deleted successfully")
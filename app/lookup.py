@@ -7,6 +7,7 @@ from PyQt5.QtWidgets import (QApplication, QDialog, QTableWidget, QTableWidgetIt
 from PyQt5.QtCore import Qt, pyqtSignal, QCoreApplication
 from PyQt5.QtGui import QFont
 from app.ui.lookup_ui import Ui_LookupWindow
+from app.core import metrics
 import os
 
 """ 
@@ -83,10 +84,12 @@ class LookupWindow(QDialog):
             self.ui.infoLabel.setText(text)
 
         self.ui.tblSked.setRowCount(len(rows))
+        # translated once per fill, not per row
+        log_text, all_days = _translate("FrequencyDialog", "Log"), _translate("FrequencyDialog", "All")
         for row_idx, transmission in enumerate(rows):
             # Log button
-            log_button = QPushButton(_translate("FrequencyDialog", "Log"))
-            log_button.clicked.connect(lambda checked, data=transmission: self._on_log_clicked(data))
+            log_button = QPushButton(log_text)
+            log_button.clicked.connect(lambda checked, data=transmission, btn=log_button: self._on_log_clicked(data, btn))
             self.ui.tblSked.setCellWidget(row_idx, 6, log_button)
 
             # Freq
@@ -96,6 +99,11 @@ class LookupWindow(QDialog):
 
             # Station
             station_item = QTableWidgetItem(transmission['station_name'] or "")
+            if transmission.get('distance_km') is not None:
+                # site distance and bearing from qth
+                station_item.setToolTip(f"{transmission['transmitter_site'] or ''} "
+                                        f"{transmission['distance_km']:.0f} km "
+                                        f"{transmission['bearing_deg']:.0f}\u00b0")
             self.ui.tblSked.setItem(row_idx, 1, station_item)
 
             # Country
@@ -120,7 +128,7 @@ class LookupWindow(QDialog):
             self.ui.tblSked.setItem(row_idx, 4, time_item)
 
             # Days
-            days_item = QTableWidgetItem(transmission['days_operation'] or _translate("FrequencyDialog", "All"))
+            days_item = QTableWidgetItem(transmission['days_operation'] or all_days)
             self.ui.tblSked.setItem(row_idx, 5, days_item)
 
 
@@ -128,11 +136,31 @@ class LookupWindow(QDialog):
         results, e, emsg = self.db.lookup(freq)
         if e != 0:
             self.rootapp.show_error("Lookup", emsg)
-        self._load_table(results)
+        with metrics.span("ui.lookup.fill"):
+            self._load_table(results)
 
-    def _on_log_clicked(self, row):
-        """Gestisce il click sul pulsante Log"""
-        a = 0
+    def _on_log_clicked(self, row, button=None):
+        """
+        Log reception of row, written in background by the logbook
+        """
+        entry = {
+            'broadcast_id': row['id'],
+            'frequency_khz': row['frequency_khz'],
+            'station_name': row['station_name'],
+            'country_name': row['country_name'],
+            'language_name': row['language_name'],
+        }
+        radio = self.parent()
+        if radio is not None and getattr(radio, 'freq', 0):
+            # rig active, record what it is receiving
+            entry['mode'] = radio.mode or None
+            entry['smeter'] = radio.dbm
+            entry['rig'] = radio.lbRig.text()
+        self.db.logbook.append(entry)
+        self.log_requested.emit(entry)
+        if button is not None:
+            button.setText(_translate("FrequencyDialog", "Logged"))
+            button.setEnabled(False)
 
 
 
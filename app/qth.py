@@ -0,0 +1,126 @@
+from PyQt5.QtCore import QCoreApplication
+from PyQt5.QtWidgets import (QDialog, QDoubleSpinBox, QLineEdit, QPushButton, QFormLayout,
+                             QHBoxLayout, QVBoxLayout, QLabel)
+
+from app.core.geo import locator_to_latlon
+
+""" 
+ShortwaveHunter
+BCL radio software
+Listening location dialog
+
+Copyright (c) 2025 I8ZSE, Giorgio L. Rutigliano
+(www.i8zse.it, www.i8zse.eu, www.giorgiorutigliano.it)
+
+radio communications are handled by https://github.com/Hamlib/Hamlib (LGPL)
+
+This is free software released under LGPL License
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+
+_translate = QCoreApplication.translate
+
+
+class QthWindow(QDialog):
+    """
+    Edit the listening location, saving it recomputes the distance
+    and bearing of every transmitter site
+    """
+
+    def __init__(self, rootapp, parent=None):
+        super().__init__(parent)
+        self.rootapp = rootapp
+        self.db = rootapp.db
+        self.setWindowTitle(_translate("", "QTH"))
+
+        self.txtLocator = QLineEdit()
+        self.txtLocator.setMaxLength(6)
+        self.txtLocator.setPlaceholderText("JN70dt")
+        self.txtLocator.editingFinished.connect(self.locator_changed)
+        self.spnLat = QDoubleSpinBox()
+        self.spnLat.setRange(-90.0, 90.0)
+        self.spnLat.setDecimals(4)
+        self.spnLon = QDoubleSpinBox()
+        self.spnLon.setRange(-180.0, 180.0)
+        self.spnLon.setDecimals(4)
+        self.lblStatus = QLabel()
+        qth = self.db.get_qth()
+        if qth is not None:
+            self.spnLat.setValue(qth[0])
+            self.spnLon.setValue(qth[1])
+        else:
+            self.lblStatus.setText(_translate("", "QTH not set, distances unavailable"))
+
+        btnSave = QPushButton(_translate("", "Save"))
+        btnSave.clicked.connect(self.save)
+        btnClear = QPushButton(_translate("", "Clear"))
+        btnClear.clicked.connect(self.clear)
+        btnClose = QPushButton(_translate("", "Close"))
+        btnClose.clicked.connect(self.close)
+
+        form = QFormLayout()
+        form.addRow(_translate("", "Locator"), self.txtLocator)
+        form.addRow(_translate("", "Latitude"), self.spnLat)
+        form.addRow(_translate("", "Longitude"), self.spnLon)
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        buttons.addWidget(btnSave)
+        buttons.addWidget(btnClear)
+        buttons.addWidget(btnClose)
+        layout = QVBoxLayout()
+        layout.addLayout(form)
+        layout.addWidget(self.lblStatus)
+        layout.addLayout(buttons)
+        self.setLayout(layout)
+
+    def locator_changed(self):
+        """
+        Fill coordinates from a Maidenhead locator
+        """
+        text = self.txtLocator.text().strip()
+        if not text:
+            return
+        try:
+            lat, lon = locator_to_latlon(text)
+        except ValueError:
+            self.lblStatus.setText(_translate("", "Invalid locator"))
+            return
+        self.spnLat.setValue(lat)
+        self.spnLon.setValue(lon)
+        self.lblStatus.clear()
+
+    def save(self):
+        try:
+            self.db.set_qth(self.spnLat.value(), self.spnLon.value())
+        except Exception as e:
+            self.show_error(f"Error saving QTH: {str(e)}")
+            return
+        self.close()
+
+    def clear(self):
+        try:
+            self.db.set_qth(None, None)
+        except Exception as e:
+            self.show_error(f"Error clearing QTH: {str(e)}")
+            return
+        self.close()
+
+    def show_error(self, message):
+        self.rootapp.show_error("QTH", message)
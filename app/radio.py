@@ -6,11 +6,21 @@ from PyQt5.QtWidgets import QAction, QActionGroup, QFileDialog, QWidget, QLabel,
     QMessageBox
 import math
 import json
+import logging
 
 from app.config import ConfigWindow
 from app.lookup import LookupWindow
 from app.search import SearchWindow
 from app.impsum import ImpsumWindow, WaitDialog
+from app.diagnostics import DiagnosticsWindow
+from app.qth import QthWindow
+from app.scan import ScanWindow
+from app.schedule import ScheduleWindow
+from app.core.scheduler import TuneScheduler, TUNE, tune
+from app.core.rigcaps import RIG_MODES
+from app.core import metrics
+from app.core.export import export
+from app.core.db import season_of
 # edit forms
 from app.areas import AreaWindow
 from app.countries import CountryWindow
@@ -103,6 +113,7 @@ class RadioWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         self.mode = 0
         self.freq = 0
         self.smeter = 0
+        self.dbm = 0
 
         # window handles
         self.lw = None
@@ -114,6 +125,22 @@ class RadioWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         self.esw = None
         self.etw = None
         self.lkw = None
+        self.wdlg = None
+        self.iwk = None
+        self.ewk = None
+        self.swk = None
+        self.dgw = None
+        self.qtw = None
+        self.scw = None
+        self.shw = None
+        self.polling = False
+
+        # scheduled tunings, one single shot timer set to the next event;
+        # the scheduler is built by start_schedule once the database is open
+        self.scheduler = None
+        self.sched_timer = QtCore.QTimer(self)
+        self.sched_timer.setSingleShot(True)
+        self.sched_timer.timeout.connect(self.run_schedule)
 
 
         # set initial position
@@ -125,11 +152,12 @@ class RadioWindow(QtWidgets.QMainWindow, Ui_MainWindow):
 
 
     def loadsettings(self):
+        self.configs = self.rootapp.db.rig_configs
         jconf = self.rootapp.settings.value("configs")
         if jconf:
-            self.configs = json.loads(jconf)
-        else:
-            self.configs = {}
+            # configs were kept in QSettings up to 0.4, moved once to the database
+            self.configs.import_configs(json.loads(jconf))
+            self.rootapp.settings.remove("configs")
         jconf = self.rootapp.settings.value("geom")
         if jconf:
             self.geom = json.loads(jconf)
@@ -139,7 +167,6 @@ class RadioWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         return
 
     def savesettings(self):
-        self.rootapp.settings.setValue("configs", json.dumps(self.configs))
         self.rootapp.settings.setValue("geom", json.dumps([self.x(), self.y()]))
         self.rootapp.settings.setValue("active", self.active)
         return
@@ -190,12 +217,25 @@ class RadioWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         action = QAction(_translate("", "Transmitters"), self)
         action.triggered.connect(self.edit_transmitters)
         self.menu_edit.addAction(action)
+        self.menu_edit.addSeparator()
+        action = QAction(_translate("", "QTH"), self)
+        action.triggered.connect(self.edit_qth)
+        self.menu_edit.addAction(action)
         action = QAction(_translate("", "Lookup"), self)
         action.triggered.connect(self.info_lookup)
         self.menu_info.addAction(action)
         action = QAction(_translate("", "Search"), self)
         action.triggered.connect(self.info_search)
         self.menu_info.addAction(action)
+        action = QAction(_translate("", "Scheduled tunings"), self)
+        action.triggered.connect(self.info_schedule)
+        self.menu_info.addAction(action)
+        action = QAction(_translate("", "Band scan"), self)
+        action.triggered.connect(self.info_scan)
+        self.menu_info.addAction(action)
+        action = QAction(_translate("", "Diagnostics"), self)
+        action.triggered.connect(self.info_diagnostics)
+        self.menu_info.addAction(action)
 
 
 
@@ -211,8 +251,14 @@ class RadioWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         action = QAction(_translate("", "Eibi import"), self)
         action.triggered.connect(self.eibi_import)
         self.menu_file.addAction(action)
+        action = QAction(_translate("", "Export..."), self)
+        action.triggered.connect(self.export_data)
+        self.menu_file.addAction(action)
+        # stored seasons, listed when the menu opens
+        self.menu_season = self.menu_file.addMenu(_translate("", "Season"))
+        self.menu_season.aboutToShow.connect(self.load_seasons)
         self.menu_file.addSeparator()
-        for i, (key, value) in enumerate(sorted(self.configs.items())):
+        for key in self.configs.names():
             action = QAction(f"{desc} {key}", self)
             action.triggered.connect(lambda checked, k=key: self.editconfig(k))
             self.menu_file.addAction(action)
@@ -232,7 +278,7 @@ class RadioWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         action.setChecked(True)
         self.menu_config.addAction(action)
         self.conf_group.addAction(action)
-        for i, (key, value) in enumerate(sorted(self.configs.items())):
+        for key in self.configs.names():
             action = QAction(f"{key}", self)
             #action.triggered.connect(lambda checked, k=key: self.setconfig(k))
             action.setCheckable(True)
@@ -253,12 +299,15 @@ class RadioWindow(QtWidgets.QMainWindow, Ui_MainWindow):
             conf = None
         else:
             shortname = selected_action.text()
-            conf = self.configs[shortname]
+            conf = self.configs.get(shortname)
         if self.rootapp.hamlib and self.rootapp.hamlib.rig:
             self.rootapp.hamlib.cleanup()
         if conf is None:
             self.timer1.stop()
             self.lbRig.setText("---")
+            self.enable_modes(RIG_MODES)
+            if self.rootapp.snapshot:
+                self.rootapp.snapshot.update(rig=None, freq=None, mode=None, smeter=None, band=None)
         else:
             rsp = self.rootapp.hamlib.openconf(conf, 100, RIG_VFO_A)
             if rsp != 0:
@@ -266,7 +315,10 @@ class RadioWindow(QtWidgets.QMainWindow, Ui_MainWindow):
                 self.rootapp.show_error("HamLib", _translate("","Error opening rig"), details=f"error {rsp}")
             else:
                 self.lbRig.setText(shortname)
+                self.enable_modes(self.rootapp.hamlib.modes())
                 self.timer1.start(100)
+                if self.rootapp.snapshot:
+                    self.rootapp.snapshot.update(rig=shortname)
             # self.update_radio()
 
 
@@ -274,16 +326,12 @@ class RadioWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         """
         edit an existing configuration
         """
-        cw = ConfigWindow(self.rootapp.hamlib)
-        cw.configs = self.configs
+        cw = ConfigWindow(self.rootapp.hamlib, self.configs)
         if key is None:
             cw.load_default_values()
         else:
-            cw.load_default_values(self.configs[key])
-        result = cw.exec_()
-        #
-        if result == cw.Accepted:
-            self.savesettings()
+            cw.load_default_values(self.configs.get(key))
+        cw.exec_()
         del cw
         self.loadradio()
 
@@ -323,6 +371,13 @@ class RadioWindow(QtWidgets.QMainWindow, Ui_MainWindow):
     #         result, error = self.rig.set_mode("AM")
     #         print(f"QThread result: {result}, {error}")
 
+    def enable_modes(self, modes):
+        """
+        mode buttons of the modes the rig supports
+        """
+        for btn in (self.btnAM, self.btnUSB, self.btnLSB, self.btnCW):
+            btn.setEnabled(btn.text() in modes)
+
     def mode_clicked(self):
         button = self.sender()
         rig = self.rootapp.hamlib.rig
@@ -357,12 +412,16 @@ class RadioWindow(QtWidgets.QMainWindow, Ui_MainWindow):
 
 
     def update_radio(self):
+        with metrics.span("ui.update_radio"):
+            self._update_radio()
+
+    def _update_radio(self):
         # read radio values and show on form
         sts, mode, freq, smeter, err = self.rootapp.hamlib.poll(RIG_VFO_A)
         if sts:
             self.rootapp.show_error("HamLib", _translate("", "Error polling rig"), details=f"error {err}")
             return
-        print(smeter)
+        self.dbm = smeter
         self.smeter = (self.smeter + self.smetercal(smeter)) / 2
         self.smeter_needle(self.smeter)
         if freq != self.freq:
@@ -373,6 +432,15 @@ class RadioWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         if mode != self.mode:
            self.mode = mode
            self.lbMode.setText(mode)
+        if self.rootapp.snapshot:
+            self.rootapp.snapshot.update(freq=freq, mode=mode, smeter=smeter, band=self.lbBand.text())
+
+    def refresh_band(self):
+        """
+        band plan changed, show band of current frequency again
+        """
+        if self.freq:
+            self.lbBand.setText(self.rootapp.db.get_band(self.freq / 1000))
 
     def smetercal(self, dbm):
         if dbm < 0:
@@ -428,16 +496,99 @@ class RadioWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         )
         if not filename:
             return
-        dlg = WaitDialog(_translate("","Importing..."), self)
-        dlg.show()
-        QtWidgets.QApplication.processEvents()
-        imp, upd, err = self.rootapp.db.import_eibi_csv(filename, False)
-        dlg.hide()
-        del dlg
+        self.wdlg = WaitDialog(_translate("","Importing..."), self)
+        self.wdlg.show()
+        # import runs on the writer connection, lookups keep working meanwhile
+        self.iwk = ImportWorker(self.rootapp.db, filename, self)
+        self.iwk.done.connect(self.eibi_imported)
+        self.iwk.start()
+
+    def eibi_imported(self, imp, upd, err, emsg):
+        """
+        Show import summary
+        """
+        self.wdlg.hide()
+        self.wdlg = None
+        self.iwk = None
+        if emsg:
+            self.rootapp.show_error("Import", _translate("", "Import failed"), details=emsg)
+            return
         iw = ImpsumWindow(imp, upd, err, self)
         iw.exec_()
 
 
+    def load_seasons(self):
+        """
+        Season menu, one checkable entry per stored season
+        """
+        db = self.rootapp.db
+        self.menu_season.clear()
+        seasons = db.seasons()
+        if not seasons:
+            action = QAction(_translate("", "Import an EiBi sked-xNN file"), self)
+            action.setEnabled(False)
+            self.menu_season.addAction(action)
+        for name, count in seasons:
+            action = QAction(f"{name} ({count})", self)
+            action.setCheckable(True)
+            action.setChecked(name == db.season)
+            action.triggered.connect(lambda checked, s=name: self.switch_season(s))
+            self.menu_season.addAction(action)
+
+    def switch_season(self, season):
+        """
+        Activate a stored season
+        """
+        if season == self.rootapp.db.season:
+            return
+        self.wdlg = WaitDialog(_translate("", "Switching season..."), self)
+        self.wdlg.show()
+        self.swk = SeasonWorker(self.rootapp.db, season, self)
+        self.swk.done.connect(self.season_switched)
+        self.swk.start()
+
+    def season_switched(self, count, emsg):
+        self.wdlg.hide()
+        self.wdlg = None
+        self.swk = None
+        if emsg:
+            self.rootapp.show_error("Season", _translate("", "Season switch failed"), details=emsg)
+
+    def export_data(self):
+        """
+        Export schedule or reception log
+        """
+        formats = {
+            _translate("", "Eibi file (*.csv)"): ("eibi", False),
+            _translate("", "Schedule CSV (*.csv)"): ("csv", False),
+            _translate("", "Schedule JSON Lines (*.jsonl)"): ("jsonl", False),
+            _translate("", "Log ADIF (*.adi)"): ("adif", True),
+            _translate("", "Log CSV (*.csv)"): ("csv", True),
+        }
+        filename, selected = QFileDialog.getSaveFileName(
+            self,
+            _translate("", "Export"),
+            "",
+            ";;".join(formats)
+        )
+        if not filename:
+            return
+        fmt, log = formats.get(selected, ("eibi", False))
+        self.wdlg = WaitDialog(_translate("", "Exporting..."), self)
+        self.wdlg.show()
+        self.ewk = ExportWorker(self.rootapp.db, fmt, filename, log, self)
+        self.ewk.done.connect(self.data_exported)
+        self.ewk.start()
+
+    def data_exported(self, count, emsg):
+        self.wdlg.hide()
+        self.wdlg = None
+        self.ewk = None
+        if emsg:
+            self.rootapp.show_error("Export", _translate("", "Export failed"), details=emsg)
+        else:
+            QMessageBox.information(self, _translate("", "Export"), _translate("", "Exported: ") + f"{count}")
+
     def edit_areas(self):
         self.eaw = AreaWindow(self.rootapp, self)
         self.eaw.show()
@@ -448,6 +599,7 @@ class RadioWindow(QtWidgets.QMainWindow, Ui_MainWindow):
 
     def edit_frequencies(self):
         self.efw = FrequencyWindow(self.rootapp, self)
+        self.efw.bands_changed.connect(self.refresh_band)
         self.efw.show()
 
     def edit_languages(self):
@@ -462,6 +614,10 @@ class RadioWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         self.etw = TransmitterWindow(self.rootapp, self)
         self.etw.show()
 
+    def edit_qth(self):
+        self.qtw = QthWindow(self.rootapp, self)
+        self.qtw.show()
+
     def info_search(self):
         self.sw = SearchWindow(self.rootapp, self)
         self.sw.show()
@@ -470,6 +626,90 @@ class RadioWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         self.lkw = Lookup(self.show_lookup, self)
         self.lkw.show()
 
+    def info_scan(self):
+        self.scw = ScanWindow(self.rootapp, self)
+        self.scw.show()
+
+    def pause_polling(self):
+        """
+        stop rig polling while another task owns the rig
+        """
+        self.polling = self.timer1.isActive()
+        self.timer1.stop()
+
+    def resume_polling(self):
+        if self.polling:
+            self.polling = False
+            self.timer1.start(100)
+
+    def info_schedule(self):
+        self.shw = ScheduleWindow(self)
+        self.shw.show()
+
+    def schedule(self, rows, log=False):
+        """
+        add broadcasts to the scheduled tunings, return how many had a start time
+        """
+        mode = self.mode if self.mode in RIG_MODES else "AM"
+        count = sum(self.scheduler.add(row, mode=mode, log=log) is not None for row in rows)
+        self.scheduler.save()
+        self.arm_schedule()
+        return count
+
+    def unschedule(self, tid):
+        self.scheduler.remove(tid)
+        self.scheduler.save()
+        self.arm_schedule()
+
+    def start_schedule(self):
+        """
+        reload the stored scheduled tunings and arm the timer
+        """
+        self.scheduler = TuneScheduler(self.rootapp.db)
+        self.scheduler.load()
+        self.arm_schedule()
+
+    def arm_schedule(self):
+        """
+        wake up at the next event, at least hourly against clock changes
+        """
+        wait = self.scheduler.seconds_to_next()
+        if wait is None:
+            self.sched_timer.stop()
+            return
+        self.sched_timer.start(int(min(wait, 3600) * 1000))
+
+    def run_schedule(self):
+        for kind, tid, target in self.scheduler.pop_due():
+            if not self.timer1.isActive():
+                # no rig active, or rig busy with a scan: tunings wait for it
+                if not self.scheduler.defer(kind, tid):
+                    logging.warning(f"scheduled {kind} {target['frequency_khz']} "
+                                    f"{target['station_name']} missed, rig not available")
+                continue
+            if kind == TUNE:
+                s, e = tune(self.rootapp.hamlib, target, RIG_VFO_A)
+                if s:
+                    logging.error(f"scheduled tuning {target['frequency_khz']}: {e}")
+            else:
+                self.rootapp.db.logbook.append({
+                    'frequency_khz': target['frequency_khz'],
+                    'station_name': target['station_name'],
+                    'country_name': target['country_name'],
+                    'language_name': target['language_name'],
+                    'mode': self.mode or None,
+                    'smeter': self.dbm,
+                    'rig': self.lbRig.text(),
+                    'notes': _translate("", "scheduled"),
+                })
+        if self.shw is not None and self.shw.isVisible():
+            self.shw.refresh()
+        self.arm_schedule()
+
+    def info_diagnostics(self):
+        self.dgw = DiagnosticsWindow(self)
+        self.dgw.show()
+
     def closeEvent(self, event: QCloseEvent):
         if self.lw:
             del self.lw
@@ -490,6 +730,72 @@ class RadioWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         self.savesettings()
 
 
+class ImportWorker(QtCore.QThread):
+    """
+    Eibi import worker thread
+    """
+    done = QtCore.pyqtSignal(int, int, list, str)
+
+    def __init__(self, db, filename, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.filename = filename
+
+    def run(self):
+        imp, upd, err, emsg = 0, 0, [], ""
+        try:
+            # sked-b25.csv goes to season B25, the active one is kept
+            imp, upd, err = self.db.import_eibi_csv(self.filename, False, season_of(self.filename))
+        except Exception as e:
+            emsg = str(e)
+        finally:
+            # always answer, the wait dialog is closed by done
+            self.db.release_reader()
+            self.done.emit(imp, upd, err, emsg)
+
+
+class SeasonWorker(QtCore.QThread):
+    """
+    Season switch worker thread
+    """
+    done = QtCore.pyqtSignal(int, str)
+
+    def __init__(self, db, season, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.season = season
+
+    def run(self):
+        try:
+            count, emsg = self.db.switch_season(self.season), ""
+        except Exception as e:
+            count, emsg = 0, str(e)
+        self.db.release_reader()
+        self.done.emit(count, emsg)
+
+
+class ExportWorker(QtCore.QThread):
+    """
+    Export worker thread, exporters stream from their own reader
+    """
+    done = QtCore.pyqtSignal(int, str)
+
+    def __init__(self, db, fmt, filename, log, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.fmt = fmt
+        self.filename = filename
+        self.log = log
+
+    def run(self):
+        try:
+            count, emsg = export(self.db, self.fmt, self.filename, log=self.log), ""
+        except Exception as e:
+            count, emsg = 0, str(e)
+        self.db.release_reader()
+        self.done.emit(count, emsg)
+
+
 class Lookup(QWidget):
     def __init__(self, show_lookup, parent=None):
         super().__init__()
@@ -0,0 +1,245 @@
+from PyQt5 import QtCore
+from PyQt5.QtCore import Qt, QCoreApplication
+from PyQt5.QtWidgets import (QDialog, QTableWidget, QTableWidgetItem, QPushButton, QVBoxLayout,
+                             QHBoxLayout, QComboBox, QDoubleSpinBox, QSpinBox, QLabel,
+                             QHeaderView, QAbstractItemView)
+
+from app.core.scanner import BandScanner, ChannelSweep, DWELL, SAMPLES, STEP, SETTLE, MARGIN, s_units
+
+""" 
+ShortwaveHunter
+BCL radio software
+Band scan window
+
+Copyright (c) 2025 I8ZSE, Giorgio L. Rutigliano
+(www.i8zse.it, www.i8zse.eu, www.giorgiorutigliano.it)
+
+radio communications are handled by https://github.com/Hamlib/Hamlib (LGPL)
+
+This is free software released under LGPL License
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+
+_translate = QCoreApplication.translate
+
+
+class ScanWorker(QtCore.QThread):
+    """
+    Run a scan pass off the gui thread, one signal per stop
+    """
+    stop_ready = QtCore.pyqtSignal(dict)
+    scan_done = QtCore.pyqtSignal(str)
+
+    def __init__(self, scanner, plan, parent=None):
+        super().__init__(parent)
+        self.scanner = scanner
+        self.plan = plan
+
+    def run(self):
+        emsg = ""
+        try:
+            for stop in self.scanner.scan(self.plan):
+                self.stop_ready.emit(stop)
+        except Exception as e:
+            emsg = str(e)
+        self.scan_done.emit(emsg)
+
+
+class ScanWindow(QDialog):
+    """
+    Scan the frequencies on air now in a band, or in all bands, or sweep
+    a band channel by channel listing the active ones.
+    Rig polling of the main window is paused while scanning
+    """
+
+    def __init__(self, rootapp, radio):
+        super().__init__(radio)
+        self.rootapp = rootapp
+        self.radio = radio
+        self.worker = None
+        self.setWindowTitle(_translate("", "Band scan"))
+        self.resize(640, 480)
+
+        self.cmbMode = QComboBox()
+        self.cmbMode.addItem(_translate("", "On air schedule"))
+        self.cmbMode.addItem(_translate("", "Channel sweep"))
+        self.cmbMode.currentIndexChanged.connect(self.mode_changed)
+        self.cmbBand = QComboBox()
+        self.cmbBand.addItem(_translate("", "All bands"), "")
+        for band in rootapp.db.get_bands():
+            self.cmbBand.addItem(band[1], band[1])
+        self.spnDwell = QDoubleSpinBox()
+        self.spnDwell.setRange(0.2, 60.0)
+        self.spnDwell.setSingleStep(0.5)
+        self.spnDwell.setValue(DWELL)
+        self.spnDwell.setSuffix(" s")
+        self.spnSamples = QSpinBox()
+        self.spnSamples.setRange(1, 20)
+        self.spnSamples.setValue(SAMPLES)
+        self.spnStep = QDoubleSpinBox()
+        self.spnStep.setRange(0.5, 100.0)
+        self.spnStep.setValue(STEP)
+        self.spnStep.setSuffix(" kHz")
+        self.spnMargin = QSpinBox()
+        self.spnMargin.setRange(1, 60)
+        self.spnMargin.setValue(MARGIN)
+        self.spnMargin.setSuffix(" dB")
+        self.spnMargin.setToolTip(_translate("", "Level over the noise floor of an active channel"))
+        self.btnStart = QPushButton(_translate("", "Start"))
+        self.btnStart.clicked.connect(self.start)
+        self.btnStop = QPushButton(_translate("", "Stop"))
+        self.btnStop.setEnabled(False)
+        self.btnStop.clicked.connect(self.stop)
+        btnClose = QPushButton(_translate("", "Close"))
+        btnClose.clicked.connect(self.close)
+        self.lblStatus = QLabel()
+
+        self.tblScan = QTableWidget(0, 4)
+        self.tblScan.setHorizontalHeaderLabels([_translate("", "Freq"), _translate("", "S"),
+                                                _translate("", "Band"), _translate("", "Stations")])
+        self.tblScan.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.tblScan.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.tblScan.verticalHeader().setVisible(False)
+        self.tblScan.horizontalHeader().setSectionResizeMode(3, QHeaderView.Stretch)
+        self.tblScan.cellDoubleClicked.connect(self.tune)
+
+        controls = QHBoxLayout()
+        controls.addWidget(self.cmbMode)
+        controls.addWidget(QLabel(_translate("", "Band")))
+        controls.addWidget(self.cmbBand)
+        controls.addWidget(QLabel(_translate("", "Dwell")))
+        controls.addWidget(self.spnDwell)
+        controls.addWidget(QLabel(_translate("", "Samples")))
+        controls.addWidget(self.spnSamples)
+        controls.addWidget(QLabel(_translate("", "Step")))
+        controls.addWidget(self.spnStep)
+        controls.addWidget(QLabel(_translate("", "Margin")))
+        controls.addWidget(self.spnMargin)
+        controls.addStretch()
+        buttons = QHBoxLayout()
+        buttons.addWidget(self.lblStatus)
+        buttons.addStretch()
+        buttons.addWidget(self.btnStart)
+        buttons.addWidget(self.btnStop)
+        buttons.addWidget(btnClose)
+        layout = QVBoxLayout()
+        layout.addLayout(controls)
+        layout.addWidget(self.tblScan)
+        layout.addLayout(buttons)
+        self.setLayout(layout)
+        self.mode_changed(0)
+
+    @property
+    def sweeping(self):
+        return self.cmbMode.currentIndex() == 1
+
+    def mode_changed(self, index):
+        """
+        sweeps wait only for the receiver to settle on each channel
+        """
+        self.spnDwell.setValue(SETTLE if self.sweeping else DWELL)
+        self.spnSamples.setValue(1 if self.sweeping else SAMPLES)
+        self.spnStep.setEnabled(self.sweeping)
+        self.spnMargin.setEnabled(self.sweeping)
+        self.cmbBand.setItemText(0, _translate("", "Select band") if self.sweeping
+                                 else _translate("", "All bands"))
+
+    def start(self):
+        if not self.rootapp.hamlib or self.rootapp.hamlib.rig is None:
+            self.show_error(_translate("", "Activate a rig first"))
+            return
+        band = self.cmbBand.currentData()
+        if self.sweeping:
+            if not band:
+                self.show_error(_translate("", "Select the band to sweep"))
+                return
+            scanner = ChannelSweep(self.rootapp.db, self.rootapp.hamlib, self.spnStep.value(),
+                                   margin=self.spnMargin.value(), settle=self.spnDwell.value(),
+                                   samples=self.spnSamples.value())
+        else:
+            scanner = BandScanner(self.rootapp.db, self.rootapp.hamlib,
+                                  self.spnDwell.value(), self.spnSamples.value())
+        plan = scanner.scan_list([band] if band else None)
+        if not plan:
+            self.lblStatus.setText(_translate("", "Nothing on air"))
+            return
+        self.tblScan.setRowCount(0)
+        self.lblStatus.setText(_translate("", "{0} frequencies, about {1} s").format(
+            len(plan), f"{scanner.estimate(plan):.0f}"))
+        self.radio.pause_polling()
+        self.worker = ScanWorker(scanner, plan, self)
+        self.worker.stop_ready.connect(self._stop_ready)
+        self.worker.scan_done.connect(self._scan_done)
+        self.btnStart.setEnabled(False)
+        self.btnStop.setEnabled(True)
+        self.worker.start()
+
+    def stop(self):
+        if self.worker is not None:
+            self.worker.scanner.stop()
+
+    def _stop_ready(self, stop):
+        if not stop.get('active', True):
+            # sweep, quiet channel
+            self.lblStatus.setText(f"{stop['frequency_khz']:.1f}")
+            return
+        row = self.tblScan.rowCount()
+        self.tblScan.insertRow(row)
+        freq_item = QTableWidgetItem(f"{stop['frequency_khz']:.1f}")
+        freq_item.setData(Qt.UserRole, stop['frequency_khz'])
+        self.tblScan.setItem(row, 0, freq_item)
+        s_item = QTableWidgetItem(s_units(stop['smeter']))
+        tip = f"{stop['smeter']} dB, avg {stop['smeter_avg']:.1f} dB"
+        if stop.get('floor') is not None:
+            tip += f", floor {stop['floor']} dB"
+        s_item.setToolTip(tip)
+        self.tblScan.setItem(row, 1, s_item)
+        self.tblScan.setItem(row, 2, QTableWidgetItem(stop['band_name'] or ""))
+        stations = ", ".join(f"{b['station_name']} ({b['language_name'] or '?'})" for b in stop['broadcasts'])
+        self.tblScan.setItem(row, 3, QTableWidgetItem(stations))
+        self.tblScan.scrollToBottom()
+
+    def _scan_done(self, emsg):
+        self.worker = None
+        self.btnStart.setEnabled(True)
+        self.btnStop.setEnabled(False)
+        self.radio.resume_polling()
+        if emsg:
+            self.show_error(emsg)
+        else:
+            self.lblStatus.setText(_translate("", "Scan completed"))
+
+    def tune(self, row, column):
+        """
+        double click tunes the rig on the scanned frequency
+        """
+        if self.worker is not None or self.rootapp.hamlib.rig is None:
+            return
+        freq = self.tblScan.item(row, 0).data(Qt.UserRole)
+        self.rootapp.hamlib.set_frequency(freq * 1000)
+
+    def closeEvent(self, event):
+        if self.worker is not None:
+            self.worker.scanner.stop()
+            self.worker.wait()
+        super().closeEvent(event)
+
+    def show_error(self, message):
+        self.rootapp.show_error("Band scan", message)
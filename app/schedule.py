@@ -0,0 +1,91 @@
+from PyQt5.QtCore import Qt, QCoreApplication
+from PyQt5.QtWidgets import (QDialog, QTableWidget, QTableWidgetItem, QPushButton, QVBoxLayout,
+                             QHBoxLayout, QHeaderView, QAbstractItemView)
+
+""" 
+ShortwaveHunter
+BCL radio software
+Scheduled tunings window
+
+Copyright (c) 2025 I8ZSE, Giorgio L. Rutigliano
+(www.i8zse.it, www.i8zse.eu, www.giorgiorutigliano.it)
+
+radio communications are handled by https://github.com/Hamlib/Hamlib (LGPL)
+
+This is free software released under LGPL License
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+
+_translate = QCoreApplication.translate
+
+
+class ScheduleWindow(QDialog):
+    """
+    Upcoming scheduled tunings, next start first
+    """
+
+    def __init__(self, radio):
+        super().__init__(radio)
+        self.radio = radio
+        self.setWindowTitle(_translate("", "Scheduled tunings"))
+        self.resize(640, 360)
+
+        self.tblTargets = QTableWidget(0, 6)
+        self.tblTargets.setHorizontalHeaderLabels([
+            _translate("", "Next start (UTC)"), _translate("", "Freq"), _translate("", "Mode"),
+            _translate("", "Station"), _translate("", "Days"), _translate("", "Log")])
+        self.tblTargets.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.tblTargets.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.tblTargets.verticalHeader().setVisible(False)
+        self.tblTargets.horizontalHeader().setSectionResizeMode(3, QHeaderView.Stretch)
+
+        btnRemove = QPushButton(_translate("", "Remove"))
+        btnRemove.clicked.connect(self.remove)
+        btnClose = QPushButton(_translate("", "Close"))
+        btnClose.clicked.connect(self.close)
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        buttons.addWidget(btnRemove)
+        buttons.addWidget(btnClose)
+        layout = QVBoxLayout()
+        layout.addWidget(self.tblTargets)
+        layout.addLayout(buttons)
+        self.setLayout(layout)
+        self.refresh()
+
+    def refresh(self):
+        upcoming = self.radio.scheduler.upcoming()
+        self.tblTargets.setRowCount(len(upcoming))
+        for row_idx, (when, tid, target) in enumerate(upcoming):
+            when_item = QTableWidgetItem(when.strftime("%a %d %H:%M"))
+            when_item.setData(Qt.UserRole, tid)
+            self.tblTargets.setItem(row_idx, 0, when_item)
+            self.tblTargets.setItem(row_idx, 1, QTableWidgetItem(f"{target['frequency_khz']:.1f}"))
+            self.tblTargets.setItem(row_idx, 2, QTableWidgetItem(target['mode'] or ""))
+            self.tblTargets.setItem(row_idx, 3, QTableWidgetItem(target['station_name'] or ""))
+            self.tblTargets.setItem(row_idx, 4, QTableWidgetItem(target['days_operation'] or
+                                                                 _translate("", "All")))
+            self.tblTargets.setItem(row_idx, 5, QTableWidgetItem(_translate("", "Yes") if target['log'] else ""))
+
+    def remove(self):
+        rows = {item.row() for item in self.tblTargets.selectedItems()}
+        for row in rows:
+            self.radio.unschedule(self.tblTargets.item(row, 0).data(Qt.UserRole))
+        self.refresh()
@@ -1,9 +1,13 @@
 import sys
+import sqlite3
+import threading
 
 from PyQt5 import QtCore
-from PyQt5.QtWidgets import QWidget, QMessageBox, QTableWidgetItem, QPushButton
+from PyQt5.QtWidgets import QWidget, QMessageBox, QTableWidgetItem, QPushButton, QCheckBox, QSpinBox, QMenu
 from PyQt5.QtCore import Qt, QTime
 from app.ui.search_ui import Ui_SearchWindow
+from app.core import metrics
+from app.core.db import day_of_year
 
 """ 
 ShortwaveHunter
@@ -35,12 +39,69 @@ SOFTWARE.
 
 _translate = QtCore.QCoreApplication.translate
 
+# msec of quiet after last filter change before a live search starts
+LIVE_DELAY = 300
+
+
+class SearchWorker(QtCore.QThread):
+    """
+    Run a search off the gui thread, streaming rows in chunks
+    """
+    rows_ready = QtCore.pyqtSignal(int, list)
+    search_done = QtCore.pyqtSignal(int, str)
+
+    def __init__(self, db, filters, gen, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.filters = filters
+        self.gen = gen
+        self.conn = None
+        self.cancelled = False
+        self.lock = threading.Lock()
+
+    def run(self):
+        emsg = ""
+        with self.lock:
+            self.conn = self.db.reader()
+        try:
+            for rows in self.db.iter_search_skeds(self.filters):
+                if self.cancelled:
+                    break
+                self.rows_ready.emit(self.gen, rows)
+        except sqlite3.OperationalError as e:
+            # interrupted by cancel
+            if not self.cancelled:
+                emsg = str(e)
+        except Exception as e:
+            emsg = str(e)
+        with self.lock:
+            self.conn = None
+            self.db.release_reader()
+        self.search_done.emit(self.gen, emsg)
+
+    def cancel(self):
+        """
+        abort running query, called from gui thread
+        """
+        with self.lock:
+            self.cancelled = True
+            if self.conn is not None:
+                self.conn.interrupt()
+
+
 class SearchWindow(QWidget):
     def __init__(self, rootapp, parent=None):
         super().__init__()
         self.db = rootapp.db
         self.rootapp = rootapp
         self.current_id = None
+        # search generation, stale worker results are dropped
+        self.gen = 0
+        self.worker = None
+        self.workers = []
+        self.live_timer = QtCore.QTimer(self)
+        self.live_timer.setSingleShot(True)
+        self.live_timer.timeout.connect(self.search)
         self.setup_ui()
         self.load_combos()
         self.connect_signals()
@@ -55,11 +116,54 @@ class SearchWindow(QWidget):
     def setup_ui(self):
         self.ui = Ui_SearchWindow()
         self.ui.setupUi(self)
+        # live search toggle
+        self.chkLive = QCheckBox(_translate("", "Live"), self)
+        self.chkLive.setToolTip(_translate("", "Search while typing"))
+        self.ui.searchLayout.insertWidget(1, self.chkLive)
+        # distance from qth, 0 is no limit
+        self.spnMaxKm = QSpinBox(self)
+        self.spnMaxKm.setRange(0, 20000)
+        self.spnMaxKm.setSingleStep(500)
+        self.spnMaxKm.setSuffix(" km")
+        self.spnMaxKm.setSpecialValueText(_translate("", "Any distance"))
+        self.spnMaxKm.setToolTip(_translate("", "Transmitter sites within distance from QTH"))
+        self.ui.searchLayout.insertWidget(2, self.spnMaxKm)
+        self.chkNearest = QCheckBox(_translate("", "Nearest first"), self)
+        self.ui.searchLayout.insertWidget(3, self.chkNearest)
+        self.ui.tblSked.setColumnCount(8)
+        self.ui.tblSked.setHorizontalHeaderItem(7, QTableWidgetItem(_translate("", "Km")))
+        # schedule tunings from the results
+        self.ui.tblSked.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.ui.tblSked.customContextMenuRequested.connect(self._sked_menu)
 
 
     def connect_signals(self):
         self.ui.btnClear.clicked.connect(self.reset_form)
         self.ui.btnSearch.clicked.connect(self.search)
+        # live search triggers
+        self.chkLive.toggled.connect(self.filters_changed)
+        self.ui.freqMinSpinBox.valueChanged.connect(self.filters_changed)
+        self.ui.freqMaxSpinBox.valueChanged.connect(self.filters_changed)
+        self.ui.useTimeCheckBox.toggled.connect(self.filters_changed)
+        self.ui.timeEdit.timeChanged.connect(self.filters_changed)
+        self.ui.daysLineEdit.textChanged.connect(self.filters_changed)
+        self.ui.stationLineEdit.textChanged.connect(self.filters_changed)
+        self.ui.startDateLineEdit.textChanged.connect(self.filters_changed)
+        self.ui.endDateLineEdit.textChanged.connect(self.filters_changed)
+        self.ui.countryComboBox.currentIndexChanged.connect(self.filters_changed)
+        self.ui.languageComboBox.currentIndexChanged.connect(self.filters_changed)
+        self.ui.targetAreaComboBox.currentIndexChanged.connect(self.filters_changed)
+        self.ui.bandComboBox.currentIndexChanged.connect(self.filters_changed)
+        self.ui.limitSpinBox.valueChanged.connect(self.filters_changed)
+        self.spnMaxKm.valueChanged.connect(self.filters_changed)
+        self.chkNearest.toggled.connect(self.filters_changed)
+
+    def filters_changed(self, *args):
+        """
+        restart live search delay
+        """
+        if self.chkLive.isChecked():
+            self.live_timer.start(LIVE_DELAY)
 
     def load_combos(self):
         """
@@ -120,15 +224,57 @@ class SearchWindow(QWidget):
         self.ui.targetAreaComboBox.setCurrentIndex(0)
         self.ui.bandComboBox.setCurrentIndex(0)
 
+        # Reset distance
+        self.spnMaxKm.setValue(0)
+        self.chkNearest.setChecked(False)
+
         # Reset limit
         self.ui.limitSpinBox.setValue(100)
 
     def search(self):
+        live = self.sender() is self.live_timer
         errors  = self.validate_form()
         if errors:
+            if live:
+                # wait for the user to complete the field
+                return
             QMessageBox.warning(self, _translate("", "Validation Error"), "\n".join(errors))
         filters = self.get_filters()
-        self._load_table(self.db.search_skeds(filters))
+        # newest search wins
+        self.cancel_search()
+        self.gen += 1
+        self.ui.tblSked.setRowCount(0)
+        self.worker = SearchWorker(self.db, filters, self.gen, self)
+        self.worker.rows_ready.connect(self._rows_ready)
+        self.worker.search_done.connect(self._search_done)
+        self.workers.append(self.worker)
+        self.worker.start()
+
+    def cancel_search(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker = None
+
+    def _rows_ready(self, gen, rows):
+        if gen == self.gen:
+            with metrics.span("ui.search.fill"):
+                self._append_rows(rows)
+
+    def _search_done(self, gen, emsg):
+        worker = self.sender()
+        if worker in self.workers:
+            self.workers.remove(worker)
+        if gen == self.gen:
+            self.worker = None
+            if emsg:
+                self.show_error(emsg)
+
+    def closeEvent(self, event):
+        self.live_timer.stop()
+        self.cancel_search()
+        for worker in self.workers:
+            worker.wait()
+        super().closeEvent(event)
 
 
     def get_filters(self):
@@ -185,6 +331,12 @@ class SearchWindow(QWidget):
         if end_date and len(end_date) == 4:
             params['end_date'] = end_date
 
+        # Distance from qth
+        if self.spnMaxKm.value() > 0:
+            params['max_distance'] = self.spnMaxKm.value()
+        if self.chkNearest.isChecked():
+            params['order'] = 'distance'
+
         # Limit
         if self.ui.limitSpinBox.value() > 0:
             params['limit'] = self.ui.limitSpinBox.value()
@@ -200,41 +352,28 @@ class SearchWindow(QWidget):
         if freq_min > 0 and freq_max > 0 and freq_min >= freq_max:
             errors.append(_translate("", "Minimum frequency must be less than maximum frequency"))
 
-        # Validate date format
+        # Validate date format, a range may wrap around new year
         start_date = self.ui.startDateLineEdit.text().strip()
-        if start_date and (len(start_date) != 4 or not start_date.isdigit()):
-            errors.append(_translate("", "Start date must be in MMDD format (4 digits)"))
+        if start_date and (len(start_date) != 4 or day_of_year(start_date) is None):
+            errors.append(_translate("", "Start date must be a valid DDMM date (4 digits)"))
 
         end_date = self.ui.endDateLineEdit.text().strip()
-        if end_date and (len(end_date) != 4 or not end_date.isdigit()):
-            errors.append(_translate("", "End date must be in MMDD format (4 digits)"))
-
-        # Validate date range
-        if start_date and end_date and len(start_date) == 4 and len(end_date) == 4:
-            try:
-                start_month = int(start_date[:2])
-                start_day = int(start_date[2:])
-                end_month = int(end_date[:2])
-                end_day = int(end_date[2:])
-
-                if not (1 <= start_month <= 12) or not (1 <= start_day <= 31):
-                    errors.append(_translate("", "Invalid start date"))
-                if not (1 <= end_month <= 12) or not (1 <= end_day <= 31):
-                    errors.append(_translate("", "Invalid end date"))
-            except ValueError:
-                errors.append(_translate("", "Invalid date format"))
+        if end_date and (len(end_date) != 4 or day_of_year(end_date) is None):
+            errors.append(_translate("", "End date must be a valid DDMM date (4 digits)"))
 
         return errors
 
-    def _load_table(self, rows):
+    def _append_rows(self, rows):
         """
-        Load sked table
+        Append rows to sked table
         """
-
-        self.ui.tblSked.setRowCount(len(rows))
-        for row_idx, row in enumerate(rows):
+        first = self.ui.tblSked.rowCount()
+        self.ui.tblSked.setRowCount(first + len(rows))
+        # translated once per fill, not per row
+        tune_text, all_days = _translate("", "Tune"), _translate("", "All")
+        for row_idx, row in enumerate(rows, first):
             # Tune in button
-            btnTune = QPushButton(_translate("", "Tune"))
+            btnTune = QPushButton(tune_text)
             btnTune.clicked.connect(lambda checked, data=row: self._tune_in(data))
             self.ui.tblSked.setCellWidget(row_idx, 6, btnTune)
 
@@ -269,9 +408,36 @@ class SearchWindow(QWidget):
             self.ui.tblSked.setItem(row_idx, 4, time_item)
 
             # Days
-            days_item = QTableWidgetItem(row['days_operation'] or _translate("", "All"))
+            days_item = QTableWidgetItem(row['days_operation'] or all_days)
             self.ui.tblSked.setItem(row_idx, 5, days_item)
 
+            # Distance and bearing from qth
+            distance = row.get('distance_km')
+            km_item = QTableWidgetItem("" if distance is None else f"{distance:.0f}")
+            km_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+            if distance is not None:
+                km_item.setToolTip(f"{row['transmitter_site'] or ''} {row['bearing_deg']:.0f}\u00b0")
+            self.ui.tblSked.setItem(row_idx, 7, km_item)
+
+
+    def _sked_menu(self, pos):
+        item = self.ui.tblSked.itemAt(pos)
+        radio = self.rootapp.main_window
+        if item is None or radio is None:
+            return
+        rows = {index.row() for index in self.ui.tblSked.selectedIndexes()} or {item.row()}
+        data = [self.ui.tblSked.item(row, 0).data(Qt.UserRole) for row in sorted(rows)]
+        menu = QMenu(self)
+        action_tune = menu.addAction(_translate("", "Schedule tuning"))
+        action_log = menu.addAction(_translate("", "Schedule tuning and S-meter log"))
+        action = menu.exec_(self.ui.tblSked.viewport().mapToGlobal(pos))
+        if action is None:
+            return
+        count = radio.schedule(data, log=action is action_log)
+        if count < len(data):
+            QMessageBox.information(self, _translate("", "Schedule"),
+                                    _translate("", "{0} of {1} broadcasts have no start time").format(
+                                        len(data) - count, len(data)))
 
     def _tune_in(self, data):
         if data['frequency_khz'] and data['frequency_khz'] > 0:
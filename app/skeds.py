@@ -1,6 +1,7 @@
 from PyQt5.QtWidgets import (QWidget, QMessageBox, QTableWidgetItem)
 from PyQt5.QtCore import Qt, QTime
 from app.ui.skeds_ui import Ui_SkedForm
+from app.core.db import day_of_year
 
 class SkedsWindow(QWidget):
     def __init__(self, rootapp, parent=None):
@@ -45,34 +46,26 @@ class SkedsWindow(QWidget):
         """Initialize comboboxes with data from database"""
         try:
             # Countries
-            countries = self.db.conn.execute(
-                "SELECT id, cname FROM countries ORDER BY cname"
-            ).fetchall()
+            countries = self.db.countries.choices()
             self.ui.cmb_country.clear()
             for country_id, cname in countries:
                 self.ui.cmb_country.addItem(cname, country_id)
 
             # Languages
-            languages = self.db.conn.execute(
-                "SELECT id, lang FROM languages ORDER BY lang"
-            ).fetchall()
+            languages = self.db.languages.choices()
             self.ui.cmb_language.clear()
             for lang_id, lang in languages:
                 self.ui.cmb_language.addItem(lang, lang_id)
 
             # Areas
-            areas = self.db.conn.execute(
-                "SELECT id, aname FROM area ORDER BY aname"
-            ).fetchall()
+            areas = self.db.areas.choices()
             self.ui.cmb_target_area.clear()
             self.ui.cmb_target_area.addItem("", None)  # Empty option
             for area_id, aname in areas:
                 self.ui.cmb_target_area.addItem(aname, area_id)
 
             # Transmitter sites
-            transmitters = self.db.conn.execute(
-                "SELECT DISTINCT site_code FROM transmitters ORDER BY site_code"
-            ).fetchall()
+            transmitters = self.db.transmitters.sites()
             self.ui.cmb_transmitter_site.clear()
             self.ui.cmb_transmitter_site.addItem("", "")  # Empty option
             for (site_code,) in transmitters:
@@ -96,41 +89,14 @@ class SkedsWindow(QWidget):
     def load_data(self, search_params=None):
         """Load data into the table view"""
         try:
-            query = """SELECT b.id, b.frequency_khz, 
-                      b.start_time, b.end_time, b.station_name,
-                      c.cname, l.lang
-                      FROM broadcasts b
-                      LEFT JOIN countries c ON b.country_id = c.id
-                      LEFT JOIN languages l ON b.language_id = l.id
-                   """
-            params = ()
-
-            if search_params:
-                field, term = search_params
-                if field == "frequency_khz":
-                    try:
-                        freq = float(term)
-                        query += " WHERE b.frequency_khz = ?"
-                        params = (freq,)
-                    except ValueError:
-                        self.show_error("Please enter a valid frequency number")
-                        return
-                elif field == "station_name":
-                    query += " WHERE b.station_name LIKE ?"
-                    params = (f"%{term}%",)
-                elif field == "country":
-                    query += " WHERE c.cname LIKE ?"
-                    params = (f"%{term}%",)
-                elif field == "language":
-                    query += " WHERE l.lang LIKE ?"
-                    params = (f"%{term}%",)
-                elif field == "target_area":
-                    query += " WHERE a.aname LIKE ?"
-                    params = (f"%{term}%",)
-
-            query += " ORDER BY b.frequency_khz, b.start_time"
-
-            records = self.db.conn.execute(query, params).fetchall()
+            try:
+                records = self.db.broadcasts.list(search_params)
+            except ValueError as e:
+                if search_params and search_params[0] == "frequency_khz":
+                    self.show_error("Please enter a valid frequency number")
+                else:
+                    self.show_error(str(e))
+                return
 
             self.ui.table_Skeds.setRowCount(0)
 
@@ -174,13 +140,7 @@ class SkedsWindow(QWidget):
 
         try:
             broadcast_id = selected[0].data(Qt.UserRole)
-            record = self.db.conn.execute(
-                """SELECT frequency_khz, start_time, end_time, days_operation,
-                   country_id, station_name, language_id, target_area_id,
-                   transmitter_site, persistence_code, start_date, end_date, remarks
-                   FROM broadcasts WHERE id=?""",
-                (broadcast_id,)
-            ).fetchone()
+            record = self.db.broadcasts.get(broadcast_id)
 
             if record:
                 self.current_id = broadcast_id
@@ -272,13 +232,11 @@ class SkedsWindow(QWidget):
         start_date = self.ui.txt_start_date.text().strip()
         end_date = self.ui.txt_end_date.text().strip()
 
-        if start_date or end_date:
-            if len(start_date) != 4 or not start_date.isdigit():
-                errors.append("Start date must be in MMDD format")
-            if len(end_date) != 4 or not end_date.isdigit():
-                errors.append("End date must be in MMDD format")
-            if start_date and end_date and start_date > end_date:
-                errors.append("End date must be after start date")
+        # EiBi DDMM dates, either may be missing, end before start wraps around new year
+        if start_date and (len(start_date) != 4 or day_of_year(start_date) is None):
+            errors.append("Start date must be a valid DDMM date")
+        if end_date and (len(end_date) != 4 or day_of_year(end_date) is None):
+            errors.append("End date must be a valid DDMM date")
 
         return errors
 
@@ -312,26 +270,11 @@ class SkedsWindow(QWidget):
 
             if self.current_id:
                 # Update existing record
-                self.db.conn.execute(
-                    """UPDATE Skeds 
-                    SET frequency_khz=?, start_time=?, end_time=?, days_operation=?,
-                        country_id=?, station_name=?, language_id=?, target_area_id=?,
-                        transmitter_site=?, persistence_code=?, start_date=?, end_date=?, remarks=?
-                    WHERE id=?""",
-                    data + (self.current_id,)
-                )
+                self.db.broadcasts.update(self.current_id, data)
             else:
                 # Insert new record
-                self.db.conn.execute(
-                    """INSERT INTO Skeds 
-                    (frequency_khz, start_time, end_time, days_operation,
-                     country_id, station_name, language_id, target_area_id,
-                     transmitter_site, persistence_code, start_date, end_date, remarks)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                    data
-                )
-
-            self.db.conn.commit()
+                self.db.broadcasts.insert(data)
+
             self.load_data(self.current_search)
             self.clear_form()
             QMessageBox.information(self, "Success", "Broadcast saved successfully")
@@ -355,8 +298,7 @@ class SkedsWindow(QWidget):
 
         if reply == QMessageBox.Yes:
             try:
-                self.db.conn.execute("DELETE FROM broadcasts WHERE id=?", (self.current_id,))
-                self.db.conn.commit()
+                self.db.broadcasts.delete(self.current_id)
                 self.load_data(self.current_search)
                 self.clear_form()
                 QMessageBox.information(self, "Success", "Broadcast deleted successfully")
@@ -73,24 +73,7 @@ class TransmitterWindow(QWidget):
 
     def load_data(self, search_params=None):
         try:
-            query = """
-                SELECT id, country_code, site_code, name, latitude, longitude 
-                FROM transmitters
-            """
-            params = ()
-
-            if search_params:
-                field, term = search_params
-                if field:  # Specific field search
-                    query += f" WHERE {field} LIKE ?"
-                    params = (f"%{term}%",)
-                else:  # Search all fields
-                    query += " WHERE country_code LIKE ? OR site_code LIKE ? OR name LIKE ?"
-                    params = (f"%{term}%", f"%{term}%", f"%{term}%")
-
-            query += " ORDER BY country_code, site_code"
-
-            records = self.db.conn.execute(query, params).fetchall()
+            records = self.db.transmitters.list(search_params)
 
             self.ui.table_transmitters.setRowCount(0)
 
@@ -127,10 +110,7 @@ class TransmitterWindow(QWidget):
 
         try:
             transmitter_id = selected[0].data(Qt.UserRole)
-            record = self.db.conn.execute("""
-                SELECT country_code, site_code, name, latitude, longitude 
-                FROM transmitters WHERE id=?
-            """, (transmitter_id,)).fetchone()
+            record = self.db.transmitters.get(transmitter_id)
 
             if record:
                 self.current_id = transmitter_id
@@ -188,20 +168,11 @@ class TransmitterWindow(QWidget):
 
             if self.current_id:
                 # Update existing record
-                self.db.conn.execute("""
-                    UPDATE transmitters 
-                    SET country_code=?, site_code=?, name=?, latitude=?, longitude=?
-                    WHERE id=?
-                """, data + (self.current_id,))
+                self.db.transmitters.update(self.current_id, data)
             else:
                 # Insert new record
-                self.db.conn.execute("""
-                    INSERT INTO transmitters 
-                    (country_code, site_code, name, latitude, longitude)
-                    VALUES (?, ?, ?, ?, ?)
-                """, data)
+                self.db.transmitters.insert(data)
 
-            self.db.conn.commit()
             self.load_data()
             self.clear_form()
             QMessageBox.information(self, self.tr("Success"), self.tr("Record saved successfully"))
@@ -221,8 +192,7 @@ class TransmitterWindow(QWidget):
 
         if reply == QMessageBox.Yes:
             try:
-                self.db.conn.execute("DELETE FROM transmitters WHERE id=?", (self.current_id,))
-                self.db.conn.commit()
+                self.db.transmitters.delete(self.current_id)
                 self.load_data()
                 self.clear_form()
                 QMessageBox.information(self, self.tr("Success"), self.tr("Record deleted successfully"))
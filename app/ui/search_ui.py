@@ -204,9 +204,9 @@ class Ui_SearchWindow(object):
         self.stationLineEdit.setPlaceholderText(_translate("SearchWindow", "Enter station name"))
         self.dateGroup.setTitle(_translate("SearchWindow", "Operating Period"))
         self.startDateLabel.setText(_translate("SearchWindow", "Start:"))
-        self.startDateLineEdit.setPlaceholderText(_translate("SearchWindow", "MMDD"))
+        self.startDateLineEdit.setPlaceholderText(_translate("SearchWindow", "DDMM"))
         self.endDateLabel.setText(_translate("SearchWindow", "End:"))
-        self.endDateLineEdit.setPlaceholderText(_translate("SearchWindow", "MMDD"))
+        self.endDateLineEdit.setPlaceholderText(_translate("SearchWindow", "DDMM"))
         self.optionsGroup.setTitle(_translate("SearchWindow", "Options"))
         self.limitLabel.setText(_translate("SearchWindow", "Limit:"))
         self.limitSpinBox.setSpecialValueText(_translate("SearchWindow", "No limit"))
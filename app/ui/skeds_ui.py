@@ -181,10 +181,10 @@ class Ui_SkedForm(object):
         self.label_8.setText(_translate("SkedForm", "Target Area:"))
         self.label_9.setText(_translate("SkedForm", "Transmitter Site:"))
         self.label_10.setText(_translate("SkedForm", "Persistence Code:"))
-        self.label_11.setText(_translate("SkedForm", "Start Date (MMDD):"))
-        self.txt_start_date.setPlaceholderText(_translate("SkedForm", "MMDD"))
-        self.label_12.setText(_translate("SkedForm", "End Date (MMDD):"))
-        self.txt_end_date.setPlaceholderText(_translate("SkedForm", "MMDD"))
+        self.label_11.setText(_translate("SkedForm", "Start Date (DDMM):"))
+        self.txt_start_date.setPlaceholderText(_translate("SkedForm", "DDMM"))
+        self.label_12.setText(_translate("SkedForm", "End Date (DDMM):"))
+        self.txt_end_date.setPlaceholderText(_translate("SkedForm", "DDMM"))
         self.label_13.setText(_translate("SkedForm", "Remarks:"))
         self.groupBox_2.setTitle(_translate("SkedForm", "Actions"))
         self.btn_new.setText(_translate("SkedForm", "New"))
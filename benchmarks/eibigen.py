@@ -0,0 +1,131 @@
+import argparse
+import random
+import sys
+
+
+""" 
+ShortwaveHunter
+BCL radio software
+Synthetic EiBi schedule generator
+
+Copyright (c) 2025 I8ZSE, Giorgio L. Rutigliano
+(www.i8zse.it, www.i8zse.eu, www.giorgiorutigliano.it)
+
+radio communications are handled by https://github.com/Hamlib/Hamlib (LGPL)
+
+This is free software released under LGPL License
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+
+# broadcast bands (kHz) with relative weights, roughly as in a real EiBi season
+BANDS = [
+    (148, 284, 1), (530, 1700, 12), (2300, 2495, 1), (3200, 3400, 2),
+    (3900, 4000, 2), (4750, 5060, 4), (5900, 6200, 14), (7200, 7450, 12),
+    (9400, 9900, 18), (11600, 12100, 16), (13570, 13870, 8), (15100, 15800, 12),
+    (17480, 17900, 6), (18900, 19020, 1), (21450, 21850, 3), (25600, 26100, 1),
+]
+DAYS = ["", "", "", "", "", "", "Mo-Fr", "Sa", "Su", "SaSu", "irr", "1234567", "Tu,Fr"]
+COUNTRIES = ["USA", "CHN", "IND", "RUS", "D", "F", "G", "I", "E", "J", "KOR", "TUR",
+             "EGY", "NIG", "B", "ARG", "AUS", "CAN", "IRN", "PAK", "VTN", "INS", "THA"]
+LANGUAGES = ["E", "C", "S", "F", "R", "A", "G", "I", "J", "K", "P", "T", "Hi", "Fa",
+             "Ur", "Vn", "In", "Th", "Sw", "Ha", "-CW", "-TS"]
+TARGETS = ["Eu", "Af", "As", "Am", "NAm", "SAm", "ME", "FE", "SEA", "Oc", "CIS"]
+SITES = ["", "", "", "b", "k", "m", "s", "t", "u", "ka", "/ASC", "/SNG"]
+PERSISTENCE = [1] * 12 + [0] * 3 + [2, 4, 5, 6, 8]
+WORDS = ["Radio", "Voice", "International", "World", "Service", "Free", "Gospel",
+         "National", "Broadcasting", "Network", "FM", "Africa", "Asia", "Pacific",
+         "Liberty", "Hope", "Mission", "Shortwave", "Channel", "Echo"]
+HEADER = "kHz:75;Time(UTC):93;Days:59;ITU:49;Station:201;Lng:49;Target:62;Remarks:135;P:35;Start:60;Stop:60;"
+
+
+class EibiGenerator:
+    """
+    Reproducible generator of EiBi CSV rows, the same seed and parameters
+    give the same file
+    """
+
+    def __init__(self, seed=1, stations=2000, out_of_band=0.1):
+        self.rnd = random.Random(seed)
+        self.out_of_band = out_of_band
+        self.stations = [self._station_name(i) for i in range(stations)]
+        self.weights = [w for _, _, w in BANDS]
+
+    def _station_name(self, num):
+        words = self.rnd.sample(WORDS, self.rnd.randint(1, 3))
+        return " ".join(words) + f" {num}"
+
+    def frequency(self):
+        if self.rnd.random() < self.out_of_band:
+            return self.rnd.randint(150, 29999)
+        start, end, _ = self.rnd.choices(BANDS, self.weights)[0]
+        # 5 kHz channel raster inside the band
+        return self.rnd.randrange(start, end, 5) if end - start > 5 else start
+
+    def time_range(self):
+        start = self.rnd.randrange(0, 24 * 60, 15)
+        length = self.rnd.choice([15, 30, 30, 60, 60, 60, 120, 180, 240])
+        end = (start + length) % (24 * 60)
+        return f"{start // 60:02d}{start % 60:02d}-{end // 60:02d}{end % 60:02d}"
+
+    def row(self):
+        rnd = self.rnd
+        fields = [
+            str(self.frequency()),
+            self.time_range(),
+            rnd.choice(DAYS),
+            rnd.choice(COUNTRIES),
+            rnd.choice(self.stations),
+            rnd.choice(LANGUAGES),
+            rnd.choice(TARGETS),
+            rnd.choice(SITES),
+            str(rnd.choice(PERSISTENCE)),
+            "",
+            "",
+        ]
+        if rnd.random() < 0.05:
+            fields[9] = f"{rnd.randint(1, 28):02d}{rnd.randint(1, 12):02d}"
+        return ";".join(fields)
+
+    def rows(self, count):
+        for _ in range(count):
+            yield self.row()
+
+    def write(self, path, count):
+        """
+        Write header and count rows to path
+        """
+        with open(path, "w") as file:
+            file.write(HEADER + "\n")
+            for row in self.rows(count):
+                file.write(row + "\n")
+        return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic EiBi CSV")
+    parser.add_argument("output", help="csv file to write")
+    parser.add_argument("-n", "--rows", type=int, default=10000)
+    parser.add_argument("-s", "--seed", type=int, default=1)
+    parser.add_argument("--stations", type=int, default=2000, help="distinct station names")
+    parser.add_argument("--out-of-band", type=float, default=0.1,
+                        help="share of frequencies outside the broadcast bands")
+    args = parser.parse_args()
+    EibiGenerator(args.seed, args.stations, args.out_of_band).write(args.output, args.rows)
+    sys.exit(0)
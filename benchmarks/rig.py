@@ -0,0 +1,212 @@
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.core.simrig import SimulatedRig, RIG_VFO_A
+
+""" 
+ShortwaveHunter
+BCL radio software
+Rig polling benchmark on the simulated rig
+
+Copyright (c) 2025 I8ZSE, Giorgio L. Rutigliano
+(www.i8zse.it, www.i8zse.eu, www.giorgiorutigliano.it)
+
+radio communications are handled by https://github.com/Hamlib/Hamlib (LGPL)
+
+This is free software released under LGPL License
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+
+BAUDS = (4800, 9600, 19200, 38400)
+CONF = {'id': 1, 'port': 'sim', 'baudrate': '9600', 'databits': '8', 'stopbits': '1', 'parity': 0}
+
+
+def ms(values):
+    """
+    median and 95th percentile in msec
+    """
+    if not values:
+        return {"median": None, "p95": None}
+    values = sorted(values)
+    return {
+        "median": round(statistics.median(values) * 1000, 3),
+        "p95": round(values[min(int(len(values) * 0.95), len(values) - 1)] * 1000, 3),
+    }
+
+
+def poll_bench(baud, duration, period, jitter, error_rate, seed):
+    """
+    Poll the rig back to back for duration seconds while a second thread
+    sends a tune command every period seconds, as band clicks do
+    """
+    rig = SimulatedRig(None, baud, jitter=jitter, error_rate=error_rate, seed=seed)
+    rig.openconf(CONF, 100, RIG_VFO_A)
+    rig.link.reset_stats()
+    stop = threading.Event()
+
+    def tuner():
+        freq = 5900000
+        while not stop.wait(period):
+            freq = freq + 5000 if freq < 6200000 else 5900000
+            rig.set_frequency(freq, RIG_VFO_A)
+
+    polls = []
+    errors = 0
+    thread = threading.Thread(target=tuner, daemon=True) if period else None
+    if thread:
+        thread.start()
+    begin = time.perf_counter()
+    while time.perf_counter() - begin < duration:
+        start = time.perf_counter()
+        sts = rig.poll(RIG_VFO_A)[0]
+        polls.append(time.perf_counter() - start)
+        if sts:
+            errors += 1
+    elapsed = time.perf_counter() - begin
+    stop.set()
+    if thread:
+        thread.join()
+    return {
+        "polls_per_s": round(len(polls) / elapsed, 2),
+        "poll_ms": ms(polls),
+        "queue_ms": ms(rig.link.queue),
+        "line_busy": round(rig.link.busy / elapsed, 3),
+        "commands": rig.link.commands,
+        "poll_errors": errors,
+    }
+
+
+class BenchApp:
+    """
+    Minimal stand-in for SWHunter, enough for RadioWindow
+    """
+    hllink = True
+    snapshot = None
+
+    def __init__(self, app, workdir, baud):
+        from PyQt5.QtCore import QSettings
+        from benchmarks.run import make_db
+        self.app = app
+        self.rootdir = ROOT
+        self.settings = QSettings(os.path.join(workdir, "bench.ini"), QSettings.IniFormat)
+        self.db = make_db(workdir)
+        self.hamlib = SimulatedRig(self, baud)
+        self.errors = 0
+
+    def show_error(self, error_type, message, details="", **kwargs):
+        self.errors += 1
+
+
+def ui_bench(baud, count, duration):
+    """
+    Time RadioWindow.update_radio and its share spent in poll, then let
+    timer1 drive it at the application rate and count the ticks served
+    """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PyQt5.QtWidgets import QApplication
+        from PyQt5.QtCore import QTimer
+        from app.radio import RadioWindow
+    except ImportError as e:
+        return {"skipped": str(e)}
+
+    app = QApplication.instance() or QApplication([])
+    workdir = tempfile.mkdtemp(prefix="swhrig")
+    try:
+        root = BenchApp(app, workdir, baud)
+        win = RadioWindow(root)
+        rig = root.hamlib
+        rig.openconf(CONF, 100, RIG_VFO_A)
+
+        polls = []
+        poll = rig.poll
+
+        def timed_poll(vfo):
+            start = time.perf_counter()
+            result = poll(vfo)
+            polls.append(time.perf_counter() - start)
+            return result
+        rig.poll = timed_poll
+
+        updates = []
+        for _ in range(count):
+            # new frequency every call, so the band label path runs too
+            rig.freq += 5000
+            start = time.perf_counter()
+            win.update_radio()
+            updates.append(time.perf_counter() - start)
+        ui = [u - p for u, p in zip(updates, polls)]
+
+        ticks = []
+        win.timer1.timeout.connect(lambda: ticks.append(time.perf_counter()))
+        win.timer1.start(100)
+        QTimer.singleShot(int(duration * 1000), app.quit)
+        app.exec_()
+        win.timer1.stop()
+        gaps = [b - a for a, b in zip(ticks, ticks[1:])]
+        root.db.close()
+        win.close()
+        return {
+            "update_ms": ms(updates),
+            "ui_ms": ms(ui),
+            "timer_ticks_per_s": round(len(ticks) / duration, 2),
+            "tick_gap_ms": ms(gaps),
+            "errors": root.errors,
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="swhunter rig polling benchmark")
+    parser.add_argument("-b", "--baud", type=int, action="append", help="baud rate, repeatable")
+    parser.add_argument("-d", "--duration", type=float, default=3.0, help="seconds per run")
+    parser.add_argument("--tune-period", type=float, default=0.25,
+                        help="seconds between concurrent tune commands, 0 disables")
+    parser.add_argument("--jitter", type=float, default=0.002, help="command jitter, seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of timed out commands")
+    parser.add_argument("--ui-count", type=int, default=100, help="direct update_radio calls")
+    parser.add_argument("--no-ui", action="store_true", help="skip the RadioWindow benchmark")
+    parser.add_argument("-s", "--seed", type=int, default=1)
+    parser.add_argument("-o", "--output", help="write results json to file")
+    args = parser.parse_args()
+
+    results = {}
+    for baud in args.baud or BAUDS:
+        results[f"poll_{baud}"] = poll_bench(baud, args.duration, args.tune_period,
+                                             args.jitter, args.error_rate, args.seed)
+        if not args.no_ui:
+            results[f"ui_{baud}"] = ui_bench(baud, args.ui_count, args.duration)
+    text = json.dumps({"meta": vars(args), "results": results}, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text)
+    else:
+        print(text)
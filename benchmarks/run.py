@@ -0,0 +1,212 @@
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.core.db import RadioDatabase
+from benchmarks.eibigen import EibiGenerator
+
+""" 
+ShortwaveHunter
+BCL radio software
+Database benchmark runner
+
+Copyright (c) 2025 I8ZSE, Giorgio L. Rutigliano
+(www.i8zse.it, www.i8zse.eu, www.giorgiorutigliano.it)
+
+radio communications are handled by https://github.com/Hamlib/Hamlib (LGPL)
+
+This is free software released under LGPL License
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+
+BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+# fewer timings are not enough to tell a regression from noise
+MIN_RUNS = 5
+# meta fields two runs must share to be compared, node only when recorded
+COMPARABLE = ("rows", "seed", "machine", "node")
+# host specific meta fields, left out of the shared baseline
+HOST_FIELDS = ("node", "processor")
+# exit status of a run whose baseline is not comparable, the gate is skipped
+MISMATCH = 2
+SEARCHES = {
+    "search_band": {"band": "31m"},
+    "search_range": {"freq_min": 5900, "freq_max": 6200, "time": "1200"},
+    "search_station": {"station": "radio"},
+    "search_text": {"text": "voice international"},
+    "search_country": {"country": "CHN", "language": "C"},
+}
+
+
+def make_db(workdir):
+    """
+    Temporary database built from the shipped schema and migrations
+    """
+    data = os.path.join(ROOT, "data")
+    for name in ("dbcreate.sql", "datainit.sql"):
+        shutil.copy(os.path.join(data, name), workdir)
+    shutil.copytree(os.path.join(data, "migrations"), os.path.join(workdir, "migrations"))
+    return RadioDatabase(None, workdir)
+
+
+def timed(func, repeat):
+    """
+    Run func repeat times, return per call timings in seconds
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def summary(times, ops=1):
+    return {
+        "median": round(statistics.median(times) / ops, 9),
+        "min": round(min(times) / ops, 9),
+        "runs": len(times),
+        "ops": ops,
+    }
+
+
+def run(rows, seed, repeat):
+    results = {}
+    repeat = max(repeat, MIN_RUNS)
+    workdir = tempfile.mkdtemp(prefix="swhbench")
+    try:
+        gen = EibiGenerator(seed)
+        csv_path = gen.write(os.path.join(workdir, "eibi.csv"), rows)
+        db = make_db(workdir)
+
+        # full import, replacing the rows of the previous run, then the update path over the same rows
+        imported = []
+        results["import"] = summary(timed(lambda: imported.append(db.import_eibi_csv(csv_path, False)), repeat),
+                                    rows)
+        imp, _, err = imported[-1]
+        results["import_update"] = summary(timed(lambda: db.import_eibi_csv(csv_path, True), repeat), rows)
+
+        rnd = random.Random(seed)
+        freqs = [gen.frequency() for _ in range(200)]
+        results["lookup"] = summary(timed(lambda: [db.lookup(f) for f in freqs], repeat), len(freqs))
+        probes = [rnd.uniform(100, 30000) for _ in range(10000)]
+        results["get_band"] = summary(timed(lambda: [db.get_band(f) for f in probes], repeat), len(probes))
+        for name, filters in SEARCHES.items():
+            results[name] = summary(timed(lambda: db.search_skeds(filters), repeat))
+        results["get_statistics"] = summary(timed(db.get_statistics, repeat))
+        db.close()
+        return {
+            "meta": {
+                "rows": rows,
+                "imported": imp,
+                "errors": len(err),
+                "seed": seed,
+                "repeat": repeat,
+                "python": platform.python_version(),
+                "sqlite": sqlite3.sqlite_version,
+                "machine": platform.machine(),
+                "node": platform.node(),
+                "processor": platform.processor(),
+            },
+            "results": results,
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def mismatch(current, baseline):
+    """
+    Reason why baseline is not comparable with current, None if it is
+    """
+    for key in COMPARABLE:
+        if key in baseline["meta"] and baseline["meta"][key] != current["meta"].get(key):
+            return f"{key} {baseline['meta'][key]} in baseline, {current['meta'].get(key)} now"
+    return None
+
+
+def compare(current, baseline, tolerance):
+    """
+    List of benchmarks whose best time is slower than baseline by more than
+    tolerance. The minimum of several runs is the least noisy estimate
+    """
+    regressions = []
+    for name, base in baseline["results"].items():
+        cur = current["results"].get(name)
+        if cur is None:
+            continue
+        ratio = cur["min"] / base["min"] if base["min"] else 1.0
+        cur["ratio"] = round(ratio, 3)
+        if ratio > 1.0 + tolerance:
+            regressions.append((name, ratio))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="swhunter database benchmarks")
+    parser.add_argument("-n", "--rows", type=int, default=20000, help="synthetic EiBi rows")
+    parser.add_argument("-s", "--seed", type=int, default=1)
+    parser.add_argument("-r", "--repeat", type=int, default=MIN_RUNS,
+                        help=f"timings per benchmark, at least {MIN_RUNS}")
+    parser.add_argument("-o", "--output", help="write results json to file")
+    parser.add_argument("-b", "--baseline", default=BASELINE, help="baseline json to compare with")
+    parser.add_argument("-t", "--tolerance", type=float, default=0.3,
+                        help="allowed slowdown before a regression is reported (0.3 = 30%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="store results as new baseline")
+    args = parser.parse_args()
+
+    current = run(args.rows, args.seed, args.repeat)
+    regressions = []
+    reason = None
+    if args.save_baseline:
+        saved = current
+        if os.path.abspath(args.baseline) == BASELINE:
+            # the shared baseline names no host, a local one keeps its own
+            saved = dict(current, meta={k: v for k, v in current["meta"].items() if k not in HOST_FIELDS})
+        with open(args.baseline, "w") as file:
+            json.dump(saved, file, indent=2)
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        reason = mismatch(current, baseline)
+        if reason is None:
+            regressions = compare(current, baseline, args.tolerance)
+
+    text = json.dumps(current, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text)
+    else:
+        print(text)
+    if reason is not None:
+        print(f"baseline mismatch: {reason}, gate skipped", file=sys.stderr)
+        sys.exit(MISMATCH)
+    for name, ratio in regressions:
+        print(f"REGRESSION {name}: {ratio:.2f}x baseline", file=sys.stderr)
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,64 @@
+-- =============================================
+-- Full text index on broadcasts
+-- rowid is broadcasts.id, country and language names are denormalized
+-- =============================================
+
+CREATE VIRTUAL TABLE IF NOT EXISTS broadcasts_fts USING fts5(
+    station_name,
+    remarks,
+    transmitter_site,
+    country,
+    language,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+
+INSERT INTO broadcasts_fts (rowid, station_name, remarks, transmitter_site, country, language)
+SELECT b.id, b.station_name, b.remarks, b.transmitter_site, c.cname, l.lang
+FROM broadcasts b
+LEFT JOIN countries c ON b.country_id = c.id
+LEFT JOIN languages l ON b.language_id = l.id;
+
+-- Triggers keeping the index in sync with imports and editors
+CREATE TRIGGER IF NOT EXISTS broadcasts_fts_insert
+    AFTER INSERT ON broadcasts
+    FOR EACH ROW
+BEGIN
+    INSERT INTO broadcasts_fts (rowid, station_name, remarks, transmitter_site, country, language)
+    VALUES (NEW.id, NEW.station_name, NEW.remarks, NEW.transmitter_site,
+            (SELECT cname FROM countries WHERE id = NEW.country_id),
+            (SELECT lang FROM languages WHERE id = NEW.language_id));
+END;
+
+CREATE TRIGGER IF NOT EXISTS broadcasts_fts_delete
+    AFTER DELETE ON broadcasts
+    FOR EACH ROW
+BEGIN
+    DELETE FROM broadcasts_fts WHERE rowid = OLD.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS broadcasts_fts_update
+    AFTER UPDATE OF station_name, remarks, transmitter_site, country_id, language_id ON broadcasts
+    FOR EACH ROW
+BEGIN
+    DELETE FROM broadcasts_fts WHERE rowid = OLD.id;
+    INSERT INTO broadcasts_fts (rowid, station_name, remarks, transmitter_site, country, language)
+    VALUES (NEW.id, NEW.station_name, NEW.remarks, NEW.transmitter_site,
+            (SELECT cname FROM countries WHERE id = NEW.country_id),
+            (SELECT lang FROM languages WHERE id = NEW.language_id));
+END;
+
+CREATE TRIGGER IF NOT EXISTS countries_fts_update
+    AFTER UPDATE OF cname ON countries
+    FOR EACH ROW
+BEGIN
+    UPDATE broadcasts_fts SET country = NEW.cname
+    WHERE rowid IN (SELECT id FROM broadcasts WHERE country_id = NEW.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS languages_fts_update
+    AFTER UPDATE OF lang ON languages
+    FOR EACH ROW
+BEGIN
+    UPDATE broadcasts_fts SET language = NEW.lang
+    WHERE rowid IN (SELECT id FROM broadcasts WHERE language_id = NEW.id);
+END;
@@ -0,0 +1,62 @@
+-- =============================================
+-- Band membership stored in broadcasts.band_id
+-- each broadcast belongs to the narrowest band containing its frequency
+-- (broadcast segments win over overlapping ham bands), ties go to lowest id.
+-- no foreign key, band edits rebuild the column
+-- =============================================
+
+ALTER TABLE broadcasts ADD COLUMN band_id INTEGER;
+
+UPDATE broadcasts SET band_id = (
+    SELECT fb.id FROM frequency_bands fb
+    WHERE broadcasts.frequency_khz >= fb.freq_start AND broadcasts.frequency_khz < fb.freq_end
+    ORDER BY fb.freq_end - fb.freq_start, fb.id
+    LIMIT 1
+);
+
+CREATE INDEX IF NOT EXISTS idx_broadcasts_band ON broadcasts(band_id, frequency_khz);
+
+DROP VIEW IF EXISTS broadcasts_complete;
+CREATE VIEW broadcasts_complete AS
+SELECT
+    b.id,
+    b.frequency_khz,
+    b.start_time,
+    b.end_time,
+    b.days_operation,
+    c.ccode as country_code,
+    c.cname as country_name,
+    b.station_name,
+    l.code as language_code,
+    l.lang as language_name,
+    a.acode as target_area_code,
+    a.aname as target_area_name,
+    b.transmitter_site,
+    t.name as transmitter_name,
+    t.latitude as transmitter_lat,
+    t.longitude as transmitter_lng,
+    b.persistence_code,
+    CASE
+        WHEN b.persistence_code = 1 THEN 'Permanent'
+        WHEN b.persistence_code = 2 THEN 'Permanent (DST North)'
+        WHEN b.persistence_code = 3 THEN 'Permanent (DST South)'
+        WHEN b.persistence_code = 4 THEN 'Winter only'
+        WHEN b.persistence_code = 5 THEN 'Summer only'
+        WHEN b.persistence_code = 6 THEN 'Temporary'
+        WHEN b.persistence_code = 8 THEN 'Inactive'
+        WHEN b.persistence_code >= 90 THEN 'Utility station'
+        ELSE 'Unknown'
+    END as persistence_description,
+    b.start_date,
+    b.end_date,
+    b.remarks,
+    fb.band_name,
+    fb.description as band_description,
+    b.created_at,
+    b.updated_at
+FROM broadcasts b
+LEFT JOIN countries c ON b.country_id = c.id
+LEFT JOIN languages l ON b.language_id = l.id
+LEFT JOIN area a ON b.target_area_id = a.id
+LEFT JOIN transmitters t ON b.transmitter_site = t.site_code AND c.ccode = t.country_code
+LEFT JOIN frequency_bands fb ON fb.id = b.band_id;
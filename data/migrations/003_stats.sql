@@ -0,0 +1,110 @@
+-- =============================================
+-- Statistics tables, maintained by triggers on broadcasts
+-- null band/country/language are counted under id 0
+-- =============================================
+
+CREATE TABLE IF NOT EXISTS stats_station (
+    station_name TEXT PRIMARY KEY,
+    cnt INTEGER NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS stats_band (
+    band_id INTEGER PRIMARY KEY,
+    cnt INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS stats_country (
+    country_id INTEGER PRIMARY KEY,
+    cnt INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS stats_language (
+    language_id INTEGER PRIMARY KEY,
+    cnt INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_stats_station_cnt ON stats_station(cnt);
+
+INSERT INTO stats_station (station_name, cnt)
+SELECT station_name, COUNT(*) FROM broadcasts GROUP BY station_name;
+
+INSERT INTO stats_band (band_id, cnt)
+SELECT IFNULL(band_id, 0), COUNT(*) FROM broadcasts GROUP BY IFNULL(band_id, 0);
+
+INSERT INTO stats_country (country_id, cnt)
+SELECT IFNULL(country_id, 0), COUNT(*) FROM broadcasts GROUP BY IFNULL(country_id, 0);
+
+INSERT INTO stats_language (language_id, cnt)
+SELECT IFNULL(language_id, 0), COUNT(*) FROM broadcasts GROUP BY IFNULL(language_id, 0);
+
+CREATE TRIGGER IF NOT EXISTS stats_insert
+    AFTER INSERT ON broadcasts
+    FOR EACH ROW
+BEGIN
+    INSERT INTO stats_station (station_name, cnt) VALUES (NEW.station_name, 1)
+    ON CONFLICT(station_name) DO UPDATE SET cnt = cnt + 1;
+    INSERT INTO stats_band (band_id, cnt) VALUES (IFNULL(NEW.band_id, 0), 1)
+    ON CONFLICT(band_id) DO UPDATE SET cnt = cnt + 1;
+    INSERT INTO stats_country (country_id, cnt) VALUES (IFNULL(NEW.country_id, 0), 1)
+    ON CONFLICT(country_id) DO UPDATE SET cnt = cnt + 1;
+    INSERT INTO stats_language (language_id, cnt) VALUES (IFNULL(NEW.language_id, 0), 1)
+    ON CONFLICT(language_id) DO UPDATE SET cnt = cnt + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS stats_delete
+    AFTER DELETE ON broadcasts
+    FOR EACH ROW
+BEGIN
+    UPDATE stats_station SET cnt = cnt - 1 WHERE station_name = OLD.station_name;
+    DELETE FROM stats_station WHERE station_name = OLD.station_name AND cnt <= 0;
+    UPDATE stats_band SET cnt = cnt - 1 WHERE band_id = IFNULL(OLD.band_id, 0);
+    DELETE FROM stats_band WHERE band_id = IFNULL(OLD.band_id, 0) AND cnt <= 0;
+    UPDATE stats_country SET cnt = cnt - 1 WHERE country_id = IFNULL(OLD.country_id, 0);
+    DELETE FROM stats_country WHERE country_id = IFNULL(OLD.country_id, 0) AND cnt <= 0;
+    UPDATE stats_language SET cnt = cnt - 1 WHERE language_id = IFNULL(OLD.language_id, 0);
+    DELETE FROM stats_language WHERE language_id = IFNULL(OLD.language_id, 0) AND cnt <= 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS stats_update_station
+    AFTER UPDATE OF station_name ON broadcasts
+    FOR EACH ROW
+    WHEN OLD.station_name IS NOT NEW.station_name
+BEGIN
+    UPDATE stats_station SET cnt = cnt - 1 WHERE station_name = OLD.station_name;
+    DELETE FROM stats_station WHERE station_name = OLD.station_name AND cnt <= 0;
+    INSERT INTO stats_station (station_name, cnt) VALUES (NEW.station_name, 1)
+    ON CONFLICT(station_name) DO UPDATE SET cnt = cnt + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS stats_update_band
+    AFTER UPDATE OF band_id ON broadcasts
+    FOR EACH ROW
+    WHEN OLD.band_id IS NOT NEW.band_id
+BEGIN
+    UPDATE stats_band SET cnt = cnt - 1 WHERE band_id = IFNULL(OLD.band_id, 0);
+    DELETE FROM stats_band WHERE band_id = IFNULL(OLD.band_id, 0) AND cnt <= 0;
+    INSERT INTO stats_band (band_id, cnt) VALUES (IFNULL(NEW.band_id, 0), 1)
+    ON CONFLICT(band_id) DO UPDATE SET cnt = cnt + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS stats_update_country
+    AFTER UPDATE OF country_id ON broadcasts
+    FOR EACH ROW
+    WHEN OLD.country_id IS NOT NEW.country_id
+BEGIN
+    UPDATE stats_country SET cnt = cnt - 1 WHERE country_id = IFNULL(OLD.country_id, 0);
+    DELETE FROM stats_country WHERE country_id = IFNULL(OLD.country_id, 0) AND cnt <= 0;
+    INSERT INTO stats_country (country_id, cnt) VALUES (IFNULL(NEW.country_id, 0), 1)
+    ON CONFLICT(country_id) DO UPDATE SET cnt = cnt + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS stats_update_language
+    AFTER UPDATE OF language_id ON broadcasts
+    FOR EACH ROW
+    WHEN OLD.language_id IS NOT NEW.language_id
+BEGIN
+    UPDATE stats_language SET cnt = cnt - 1 WHERE language_id = IFNULL(OLD.language_id, 0);
+    DELETE FROM stats_language WHERE language_id = IFNULL(OLD.language_id, 0) AND cnt <= 0;
+    INSERT INTO stats_language (language_id, cnt) VALUES (IFNULL(NEW.language_id, 0), 1)
+    ON CONFLICT(language_id) DO UPDATE SET cnt = cnt + 1;
+END;
@@ -0,0 +1,25 @@
+-- =============================================
+-- Reception logbook
+-- frequency and station are copied from the broadcast, entries outlive
+-- the schedule rows replaced by an EiBi import
+-- =============================================
+
+CREATE TABLE IF NOT EXISTS reception_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    broadcast_id INTEGER REFERENCES broadcasts(id) ON DELETE SET NULL,
+    logged_at TEXT NOT NULL,            -- utc, YYYY-MM-DD HH:MM:SS
+    frequency_khz REAL NOT NULL,
+    station_name TEXT,
+    country_name TEXT,
+    language_name TEXT,
+    mode TEXT,
+    smeter INTEGER,
+    sinpo TEXT,
+    rig TEXT,
+    notes TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_log_date ON reception_log(logged_at);
+CREATE INDEX IF NOT EXISTS idx_log_station ON reception_log(station_name COLLATE NOCASE, logged_at);
+CREATE INDEX IF NOT EXISTS idx_log_frequency ON reception_log(frequency_khz, logged_at);
+CREATE INDEX IF NOT EXISTS idx_log_broadcast ON reception_log(broadcast_id);
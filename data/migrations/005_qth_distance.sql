@@ -0,0 +1,15 @@
+-- =============================================
+-- Key/value settings shared by GUI, command line and server,
+-- distance and bearing of transmitter sites from the QTH,
+-- recomputed by RadioDatabase.update_distances
+-- =============================================
+
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT
+) WITHOUT ROWID;
+
+ALTER TABLE transmitters ADD COLUMN distance_km REAL;
+ALTER TABLE transmitters ADD COLUMN bearing_deg REAL;
+
+CREATE INDEX IF NOT EXISTS idx_transmitters_distance ON transmitters(distance_km);
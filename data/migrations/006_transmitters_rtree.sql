@@ -0,0 +1,34 @@
+-- =============================================
+-- R*Tree over transmitter sites, for region and radius searches
+-- points are stored as degenerate boxes, kept in sync by triggers
+-- =============================================
+
+CREATE VIRTUAL TABLE IF NOT EXISTS transmitters_rtree USING rtree(
+    id,
+    min_lat, max_lat,
+    min_lon, max_lon
+);
+
+INSERT INTO transmitters_rtree (id, min_lat, max_lat, min_lon, max_lon)
+    SELECT id, latitude, latitude, longitude, longitude FROM transmitters
+    WHERE latitude IS NOT NULL AND longitude IS NOT NULL;
+
+CREATE TRIGGER IF NOT EXISTS transmitters_rtree_ai AFTER INSERT ON transmitters
+WHEN new.latitude IS NOT NULL AND new.longitude IS NOT NULL
+BEGIN
+    INSERT INTO transmitters_rtree (id, min_lat, max_lat, min_lon, max_lon)
+        VALUES (new.id, new.latitude, new.latitude, new.longitude, new.longitude);
+END;
+
+CREATE TRIGGER IF NOT EXISTS transmitters_rtree_au AFTER UPDATE OF latitude, longitude ON transmitters
+BEGIN
+    DELETE FROM transmitters_rtree WHERE id = old.id;
+    INSERT INTO transmitters_rtree (id, min_lat, max_lat, min_lon, max_lon)
+        SELECT new.id, new.latitude, new.latitude, new.longitude, new.longitude
+        WHERE new.latitude IS NOT NULL AND new.longitude IS NOT NULL;
+END;
+
+CREATE TRIGGER IF NOT EXISTS transmitters_rtree_ad AFTER DELETE ON transmitters
+BEGIN
+    DELETE FROM transmitters_rtree WHERE id = old.id;
+END;
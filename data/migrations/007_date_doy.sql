@@ -0,0 +1,27 @@
+-- =============================================
+-- Validity dates as day of year
+-- start_date/end_date are EiBi DDMM text; start_doy/end_doy are days of
+-- the leap year 2000 (1-366), end < start wraps around new year.
+-- a missing end lasts a season (217 days) from start and vice versa,
+-- no dates at all is the whole year. invalid dates count as missing
+-- =============================================
+
+ALTER TABLE broadcasts ADD COLUMN start_doy INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE broadcasts ADD COLUMN end_doy INTEGER NOT NULL DEFAULT 366;
+
+CREATE TEMP TABLE doy AS
+SELECT id,
+    CASE WHEN date('2000-' || substr(start_date, 3, 2) || '-' || substr(start_date, 1, 2), '+0 days') = '2000-' || substr(start_date, 3, 2) || '-' || substr(start_date, 1, 2)
+        THEN CAST(strftime('%j', '2000-' || substr(start_date, 3, 2) || '-' || substr(start_date, 1, 2)) AS INTEGER) END AS s,
+    CASE WHEN date('2000-' || substr(end_date, 3, 2) || '-' || substr(end_date, 1, 2), '+0 days') = '2000-' || substr(end_date, 3, 2) || '-' || substr(end_date, 1, 2)
+        THEN CAST(strftime('%j', '2000-' || substr(end_date, 3, 2) || '-' || substr(end_date, 1, 2)) AS INTEGER) END AS e
+FROM broadcasts WHERE start_date IS NOT NULL OR end_date IS NOT NULL;
+
+UPDATE broadcasts SET
+    start_doy = (SELECT COALESCE(s, (e + 366 - 217 - 1) % 366 + 1, 1) FROM doy WHERE doy.id = broadcasts.id),
+    end_doy = (SELECT COALESCE(e, (s + 217 - 1) % 366 + 1, 366) FROM doy WHERE doy.id = broadcasts.id)
+WHERE id IN (SELECT id FROM doy);
+
+DROP TABLE doy;
+
+CREATE INDEX IF NOT EXISTS idx_broadcasts_doy ON broadcasts(start_doy, end_doy);
@@ -0,0 +1,17 @@
+-- =============================================
+-- Rig configurations, one row per profile, replace the JSON
+-- blob kept in QSettings, see app/core/rigconfigs.py
+-- =============================================
+
+CREATE TABLE IF NOT EXISTS rig_configs (
+    shortname TEXT PRIMARY KEY,
+    mfg TEXT,                   -- hamlib backend
+    radio TEXT,                 -- model name
+    model_id INTEGER NOT NULL,  -- hamlib model number
+    port TEXT,
+    baudrate TEXT,
+    databits TEXT,
+    stopbits TEXT,
+    parity TEXT,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+) WITHOUT ROWID;
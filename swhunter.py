@@ -1,17 +1,34 @@
 import sys
+
+from app.cli import is_command
+
+# gui options followed by a value, not to be taken for a command
+GUI_VALUE_OPTIONS = ("-l", "--lang", "--simrig", "--metrics", "--serve")
+
+if __name__ == "__main__" and is_command(sys.argv[1:], GUI_VALUE_OPTIONS):
+    # command line use, leave before the Qt imports
+    from app.cli import main
+    sys.exit(main(sys.argv[1:]))
+
 from logging.handlers import RotatingFileHandler
 from PyQt5.QtWidgets import QApplication, QMessageBox, QDialog, QVBoxLayout, QLabel
 from PyQt5.QtCore import QSettings, QTranslator, Qt
-from app.db import RadioDatabase
+from app.core.db import RadioDatabase
 import locale
 from babel.support import Translations
+from babel.messages.mofile import write_mo
+from babel.messages.pofile import read_po
+import glob
 import argparse
 import os
 import logging
 from gettext import gettext as _
 
 from app.radio import RadioWindow
-from app.hamlib import HamlibWrapper
+from app.core.hamlib import HamlibWrapper
+from app.core.simrig import SimulatedRig
+from app.core import metrics
+from app.core.server import ApiServer, RigSnapshot, DEFAULT_PORT
 
 
 """ 
@@ -64,6 +81,25 @@ def setup_logging():
 
 
 
+def compile_catalogs(localedir, domain='messages'):
+    """
+    Compile .po catalogs newer than their .mo, the tree ships only .po files
+    """
+    for po_file in glob.glob(os.path.join(localedir, '*', 'LC_MESSAGES', f'{domain}.po')):
+        mo_file = po_file[:-3] + '.mo'
+        if os.path.exists(mo_file) and os.path.getmtime(mo_file) >= os.path.getmtime(po_file):
+            continue
+        try:
+            with open(po_file, 'rb') as f:
+                catalog = read_po(f)
+            # write aside and rename, a half written catalog is never loaded
+            with open(mo_file + '.tmp', 'wb') as f:
+                write_mo(f, catalog)
+            os.replace(mo_file + '.tmp', mo_file)
+        except OSError as e:
+            logging.warning(f"catalog {po_file} not compiled: {e}")
+
+
 class BabelTranslator(QTranslator):
     """
     Set babel as app translator
@@ -71,9 +107,15 @@ class BabelTranslator(QTranslator):
     def __init__(self, translations):
         super().__init__()
         self.translations = translations
+        # Qt asks again for every label and table cell
+        self.cache = {}
 
     def translate(self, context, source_text, disambiguation=None, n=-1):
-        return self.translations.gettext(source_text)
+        key = (context, source_text)
+        text = self.cache.get(key)
+        if text is None:
+            text = self.cache[key] = self.translations.gettext(source_text)
+        return text
 
 
 class SWHunter():
@@ -81,10 +123,14 @@ class SWHunter():
     hamlib = None   # hamlib wrapper class
     rootdir = None  # application absolute path
     hllink = False   # hamlink working
+    metrics_file = None   # instrumentation dump on exit
+    snapshot = None   # rig state shared with the api server
 
-    def __init__(self, lang):
+    def __init__(self, lang, db_path):
         self.app = QApplication(sys.argv)
         self.settings = QSettings("I8ZSE", "SwHunter")
+        # the main window reads rig configs and scheduled tunings from the database
+        self.db = RadioDatabase(self, db_path)
 
         self.app.setApplicationName("ShortWaveHunter")
         self.app.setApplicationVersion("1.0.0")
@@ -92,17 +138,26 @@ class SWHunter():
         self.app.setOrganizationDomain("www.i8zse.it")
 
         # set translator
-        translations = Translations.load('locale', lang, domain='messages')
+        localedir = os.path.join(rootdir, 'locale')
+        compile_catalogs(localedir)
+        translations = Translations.load(localedir, lang, domain='messages')
         translator = BabelTranslator(translations)
         self.app.installTranslator(translator)
 
         self.app.setStyle('Fusion')
         self.main_window = RadioWindow(self)
+        # stored tunings, not part of the window setup
+        self.main_window.start_schedule()
 
     def run(self):
         logging.info("Start app")
         self.main_window.show()
-        sys.exit(self.app.exec_())
+        rc = self.app.exec_()
+        # commit queued log entries
+        self.db.logbook.close()
+        if self.metrics_file:
+            metrics.dump(self.metrics_file)
+        sys.exit(rc)
 
     def show_error(self, error_type, message, details="", **kwargs):
         """
@@ -130,6 +185,12 @@ if __name__ == "__main__":
     setup_logging()
     parser = argparse.ArgumentParser(description='Shortwave Hunter')
     parser.add_argument('-l', '--lang', type=str, help='Country lang code [it, en, de, fr, es]')
+    parser.add_argument('--simrig', type=int, nargs='?', const=0, metavar='BAUD',
+                        help='use a simulated rig instead of hamlib, optionally at a fixed baud rate')
+    parser.add_argument('--metrics', type=str, nargs='?', const='', metavar='FILE',
+                        help='enable instrumentation, optionally dumped to FILE on exit')
+    parser.add_argument('--serve', type=int, nargs='?', const=DEFAULT_PORT, metavar='PORT',
+                        help='start the local JSON server on localhost')
     args = parser.parse_args()
     if args.lang is None:
         args.lang = locale.setlocale(locale.LC_CTYPE).split(".")[0]
@@ -144,12 +205,20 @@ if __name__ == "__main__":
                     'German': 'de',
                     'Spanish': 'es'}[lang]
     try:
-        hunter = SWHunter(args.lang)
+        hunter = SWHunter(args.lang, os.path.join(rootdir, "data"))
         hunter.rootdir = rootdir
-        hunter.db = RadioDatabase(hunter, os.path.join(rootdir, "data"))
-        hunter.hamlib = HamlibWrapper(hunter)
+        if args.metrics is not None:
+            metrics.enable()
+            hunter.metrics_file = args.metrics
+        if args.simrig is None:
+            hunter.hamlib = HamlibWrapper(hunter)
+        else:
+            hunter.hamlib = SimulatedRig(hunter, args.simrig or None)
         if hunter.hamlib is None:
             hunter.show_error("hamlib", _("hamlib not responding"), details="", abort=10)
+        if args.serve:
+            hunter.snapshot = RigSnapshot()
+            ApiServer(hunter.db, port=args.serve, snapshot=hunter.snapshot).start()
         # a = hunter.settings.fileName()
         hunter.run()
     except Exception as e: